@@ -0,0 +1,79 @@
+"""Benchmark HtmlExtractor on an article heavy page.
+
+Compares the single walk per entry with finding each field separately, the
+way HtmlExtractor used to work. Run from the repository root:
+
+    python scripts/benchmark_html.py [--articles N] [--repeat N]
+"""
+
+import argparse
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from rssfixer.extractors.html import HtmlExtractor
+from rssfixer.models import FeedConfig
+from rssfixer.utils import iter_elements, safe_find_text
+
+ARTICLE = """
+<article class="post">
+  <header><div class="meta"><span class="author">Author {n}</span><time>2023-04-{day:02d}</time></div>
+  <a href="/blog/{n}"><img src="/img/{n}.png" alt=""></a></header>
+  <div class="tags"><a href="/tag/a">a</a> <a href="/tag/b">b</a> <a href="/tag/c">c</a></div>
+  <h3 class="title">Post number {n}</h3>
+  <div class="summary"><p>Summary of post {n} with <em>some</em> markup and <a href="/ref">a link</a>.</p></div>
+  <footer><ul><li>Share</li><li>Comment</li><li>Like</li></ul></footer>
+</article>
+"""
+
+
+def separate_finds(extractor: HtmlExtractor, soup: BeautifulSoup) -> list[tuple[str, str, str]]:
+    """Extract entries with one search per field and entry."""
+    config = extractor.config
+    links = []
+    for entry in iter_elements(soup, config.html_entries, config.html_entries_class):
+        urls = entry.find_all(config.html_url)
+        url = urls[0].get("href", "") if urls else ""
+        title = safe_find_text(entry, config.html_title, config.html_title_class)
+        if not url or not title or (config.title_filter and not re.search(config.title_filter, title)):
+            continue
+        description = safe_find_text(entry, config.html_description, config.html_description_class)
+        links.append((url, title, description))
+    return links
+
+
+def single_walk(extractor: HtmlExtractor, soup: BeautifulSoup) -> list[tuple[str, str, str]]:
+    """Extract entries with the current extractor."""
+    return [(link.url, link.title, link.description) for link in extractor.iter_links(soup, extractor.new_context())]
+
+
+def main() -> None:
+    """Run the benchmark and print the best time for each method."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=2000, help="Number of articles on the page")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs for each method")
+    args = parser.parse_args()
+
+    articles = "".join(ARTICLE.format(n=n, day=n % 28 + 1) for n in range(args.articles))
+    html = f"<html><body>{articles}</body></html>"
+    soup = BeautifulSoup(html, "html.parser")
+    config = FeedConfig(url="https://example.com/blog", mode="html")
+
+    results = {}
+    for name, method in (("separate finds", separate_finds), ("single walk", single_walk)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            extractor = HtmlExtractor(config)
+            start = time.perf_counter()
+            links = method(extractor, soup)
+            best = min(best, time.perf_counter() - start)
+        results[name] = (best, links)
+        print(f"{name:15} {best * 1000:8.1f} ms  {len(links)} entries")
+
+    assert results["separate finds"][1] == results["single walk"][1], "methods found different entries"
+    print(f"speedup {results['separate finds'][0] / results['single walk'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
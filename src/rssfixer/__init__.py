@@ -1,6 +1,19 @@
 """Call main."""
 
+from .api import extract_feed, generate_feed, render_result
+from .models import FeedConfig, FeedResult, FeedStats, LinkEntry
 from .rss import main
 
+__all__ = [
+    "FeedConfig",
+    "FeedResult",
+    "FeedStats",
+    "LinkEntry",
+    "extract_feed",
+    "generate_feed",
+    "main",
+    "render_result",
+]
+
 if __name__ == "__main__":
     main()  # pragma: no cover
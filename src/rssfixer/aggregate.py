@@ -0,0 +1,196 @@
+"""Aggregate feeds that combine the entries of several sources.
+
+Every source is a feed definition from a TOML file, with its own extractor.
+Sources are fetched and extracted concurrently like in a batch run. No more
+entries than the aggregate keeps can come from one source, so only that many
+of the newest entries of each source are selected with a bounded heap. The
+selected entries of the sources are then merged with a k-way heap merge,
+newest first, skipping entries already taken from another source, until the
+aggregate is full.
+"""
+
+import heapq
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import chain
+
+from .batch import (
+    BatchOptions,
+    create_process_pool,
+    extract_entries,
+    fetch_entries,
+    fetches_pages,
+    load_content,
+    print_failure,
+)
+from .feed import render_feed
+from .fixtures import create_session
+from .models import DEFAULT_AGGREGATE_ENTRIES, FeedConfig, LinkEntry
+from .simhash import SimHashIndex, entry_fingerprint
+from .state import FeedStateStore
+from .urls import canonicalize
+from .utils import save_rss_feed
+
+
+@dataclass
+class AggregateOptions:
+    """Options for the aggregate feed itself."""
+
+    url: str
+    output: str
+    title: str = "Aggregated feed"
+    atom: bool = False
+    max_entries: int = DEFAULT_AGGREGATE_ENTRIES
+    order: str = "date"
+    near_duplicates: int | None = None
+    state_dir: str | None = None
+
+
+def run_aggregate(sources: list[FeedConfig], options: AggregateOptions, batch: BatchOptions | None = None) -> int:
+    """Generate one feed from the entries of several sources.
+
+    Sources that fail are reported and left out. The feed is written as long
+    as at least one source succeeds.
+
+    Args:
+        sources: Configuration for each source
+        options: Options for the aggregate feed
+        batch: Pool sizes, output and fixture options
+
+    Returns:
+        0 if all sources were used, 1 if any source failed
+
+    Raises:
+        RSSFixerError: If the state can't be read or written or the feed can't be saved
+
+    """
+    batch = batch or BatchOptions()
+    store = FeedStateStore.for_output(options.output, options.state_dir)
+    state = store.load()
+
+    limit = options.max_entries
+    streams, failures = extract_sources(sources, batch)
+    if failures == len(sources):
+        return 1
+
+    now = datetime.now(UTC)
+    first_seen = dict(state.first_seen)
+    for link in chain.from_iterable(streams):
+        first_seen.setdefault(link.url, now)
+
+    def key(link: LinkEntry) -> datetime:
+        """Get the time to order an entry by."""
+        if options.order == "date" and link.published:
+            return link.published
+        return first_seen[link.url]
+
+    entries = list(merge_entries(streams, key, limit, options.near_duplicates))
+
+    config = FeedConfig(url=options.url, title=options.title, output=options.output, atom=options.atom)
+    save_rss_feed(render_feed(entries, config), options.output, options.atom, batch.quiet)
+
+    # Only remember the entries that were candidates, unless a source is missing this time
+    if not failures:
+        candidates = {link.url for stream in streams for link in stream}
+        first_seen = {url: time for url, time in first_seen.items() if url in candidates}
+    state.first_seen = first_seen
+    store.save(state)
+    return 1 if failures else 0
+
+
+def extract_sources(sources: list[FeedConfig], options: BatchOptions) -> tuple[list[list[LinkEntry]], int]:
+    """Fetch and extract all sources, fetching on threads and extracting in processes.
+
+    Relative entry URLs are made absolute with the base URL of their source, or
+    the source URL, so entries from different sources can be compared.
+
+    Args:
+        sources: Configuration for each source
+        options: Pool sizes, output and fixture options
+
+    Returns:
+        Entries of each source in source order, empty for failed sources, and the number of failures
+
+    """
+    streams: list[list[LinkEntry]] = [[] for _ in sources]
+    failures = 0
+    with (
+        create_session(options.record, options.replay) as session,
+        ThreadPoolExecutor(max_workers=options.fetch_threads) as fetchers,
+        create_process_pool(options) as parsers,
+    ):
+        fetches: dict[Future, int] = {}
+        parses: dict[Future, int] = {}
+        for index, source in enumerate(sources):
+            if fetches_pages(source):
+                parses[fetchers.submit(fetch_entries, source, session)] = index
+            else:
+                fetches[fetchers.submit(load_content, source, session)] = index
+        for future in as_completed(fetches):
+            index = fetches[future]
+            try:
+                content = future.result()
+            except Exception as e:  # noqa: BLE001
+                print_failure(sources[index].url, e)
+                failures += 1
+                continue
+            parses[parsers.submit(extract_entries, content, sources[index])] = index
+
+        for future in as_completed(parses):
+            index = parses[future]
+            try:
+                links = [LinkEntry(*fields) for fields in future.result()]
+            except Exception as e:  # noqa: BLE001
+                print_failure(sources[index].url, e)
+                failures += 1
+                continue
+            base = sources[index].base_url or sources[index].url
+            for link in links:
+                link.url = canonicalize(link.url, base)
+            streams[index] = links
+    return streams, failures
+
+
+def merge_entries(
+    streams: Iterable[Iterable[LinkEntry]],
+    key: Callable[[LinkEntry], datetime],
+    limit: int,
+    near_duplicates: int | None = None,
+) -> Iterator[LinkEntry]:
+    """Merge the entries of several sources, newest first.
+
+    Only the newest limit entries of each source can end up in the feed. They
+    are selected and sorted on their own for each source, and the sources are
+    merged lazily, so only the entries that end up in the feed are compared
+    across sources. Entries with the same time keep the order of their sources.
+
+    Args:
+        streams: Entries of each source
+        key: Time of an entry to order by
+        limit: Maximum number of entries
+        near_duplicates: Distance for skipping near duplicates across sources, None to only skip equal URLs
+
+    Yields:
+        Unique entries, newest first
+
+    """
+    merged = heapq.merge(*(heapq.nlargest(limit, stream, key=key) for stream in streams), key=key, reverse=True)
+    urls: set[str] = set()
+    index = SimHashIndex(near_duplicates) if near_duplicates is not None else None
+    count = 0
+    for link in merged:
+        if count >= limit:
+            return
+        if link.url in urls:
+            continue
+        urls.add(link.url)
+        if index is not None:
+            value = entry_fingerprint(link.title, link.description)
+            if value is not None:
+                if index.find(value) is not None:
+                    continue
+                index.add(value, link.url)
+        count += 1
+        yield link
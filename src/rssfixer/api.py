@@ -0,0 +1,262 @@
+"""Python API for generating feeds without going through the command line."""
+
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack
+
+import requests
+from bs4 import BeautifulSoup
+
+from .budgets import Deadline, check_size, recursion_guard
+from .cli import get_extractor
+from .explain import ExplainReport
+from .extractors.base import ExtractionContext, LinkExtractor
+from .feed import feed_digest, render_feeds
+from .fixtures import create_session
+from .models import FeedConfig, FeedResult, FeedStats
+from .utils import fetch_response, filter_html, open_input, parse_html, stream_content
+
+
+def generate_feed(
+    config: FeedConfig,
+    *,
+    session: requests.Session | None = None,
+    html: str | bytes | None = None,
+    report: ExplainReport | None = None,
+    deadline: Deadline | None = None,
+) -> FeedResult:
+    """Fetch a page, extract its entries and render the feed.
+
+    Nothing is written to disk and nothing is printed, except the parsed page
+    with config.debug, so this can be called for many feeds from the same
+    process. The page is read from config.input if set.
+    Otherwise it is fetched, through a fixture session if config.record or
+    config.replay is set and no session is given.
+
+    The deadline is checked while the page is downloaded, after parsing, for
+    every extracted entry and after rendering. Parsing and rendering are
+    single calls that can't be interrupted, so a run can end after the
+    deadline by the time of those calls.
+
+    Args:
+        config: Feed configuration
+        session: Optional session to reuse connections between feeds
+        html: Already fetched page content, nothing is fetched or read if given
+        report: Optional report to record selector matches and dropped entries in,
+            filled in as far as generation got if an error is raised
+        deadline: Deadline for the whole run, started from config.deadline if not given
+
+    Returns:
+        FeedResult with the rendered feed, the entries and timings
+
+    Raises:
+        RSSFixerError: If fetching, parsing or extraction fails
+        BudgetExceededError: If the page or the work to extract its entries exceeds a budget
+        DeadlineExceededError: If the deadline passes before the feed is rendered
+
+    """
+    if deadline is None:
+        deadline = Deadline(config.deadline)
+    result = extract_feed(config, session=session, html=html, report=report, deadline=deadline)
+    return render_result(result, config, deadline)
+
+
+def extract_feed(
+    config: FeedConfig,
+    *,
+    session: requests.Session | None = None,
+    html: str | bytes | None = None,
+    report: ExplainReport | None = None,
+    deadline: Deadline | None = None,
+) -> FeedResult:
+    """Fetch a page and extract its entries without rendering the feed.
+
+    The result has an empty feed and the digest of the entries. Comparing the
+    digest with the one of an earlier run tells if the feed needs to be
+    rendered again with render_result.
+
+    Args:
+        config: Feed configuration
+        session: Optional session to reuse connections between feeds
+        html: Already fetched page content, nothing is fetched or read if given
+        report: Optional report to record selector matches and dropped entries in
+        deadline: Deadline for the whole run, started from config.deadline if not given
+
+    Returns:
+        FeedResult with the entries, their digest and timings
+
+    Raises:
+        RSSFixerError: If fetching, parsing or extraction fails
+        BudgetExceededError: If the page or the work to extract its entries exceeds a budget
+        DeadlineExceededError: If the deadline passes before the entries are extracted
+
+    """
+    if deadline is None:
+        deadline = Deadline(config.deadline)
+    stats = FeedStats()
+    extractor = get_extractor(config)
+
+    with ExitStack() as stack:
+        if html is None:
+            start = time.perf_counter()
+            if config.input:
+                html = stack.enter_context(open_input(config.input, config.max_input_bytes))
+                stats.input_bytes = len(html)
+            else:
+                if session is None and (config.record or config.replay):
+                    session = stack.enter_context(create_session(config.record, config.replay))
+                html = _fetch_page(config, extractor, session, deadline, stats)
+            stats.fetch_seconds = time.perf_counter() - start
+            deadline.check("fetch")
+        else:
+            stats.input_bytes = len(html.encode("utf-8")) if isinstance(html, str) else len(html)
+            check_size(stats.input_bytes, config.max_input_bytes)
+        if isinstance(html, Iterator):
+            html = _count_bytes(html, stats)
+
+        # Very deeply nested input is reported as an exceeded budget
+        stack.enter_context(recursion_guard())
+        start = time.perf_counter()
+        context = extractor.new_context(report, session, deadline)
+        document = _parse_document(html, config, context) if extractor.needs_soup else html
+        stats.parse_seconds = time.perf_counter() - start
+        deadline.check("parsing")
+
+        if config.debug and extractor.needs_soup:
+            print("DEBUG: Filtered HTML\n")
+            print(document.prettify())
+
+        # Extract while a memory-mapped input is still open
+        start = time.perf_counter()
+        entries = list(deadline.watch(extractor.stream_links(document, context), "extraction"))
+        stats.extract_seconds = time.perf_counter() - start
+
+    stats.entries = len(entries)
+    if report is not None:
+        report.input_bytes = stats.input_bytes
+        report.entries = stats.entries
+
+    return FeedResult(feed=b"", entries=entries, stats=stats, digest=feed_digest(entries, config))
+
+
+def render_result(result: FeedResult, config: FeedConfig, deadline: Deadline | None = None) -> FeedResult:
+    """Render the feed for the entries of an extract_feed result in every output format.
+
+    Args:
+        result: Result from extract_feed, updated with the feeds and their render time
+        config: Feed configuration
+        deadline: Deadline for the whole run, None for no deadline
+
+    Returns:
+        The result with the rendered feed
+
+    Raises:
+        DeadlineExceededError: If the deadline passes while rendering
+
+    """
+    start = time.perf_counter()
+    result.feeds = render_feeds(result.entries, config)
+    result.feed = next(iter(result.feeds.values()))
+    result.stats.render_seconds = time.perf_counter() - start
+    if deadline is not None:
+        deadline.check("rendering")
+    return result
+
+
+def _fetch_page(
+    config: FeedConfig,
+    extractor: LinkExtractor,
+    session: requests.Session | None,
+    deadline: Deadline,
+    stats: FeedStats,
+) -> str | bytes | Iterator[bytes]:
+    """Fetch the page the way the extractor reads it.
+
+    Extractors that read the raw page get the undecoded body, so compressed
+    content like a gzipped sitemap is passed on as it is, and extractors that
+    parse a stream get the body while it is downloaded. The body is checked
+    against the input budget while it is downloaded.
+
+    Args:
+        config: Feed configuration
+        extractor: Extractor for the feed
+        session: Optional session to fetch with
+        deadline: Deadline for the download
+        stats: Statistics to record the size of a downloaded body in
+
+    Returns:
+        Decoded HTML, the raw body, or a stream of chunks of the raw body
+
+    Raises:
+        NetworkError: If the request fails
+        DeadlineExceededError: If the deadline passes before the download is done
+        BudgetExceededError: If the body is larger than the input budget
+
+    """
+    headers = {"User-Agent": config.user_agent}
+    max_bytes = config.max_input_bytes
+    if extractor.streams_input:
+        return stream_content(config.url, headers, session=session, deadline=deadline, max_bytes=max_bytes)
+    response = fetch_response(config.url, headers, session=session, deadline=deadline, max_bytes=max_bytes)
+    stats.input_bytes = len(response.content)
+    return response.text if extractor.needs_soup else response.content
+
+
+def _count_bytes(chunks: Iterator[bytes], stats: FeedStats) -> Iterator[bytes]:
+    """Pass chunks of a streamed page on, counting them in stats.input_bytes."""
+    for chunk in chunks:
+        stats.input_bytes += len(chunk)
+        yield chunk
+
+
+def _parse_document(html: str | bytes, config: FeedConfig, context: ExtractionContext) -> BeautifulSoup:
+    """Parse a page and apply the page filter.
+
+    The <base href> of the page is passed to the context first, since the
+    filter leaves out <head>.
+
+    Args:
+        html: Page content
+        config: Feed configuration with filter_type and filter_name
+        context: State for the extraction, with the explain report if any
+
+    Returns:
+        Parsed and possibly filtered page
+
+    Raises:
+        HTMLParsingError: If the filter matches nothing
+        BudgetExceededError: If the filter visits more than --max-nodes elements
+
+    """
+    start = time.perf_counter()
+    document = parse_html(html)
+    context.use_document(document)
+    if context.report is not None:
+        context.report.parse_seconds = time.perf_counter() - start
+    if not (config.filter_type and config.filter_name):
+        return document
+    if context.report is None:
+        return filter_html(document, config.filter_type, config.filter_name, config.max_nodes)
+    return _explain_filter(document, config, context.report)
+
+
+def _explain_filter(soup: BeautifulSoup, config: FeedConfig, report: ExplainReport) -> BeautifulSoup:
+    """Record the elements matched by the page filter, then apply it.
+
+    Args:
+        soup: Parsed page
+        config: Feed configuration with filter_type and filter_name
+        report: Report to record the matches in
+
+    Returns:
+        Filtered page
+
+    Raises:
+        HTMLParsingError: If the filter matches nothing
+
+    """
+    start = time.perf_counter()
+    elements = soup.find_all(config.filter_type, config.filter_name)
+    value = f"{config.filter_type} --filter-name {config.filter_name}"
+    report.record("--filter-type", value, elements, time.perf_counter() - start)
+    return filter_html(soup, config.filter_type, config.filter_name, config.max_nodes)
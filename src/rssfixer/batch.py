@@ -0,0 +1,369 @@
+"""Generate many feeds in one run.
+
+Fetching is I/O bound and runs on a thread pool, while parsing and link
+extraction are CPU bound and run in a process pool so that they are not
+serialized by the GIL. Workers receive the raw response body and the
+FeedConfig for the feed and only send back plain entry tuples.
+
+Extractors that fetch more pages while extracting, like the sitemaps of a
+sitemap index, run on the fetch threads instead, where the session that
+records or replays fixtures and the deadline of the feed are available.
+"""
+
+import os
+import tomllib
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import astuple, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import requests
+
+from .api import extract_feed
+from .budgets import Deadline, check_size, recursion_guard
+from .cli import get_extractor, parse_arguments
+from .emit import append_records, find_new_entries
+from .exceptions import RSSFixerError
+from .feed import feed_digest, render_feeds
+from .fixtures import create_session
+from .models import DEFAULT_FETCH_THREADS, DEFAULT_MAX_TASKS_PER_CHILD, FeedConfig, LinkEntry
+from .schedule import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, plan, record_poll
+from .state import FeedStateStore
+from .utils import fetch_response, open_input, parse_html, save_feeds
+
+
+def load_feeds(path: str) -> list[FeedConfig]:
+    """Load feed definitions from a TOML file.
+
+    Every ``[[feed]]`` table holds a ``url`` and the long command line options
+    for that feed, for example ``list = true`` or ``html-entries = "div"``.
+
+    Args:
+        path: Path to the TOML file
+
+    Returns:
+        List of feed configurations
+
+    Raises:
+        RSSFixerError: If the file can't be read or defines no feeds
+
+    """
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise RSSFixerError(f"Unable to read feed configuration {path}: {e}") from e
+
+    feeds = data.get("feed", [])
+    if not feeds:
+        raise RSSFixerError(f"No [[feed]] entries found in {path}")
+
+    return [FeedConfig.from_arguments(parse_arguments(feed_to_argv(feed))) for feed in feeds]
+
+
+def feed_to_argv(feed: dict[str, Any]) -> list[str]:
+    """Convert a feed table to a command line for parse_arguments.
+
+    Flags are placed first since options like --html-entries require --html
+    to already be set when they are parsed.
+
+    Args:
+        feed: Feed definition from the configuration file
+
+    Returns:
+        Argument list
+
+    Raises:
+        RSSFixerError: If the feed has no URL
+
+    """
+    if "url" not in feed:
+        raise RSSFixerError(f"Feed definition without url: {feed}")
+
+    flags: list[str] = []
+    options: list[str] = []
+    for key, value in feed.items():
+        if key == "url":
+            continue
+        option = "--" + key.replace("_", "-")
+        if value is True:
+            flags.append(option)
+        elif value is False:
+            continue
+        elif isinstance(value, list):
+            for item in value:
+                options.extend([option, str(item)])
+        else:
+            options.extend([option, str(value)])
+
+    return [*flags, *options, feed["url"]]
+
+
+def load_content(config: FeedConfig, session: requests.Session | None = None) -> bytes:
+    """Fetch the page for a feed, or read it from the configured input file.
+
+    Args:
+        config: Configuration for the feed
+        session: Optional session to fetch with
+
+    Returns:
+        Page content as bytes
+
+    Raises:
+        RSSFixerError: If the page can't be fetched or read, or the fetch takes
+            longer than the deadline of the feed
+
+    """
+    if config.input:
+        with open_input(config.input, config.max_input_bytes) as content:
+            return bytes(content)
+    headers = {"User-Agent": config.user_agent}
+    deadline = Deadline(config.deadline)
+    response = fetch_response(config.url, headers, session=session, deadline=deadline, max_bytes=config.max_input_bytes)
+    return response.content
+
+
+def fetch_entries(
+    config: FeedConfig,
+    session: requests.Session | None = None,
+    content: bytes | None = None,
+) -> list[tuple]:
+    """Fetch and extract a feed on the calling thread.
+
+    Used for extractors that fetch more pages while extracting, so that they
+    fetch through the session and stop at the deadline of the feed.
+
+    Args:
+        config: Configuration for the feed
+        session: Optional session to fetch with
+        content: Already fetched page content, fetched or read from the input file if not given
+
+    Returns:
+        List of entry tuples in LinkEntry field order
+
+    Raises:
+        RSSFixerError: If fetching, parsing or extraction fails
+
+    """
+    result = extract_feed(config, session=session, html=content, deadline=Deadline(config.deadline))
+    return [astuple(link) for link in result.entries]
+
+
+def fetches_pages(config: FeedConfig) -> bool:
+    """Check if the extractor for a feed fetches more pages while extracting.
+
+    Args:
+        config: Configuration for the feed
+
+    Returns:
+        True if the feed must be extracted by fetch_entries, False for an
+        invalid configuration, which is reported by the worker
+
+    """
+    try:
+        return get_extractor(config).fetches_pages
+    except RSSFixerError:
+        return False
+
+
+def extract_entries(content: bytes, config: FeedConfig) -> list[tuple]:
+    """Parse content and extract entries.
+
+    This is the unit of work sent to the process pool, so it only takes and
+    returns picklable values.
+
+    Args:
+        content: Raw page content
+        config: Configuration for the feed
+
+    Returns:
+        List of entry tuples in LinkEntry field order
+
+    Raises:
+        RSSFixerError: If parsing or extraction fails
+        BudgetExceededError: If the page or the work to extract its entries exceeds a budget
+
+    """
+    check_size(len(content), config.max_input_bytes)
+    extractor = get_extractor(config)
+    with recursion_guard():
+        if extractor.needs_soup:
+            content = parse_html(content, config.filter_type, config.filter_name, config.max_nodes)
+        return [astuple(link) for link in extractor.extract_links(content)]
+
+
+@dataclass
+class BatchOptions:
+    """Options for a batch run."""
+
+    workers: int | None = None
+    max_tasks_per_child: int | None = DEFAULT_MAX_TASKS_PER_CHILD
+    fetch_threads: int = DEFAULT_FETCH_THREADS
+    quiet: bool = False
+    record: str | None = None
+    replay: str | None = None
+    # Only poll feeds that are due according to their change history
+    adaptive: bool = False
+    state_dir: str | None = None
+    min_interval: float = DEFAULT_MIN_INTERVAL
+    max_interval: float = DEFAULT_MAX_INTERVAL
+    # Don't render or save feeds with the same entries as their output
+    skip_unchanged: bool = False
+    # File, or - for stdout, to append entries that earlier runs haven't seen to
+    emit_new: str | None = None
+    # Don't emit the entries of the first run for a feed, only remember them
+    emit_skip_first: bool = False
+
+
+def run_batch(feeds: list[FeedConfig], options: BatchOptions | None = None) -> int:
+    """Generate all feeds, fetching on threads and extracting in processes.
+
+    Args:
+        feeds: Configuration for each feed
+        options: Pool sizes, output and fixture options
+
+    Returns:
+        0 if all feeds were generated, 1 if any feed failed
+
+    """
+    options = options or BatchOptions()
+    failures = 0
+    if options.adaptive:
+        feeds, failures = due_feeds(feeds, options)
+    with (
+        create_session(options.record, options.replay) as session,
+        ThreadPoolExecutor(max_workers=options.fetch_threads) as fetchers,
+        create_process_pool(options) as parsers,
+    ):
+        fetches: dict[Future, FeedConfig] = {}
+        parses: dict[Future, FeedConfig] = {}
+        for config in feeds:
+            if fetches_pages(config):
+                parses[fetchers.submit(fetch_entries, config, session)] = config
+            else:
+                fetches[fetchers.submit(load_content, config, session)] = config
+        for future in as_completed(fetches):
+            config = fetches[future]
+            try:
+                content = future.result()
+            except Exception as e:  # noqa: BLE001
+                print_failure(config.url, e)
+                failures += 1
+                continue
+            parses[parsers.submit(extract_entries, content, config)] = config
+
+        for future in as_completed(parses):
+            if not write_feed(future, parses[future], options):
+                failures += 1
+
+    return 1 if failures else 0
+
+
+def due_feeds(feeds: list[FeedConfig], options: BatchOptions) -> tuple[list[FeedConfig], int]:
+    """Select the feeds that are due to be polled.
+
+    Feeds with a state file that can't be read are reported and not polled.
+
+    Args:
+        feeds: Configuration for each feed
+        options: Batch options with the state directory and interval bounds
+
+    Returns:
+        Feeds to poll now and the number of feeds with an unreadable state
+
+    """
+    now = datetime.now(UTC)
+    due = []
+    failures = 0
+    for config in feeds:
+        try:
+            state = FeedStateStore.for_output(config.output, options.state_dir).load()
+        except RSSFixerError as e:
+            print(f"ERROR: {config.url}: {e}")
+            failures += 1
+            continue
+        schedule = plan(state.poll, options.min_interval, options.max_interval)
+        if schedule.due(now):
+            due.append(config)
+        elif not options.quiet:
+            print(f"SKIPPED: {config.url}: next poll at {schedule.next_poll:%Y-%m-%d %H:%M}, {schedule.reason}")
+    return due, failures
+
+
+def print_failure(url: str, error: Exception) -> None:
+    """Print why a feed failed.
+
+    Errors that aren't an RSSFixerError come from a bug or from input that
+    nothing checked, and are marked as unexpected.
+
+    Args:
+        url: URL of the feed
+        error: Exception raised for the feed
+
+    """
+    label = "ERROR" if isinstance(error, RSSFixerError) else "UNEXPECTED ERROR"
+    print(f"{label}: {url}: {error}")
+
+
+def create_process_pool(options: BatchOptions) -> ProcessPoolExecutor:
+    """Create the worker pool for parsing and extraction.
+
+    Args:
+        options: Batch options with pool size and worker recycling
+
+    Returns:
+        Process pool
+
+    """
+    return ProcessPoolExecutor(
+        max_workers=options.workers or os.cpu_count(),
+        max_tasks_per_child=options.max_tasks_per_child,
+    )
+
+
+def write_feed(future: Future, config: FeedConfig, options: BatchOptions) -> bool:
+    """Render and save the feed for a completed extract_entries task.
+
+    Errors are printed with the URL of the feed, also unexpected ones, so
+    one broken feed doesn't stop the others from being saved. For adaptive runs the check is
+    also recorded in the change history of the feed. With skip_unchanged, a
+    feed with the same entries as its existing output is not rendered again.
+    With emit_new, the entries that earlier runs haven't seen are appended to
+    the new entries file.
+
+    Args:
+        future: Completed extract_entries task
+        config: Configuration for the feed
+        options: Batch options
+
+    Returns:
+        True if the feed was saved or unchanged
+
+    """
+    try:
+        links = [LinkEntry(*fields) for fields in future.result()]
+        if not (options.adaptive or options.skip_unchanged or options.emit_new):
+            save_feeds(render_feeds(links, config), config, options.quiet)
+            return True
+
+        store = FeedStateStore.for_output(config.output, options.state_dir)
+        state = store.load()
+        digest = feed_digest(links, config)
+        saved = all(os.path.exists(path) for _, path in config.outputs())
+        if options.skip_unchanged and digest == state.feed_digest and saved:
+            if not options.quiet:
+                print(f"UNCHANGED: {config.url}")
+        else:
+            save_feeds(render_feeds(links, config), config, options.quiet)
+            state.feed_digest = digest
+        now = datetime.now(UTC)
+        if options.adaptive:
+            state.poll = record_poll(state.poll, (link.url for link in links), now)
+        if options.emit_new:
+            records = find_new_entries(links, config, state, now, options.emit_skip_first)
+            append_records(records, options.emit_new)
+        store.save(state)
+    except Exception as e:  # noqa: BLE001
+        print_failure(config.url, e)
+        return False
+    return True
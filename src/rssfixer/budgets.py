@@ -0,0 +1,151 @@
+"""Resource budgets that bound the work done for one feed.
+
+Pages that are huge, very deeply nested or otherwise pathological should
+fail fast with a BudgetExceededError naming the budget instead of using
+CPU for minutes or failing with a RecursionError. A Deadline bounds the
+time of a whole run in the same way.
+"""
+
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+from .exceptions import BudgetExceededError, DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class NodeBudget:
+    """Counter of visited nodes with a limit."""
+
+    __slots__ = ("budget", "count", "limit")
+
+    def __init__(self, budget: str, limit: int | None):
+        """Initialize the counter.
+
+        Args:
+            budget: Name of the budget, used in the error
+            limit: Maximum number of visits, None for no limit
+
+        """
+        self.budget = budget
+        self.limit = limit
+        self.count = 0
+
+    def visit(self, count: int = 1) -> None:
+        """Count visited nodes.
+
+        Args:
+            count: Number of nodes visited
+
+        Raises:
+            BudgetExceededError: If more nodes than the limit have been visited
+
+        """
+        self.count += count
+        if self.limit is not None and self.count > self.limit:
+            raise BudgetExceededError(self.budget, self.limit)
+
+
+def check_size(size: int, limit: int | None) -> None:
+    """Check the size of the input against its budget.
+
+    Args:
+        size: Size of the input in bytes
+        limit: Maximum size, None for no limit
+
+    Raises:
+        BudgetExceededError: If the input is larger than the limit
+
+    """
+    if limit is not None and size > limit:
+        raise BudgetExceededError("input bytes", limit)
+
+
+@contextmanager
+def recursion_guard() -> Iterator[None]:
+    """Report a RecursionError from parsing or extraction as an exceeded budget.
+
+    Raises:
+        BudgetExceededError: If a RecursionError is raised inside the block
+
+    """
+    try:
+        yield
+    except RecursionError as e:
+        raise BudgetExceededError("recursion depth", sys.getrecursionlimit()) from e
+
+
+class Deadline:
+    """Time left for a run, checked between and during its stages."""
+
+    def __init__(self, seconds: float | None):
+        """Start the clock.
+
+        Args:
+            seconds: Time allowed from now, None for no deadline
+
+        """
+        self.seconds = seconds
+        self.expires = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float | None:
+        """Get the time left.
+
+        Returns:
+            Seconds left, negative once the deadline has passed, None for no deadline
+
+        """
+        return None if self.expires is None else self.expires - time.monotonic()
+
+    def check(self, stage: str) -> None:
+        """Fail if the deadline has passed.
+
+        Args:
+            stage: Stage of the run, used in the error
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"Deadline of {self.seconds:g} seconds exceeded during {stage}")
+
+    def timeout(self, default: float, stage: str) -> float:
+        """Get a timeout for a blocking call that ends no later than the deadline.
+
+        Args:
+            default: Timeout to use if more time than that is left
+            stage: Stage of the run, used in the error
+
+        Returns:
+            The smaller of default and the time left
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+
+        """
+        self.check(stage)
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+    def watch(self, items: Iterable[T], stage: str) -> Iterator[T]:
+        """Check the deadline before every item of an iterable.
+
+        Args:
+            items: Items produced by the stage, for example extracted entries
+            stage: Stage of the run, used in the error
+
+        Yields:
+            The items
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before the last item
+
+        """
+        for item in items:
+            self.check(stage)
+            yield item
@@ -1,10 +1,40 @@
 """Command line interface and argument parsing."""
 
 import argparse
+import functools
 import importlib.metadata
 
 from .exceptions import RSSFixerError
-from .extractors import HtmlExtractor, JsonExtractor, ListExtractor, ReleaseExtractor
+from .extractors import (
+    HtmlExtractor,
+    JsonExtractor,
+    LinkExtractor,
+    ListExtractor,
+    ReleaseExtractor,
+    SitemapExtractor,
+    StructuredDataExtractor,
+)
+from .extractors.sitemap import parse_since
+from .lock import DEFAULT_STEAL_AFTER, EXIT_LOCKED, LOCK_POLICIES
+from .models import (
+    AGGREGATE_ORDERS,
+    DEFAULT_AGGREGATE_ENTRIES,
+    DEFAULT_FETCH_THREADS,
+    DEFAULT_JSON_MAX_DEPTH,
+    DEFAULT_JSON_MAX_NODES,
+    DEFAULT_MAX_INPUT_BYTES,
+    DEFAULT_MAX_NODES,
+    DEFAULT_MAX_TASKS_PER_CHILD,
+    DEFAULT_USER_AGENT,
+    FEED_FORMATS,
+    FeedConfig,
+)
+from .schedule import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL
+from .simhash import MAX_DISTANCE
+from .state import EXIT_UNCHANGED
+
+# Number of feed configurations whose extractors are kept
+EXTRACTOR_CACHE_SIZE = 256
 
 try:
     __version__ = "version " + importlib.metadata.version(__package__ or __name__)
@@ -12,9 +42,62 @@ except importlib.metadata.PackageNotFoundError:  # pragma: no cover
     __version__ = "0.0.0"
 
 
-DEFAULT_USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
-)
+def positive_int(value: str) -> int:
+    """Validate that an argument is a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Validate that an argument is a positive number."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0 or number == float("inf"):
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+
+def near_duplicate_distance(value: str) -> int:
+    """Validate the distance for --near-duplicates."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if not 0 <= number <= MAX_DISTANCE:
+        raise argparse.ArgumentTypeError(f"{value} is not a distance between 0 and {MAX_DISTANCE}")
+    return number
+
+
+def sitemap_since(value: str) -> str:
+    """Validate --sitemap-since, a date or a number of days like 30d."""
+    try:
+        parse_since(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value} is neither a date nor a number of days like 30d") from None
+    return value
+
+
+def feed_formats(value: str) -> tuple[str, ...]:
+    """Validate --format, a comma separated list of output formats."""
+    formats = tuple(name.strip() for name in value.split(","))
+    if not formats or any(name not in FEED_FORMATS for name in formats) or len(set(formats)) != len(formats):
+        raise argparse.ArgumentTypeError(f"{value} is not a list of different formats from {','.join(FEED_FORMATS)}")
+    return formats
+
+
+def format_output(value: str) -> tuple[str, str]:
+    """Validate --format-output, an output format and a file like atom=feed.atom."""
+    name, _, path = value.partition("=")
+    if name.strip() not in FEED_FORMATS or not path.strip():
+        raise argparse.ArgumentTypeError(f"{value} is not FORMAT=FILE with a format from {','.join(FEED_FORMATS)}")
+    return name.strip(), path.strip()
 
 
 class CheckHtmlAction(argparse.Action):
@@ -37,6 +120,28 @@ class CheckJsonAction(argparse.Action):
         setattr(namespace, self.dest, values)
 
 
+class CheckListAction(argparse.Action):
+    """Class to validate argparse for repeatable --list options."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Validate the class."""
+        if not namespace.list:
+            parser.error(f"{option_string} requires --list to be specified.")
+        items = list(getattr(namespace, self.dest, None) or [])
+        items.append(values)
+        setattr(namespace, self.dest, items)
+
+
+class CheckSitemapAction(argparse.Action):
+    """Class to validate argparse for --sitemap options."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Validate the class."""
+        if not namespace.sitemap:
+            parser.error(f"{option_string} requires --sitemap to be specified.")
+        setattr(namespace, self.dest, values)
+
+
 class CheckReleaseAction(argparse.Action):
     """Class to validate argparse for --release options."""
 
@@ -47,14 +152,37 @@ class CheckReleaseAction(argparse.Action):
         setattr(namespace, self.dest, values)
 
 
-def parse_arguments(arguments):
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="""Generate RSS feed for blog that don't publish a feed.
-        Default is to find links in a simple <ul>-list.
-        Options are available to find links in other HTML elements or JSON strings.""",
+def add_fixture_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mutually exclusive --record and --replay options."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="DIR", help="Record fetched responses in DIR")
+    group.add_argument("--replay", metavar="DIR", help="Replay responses recorded in DIR, without network access")
+
+
+def add_pool_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for the fetch threads and the worker processes of commands that generate many feeds."""
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes for parsing (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--max-tasks-per-child",
+        type=positive_int,
+        default=DEFAULT_MAX_TASKS_PER_CHILD,
+        help=f"Replace a worker process after it has parsed this many pages (default: {DEFAULT_MAX_TASKS_PER_CHILD})",
+    )
+    parser.add_argument(
+        "--fetch-threads",
+        type=positive_int,
+        default=DEFAULT_FETCH_THREADS,
+        help=f"Number of concurrent fetches (default: {DEFAULT_FETCH_THREADS})",
     )
 
+
+def add_mode_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mutually exclusive options for the type of page."""
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--html", action="store_true", help="Find entries in HTML")
     group.add_argument("--json", action="store_true", help="Find entries in JSON")
@@ -64,6 +192,143 @@ def parse_arguments(arguments):
         help="Find entries in HTML <ul>-list (default)",
     )
     group.add_argument("--release", action="store_true", help="Find releases in HTML")
+    group.add_argument(
+        "--structured",
+        action="store_true",
+        help="Find entries in JSON-LD, Next.js or Nuxt data without parsing the HTML",
+    )
+    group.add_argument(
+        "--sitemap",
+        action="store_true",
+        help="Find the newest pages in a sitemap or sitemap index, plain or gzip compressed",
+    )
+
+
+def add_sitemap_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the filters for --sitemap."""
+    parser.add_argument(
+        "--sitemap-include",
+        action=CheckSitemapAction,
+        metavar="REGEX",
+        help="Only include pages with URLs matching REGEX",
+    )
+    parser.add_argument(
+        "--sitemap-since",
+        action=CheckSitemapAction,
+        type=sitemap_since,
+        metavar="DATE",
+        help="Only include pages modified since DATE, like 2024-01-31, or the last days, like 30d",
+    )
+
+
+def add_format_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for the output formats and their files."""
+    parser.add_argument(
+        "--output",
+        default="rss_feed.xml",
+        help="Name of the output file",
+    )
+    parser.add_argument("--atom", action="store_true", help="Generate Atom feed, same as --format atom")
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        type=feed_formats,
+        metavar="FORMATS",
+        help=f"Write the feed in each of the comma separated FORMATS from {','.join(FEED_FORMATS)}, "
+        "extracting the entries once (default: rss)",
+    )
+    parser.add_argument(
+        "--format-output",
+        dest="format_outputs",
+        action="append",
+        type=format_output,
+        metavar="FORMAT=FILE",
+        help="Write FORMAT to FILE, can be repeated (default: --output for the first format and --output "
+        "with the extension .xml, .atom or .json for the others)",
+    )
+
+
+def add_lock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for locking the output file."""
+    parser.add_argument(
+        "--lock",
+        choices=LOCK_POLICIES,
+        help="Lock the output file against overlapping runs: skip exits with status "
+        f"{EXIT_LOCKED} if another run holds the lock, wait waits for it and steal also takes over a lock "
+        "older than --lock-steal-after",
+    )
+    parser.add_argument(
+        "--lock-steal-after",
+        type=positive_float,
+        default=DEFAULT_STEAL_AFTER,
+        metavar="SECONDS",
+        help=f"Age of a lock that --lock steal takes over (default: {DEFAULT_STEAL_AFTER})",
+    )
+
+
+def add_skip_unchanged_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for skipping feeds with unchanged entries in single runs."""
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Don't render or save the feed if the entries are the same as when the output was saved, "
+        f"and exit with status {EXIT_UNCHANGED}",
+    )
+    parser.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        help="Directory for the state file with the digest and the URLs of the entries (default: next to the output)",
+    )
+
+
+def add_emit_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for the stream of new entries."""
+    parser.add_argument(
+        "--emit-new",
+        metavar="FILE",
+        help="Append the entries that earlier runs haven't seen to FILE, or print them for -, as newline "
+        "delimited JSON with the feed URL, entry URL, title, description and first seen time. The first run "
+        "for a feed emits all its entries",
+    )
+    parser.add_argument(
+        "--emit-skip-first",
+        action="store_true",
+        help="Only remember the entries of the first run for a feed with --emit-new, without emitting them",
+    )
+
+
+def add_schedule_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options for the state and the bounds of adaptive poll intervals."""
+    parser.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        help="Directory for the state files with the change history (default: next to each output)",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=positive_float,
+        default=DEFAULT_MIN_INTERVAL,
+        metavar="SECONDS",
+        help=f"Shortest time between polls of a feed (default: {DEFAULT_MIN_INTERVAL})",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=positive_float,
+        default=DEFAULT_MAX_INTERVAL,
+        metavar="SECONDS",
+        help=f"Longest time between polls of a feed that doesn't change (default: {DEFAULT_MAX_INTERVAL})",
+    )
+
+
+def parse_arguments(arguments):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="""Generate RSS feed for blog that don't publish a feed.
+        Default is to find links in a simple <ul>-list.
+        Options are available to find links in other HTML elements or JSON strings.""",
+    )
+
+    add_mode_arguments(parser)
 
     parser.add_argument(
         "--version",
@@ -71,8 +336,20 @@ def parse_arguments(arguments):
         version="%(prog)s " + __version__,
     )
     parser.add_argument("url", help="URL for the blog")
-    parser.add_argument("--atom", action="store_true", help="Generate Atom feed")
+    add_format_arguments(parser)
     parser.add_argument("--base-url", help="Base URL for the blog")
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Read the page from FILE, or stdin for -, instead of fetching url",
+    )
+    parser.add_argument(
+        "--list-exclude",
+        action=CheckListAction,
+        metavar="PATTERN",
+        help="Ignore list links with URLs containing PATTERN, can be repeated "
+        "(/category/ and /author/ are always ignored)",
+    )
     parser.add_argument(
         "--release-url",
         action=CheckReleaseAction,
@@ -83,6 +360,7 @@ def parse_arguments(arguments):
         action=CheckReleaseAction,
         help="Release selector for entries",
     )
+    add_sitemap_arguments(parser)
     parser.add_argument(
         "--html-entries",
         action=CheckHtmlAction,
@@ -113,6 +391,40 @@ def parse_arguments(arguments):
         default="title",
         help="Flag to specify title class (regex)",
     )
+    parser.add_argument(
+        "--max-entries",
+        type=positive_int,
+        metavar="N",
+        help="Stop extracting when N unique entries have been found",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        type=near_duplicate_distance,
+        metavar="DISTANCE",
+        help="Skip entries whose title and description differ from an earlier entry's in at most "
+        f"DISTANCE of the 64 SimHash bits, 3 is a good start (0 to {MAX_DISTANCE})",
+    )
+    parser.add_argument(
+        "--max-input-bytes",
+        type=positive_int,
+        default=DEFAULT_MAX_INPUT_BYTES,
+        metavar="N",
+        help=f"Fail if the page is larger than N bytes (default: {DEFAULT_MAX_INPUT_BYTES})",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=positive_int,
+        default=DEFAULT_MAX_NODES,
+        metavar="N",
+        help=f"Fail if filtering and extraction visit more than N HTML elements or structured data values "
+        f"(default: {DEFAULT_MAX_NODES})",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=positive_float,
+        metavar="SECONDS",
+        help="Fail if fetching, parsing, extraction and rendering take longer, leaving the output file untouched",
+    )
     parser.add_argument(
         "--title-filter",
         help="Filter for title, ignore entries that don't match",
@@ -129,34 +441,63 @@ def parse_arguments(arguments):
         default="summary",
         help="Flag to specify description class (regex)",
     )
+    parser.add_argument(
+        "--html-date",
+        action=CheckHtmlAction,
+        default=None,
+        help="HTML selector for publication date, the datetime attribute is used if present",
+    )
+    parser.add_argument(
+        "--html-date-class",
+        action=CheckHtmlAction,
+        default="",
+        help="Flag to specify date class (regex)",
+    )
     parser.add_argument(
         "--json-entries",
         action=CheckJsonAction,
         default="entries",
-        help="JSON key for entries (default: 'entries')",
+        help="""JSON key to search for, or path to the entries like props.pageProps.blogs[*]
+        (default: 'entries')""",
     )
     parser.add_argument(
         "--json-url",
         action=CheckJsonAction,
         default="url",
-        help="JSON key for URL (default: 'url')",
+        help="JSON key or path in each entry for URL, like fields.slug (default: 'url')",
     )
     parser.add_argument(
         "--json-title",
         action=CheckJsonAction,
         default="title",
-        help="JSON key for title",
+        help="JSON key or path in each entry for title",
     )
     parser.add_argument(
         "--json-description",
         action=CheckJsonAction,
         default="description",
-        help="JSON key for description",
+        help="JSON key or path in each entry for description",
     )
     parser.add_argument(
-        "--output",
-        default="rss_feed.xml",
-        help="Name of the output file",
+        "--json-date",
+        action=CheckJsonAction,
+        default=None,
+        help="JSON key or path in each entry for publication date",
+    )
+    parser.add_argument(
+        "--json-max-depth",
+        action=CheckJsonAction,
+        type=positive_int,
+        default=DEFAULT_JSON_MAX_DEPTH,
+        help=f"Fail if the search for the --json-entries key goes deeper (default: {DEFAULT_JSON_MAX_DEPTH})",
+    )
+    parser.add_argument(
+        "--json-max-nodes",
+        action=CheckJsonAction,
+        type=positive_int,
+        default=DEFAULT_JSON_MAX_NODES,
+        help=f"Fail if the search for the --json-entries key visits more JSON values "
+        f"(default: {DEFAULT_JSON_MAX_NODES})",
     )
     parser.add_argument(
         "--title",
@@ -177,18 +518,171 @@ def parse_arguments(arguments):
         help="Filter web page",
     )
 
+    add_fixture_arguments(parser)
+
+    add_lock_arguments(parser)
+    add_skip_unchanged_arguments(parser)
+    add_emit_arguments(parser)
     parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print matches, time and dropped entries for each selector to stderr",
+    )
     parser.add_argument("-d", "--debug", action="store_true", help="Debug selection")
     parser.add_argument("--stdout", action="store_true", help="Print to stdout")
 
+    args = parser.parse_args(arguments)
+    check_outputs(parser, args)
+    return args
+
+
+def check_outputs(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Check that every output format has its own file, and that only one thing is printed to stdout."""
+    try:
+        outputs = FeedConfig.from_arguments(args).outputs()
+    except ValueError as e:
+        parser.error(str(e))
+    if args.stdout and len(outputs) > 1:
+        parser.error("--stdout can only print one format")
+    if args.stdout and args.emit_new == "-":
+        parser.error("--emit-new - can't be used with --stdout, since both print to stdout")
+
+
+def parse_batch_arguments(arguments):
+    """Parse command line arguments for the batch command."""
+    parser = argparse.ArgumentParser(
+        prog="rssfixer batch",
+        description="""Generate all feeds defined in a TOML file. Pages are fetched on threads
+        and parsed in a pool of worker processes.""",
+    )
+    parser.add_argument("config", help="TOML file with [[feed]] definitions")
+    add_pool_arguments(parser)
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Skip feeds that are not due, polling feeds that rarely change less often",
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Don't render or save feeds whose entries are the same as when their output was saved",
+    )
+    add_emit_arguments(parser)
+    add_schedule_arguments(parser)
+    add_fixture_arguments(parser)
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+
     return parser.parse_args(arguments)
 
 
-def get_extractor(arguments) -> HtmlExtractor | JsonExtractor | ListExtractor | ReleaseExtractor:
-    """Get appropriate extractor based on arguments.
+def parse_schedule_arguments(arguments):
+    """Parse command line arguments for the schedule command."""
+    parser = argparse.ArgumentParser(
+        prog="rssfixer schedule",
+        description="""Show when each feed defined in a TOML file is next polled by batch --adaptive,
+        and why.""",
+    )
+    parser.add_argument("config", help="TOML file with [[feed]] definitions")
+    add_schedule_arguments(parser)
+
+    return parser.parse_args(arguments)
+
+
+def parse_aggregate_arguments(arguments):
+    """Parse command line arguments for the aggregate command."""
+    parser = argparse.ArgumentParser(
+        prog="rssfixer aggregate",
+        description="""Generate one feed from the entries of all feeds defined in a TOML file,
+        newest first. Entries are dated by their publication date or else by when they were first seen.""",
+    )
+    parser.add_argument("config", help="TOML file with [[feed]] definitions for the sources")
+    parser.add_argument("--url", required=True, help="URL for the id and link of the aggregate feed")
+    parser.add_argument("--output", required=True, help="Name of the output file")
+    parser.add_argument("--title", default="Aggregated feed", help='Title of the feed (default: "Aggregated feed")')
+    parser.add_argument("--atom", action="store_true", help="Create an Atom feed")
+    parser.add_argument(
+        "--max-entries",
+        type=positive_int,
+        default=DEFAULT_AGGREGATE_ENTRIES,
+        metavar="N",
+        help=f"Number of entries in the feed (default: {DEFAULT_AGGREGATE_ENTRIES})",
+    )
+    parser.add_argument(
+        "--order",
+        choices=AGGREGATE_ORDERS,
+        default="date",
+        help="Order by publication date, falling back to first seen, or only by first seen (default: date)",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        type=near_duplicate_distance,
+        metavar="DISTANCE",
+        help="Also skip near duplicates across sources, see the same option for single feeds",
+    )
+    parser.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        help="Directory for the state file with first seen times (default: next to the output)",
+    )
+    add_pool_arguments(parser)
+    add_fixture_arguments(parser)
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+
+    return parser.parse_args(arguments)
+
+
+def parse_warc_arguments(arguments):
+    """Parse command line arguments for the warc command."""
+    parser = argparse.ArgumentParser(
+        prog="rssfixer warc",
+        description="""Generate the feeds defined in a TOML file from the responses stored in a
+        WARC archive, without network access.""",
+    )
+    parser.add_argument("warc", help="WARC file, plain or gzip compressed")
+    parser.add_argument("--config", required=True, help="TOML file with [[feed]] definitions")
+    add_pool_arguments(parser)
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+
+    return parser.parse_args(arguments)
+
+
+def parse_detect_arguments(arguments):
+    """Parse command line arguments for the detect command."""
+    parser = argparse.ArgumentParser(
+        prog="rssfixer detect",
+        description="Fetch a page once and suggest extractor options for it.",
+    )
+    parser.add_argument("url", help="URL for the blog")
+    parser.add_argument(
+        "--limit",
+        type=positive_int,
+        default=5,
+        help="Number of suggestions to show (default: 5)",
+    )
+    parser.add_argument(
+        "--preview",
+        type=positive_int,
+        default=3,
+        help="Number of entries to show for each suggestion (default: 3)",
+    )
+    parser.add_argument(
+        "--user-agent",
+        default=DEFAULT_USER_AGENT,
+        help="User agent to use for HTTP requests",
+    )
+
+    return parser.parse_args(arguments)
+
+
+def get_extractor(config) -> LinkExtractor:
+    """Get appropriate extractor for a feed configuration.
+
+    Extractors don't change while extracting, so the extractor for a FeedConfig
+    is built once and shared by later calls, also from other threads.
 
     Args:
-        arguments: Parsed command line arguments
+        config: FeedConfig, or parsed command line arguments to build one from
 
     Returns:
         Appropriate LinkExtractor instance
@@ -197,15 +691,27 @@ def get_extractor(arguments) -> HtmlExtractor | JsonExtractor | ListExtractor |
         RSSFixerError: If no valid extractor type specified or missing required arguments
 
     """
-    if arguments.json:
-        return JsonExtractor(arguments)
-    elif arguments.html:
-        return HtmlExtractor(arguments)
-    elif arguments.list:
-        return ListExtractor(arguments)
-    elif arguments.release:
-        if not getattr(arguments, "release_url", False):
+    if not isinstance(config, FeedConfig):
+        config = FeedConfig.from_arguments(config)
+    return _build_extractor(config)
+
+
+@functools.lru_cache(maxsize=EXTRACTOR_CACHE_SIZE)
+def _build_extractor(config: FeedConfig) -> LinkExtractor:
+    """Build the extractor for a feed configuration, see get_extractor."""
+    if config.mode == "json":
+        return JsonExtractor(config)
+    elif config.mode == "html":
+        return HtmlExtractor(config)
+    elif config.mode == "list":
+        return ListExtractor(config)
+    elif config.mode == "release":
+        if not config.release_url:
             raise RSSFixerError("Release URL not specified")
-        return ReleaseExtractor(arguments)
+        return ReleaseExtractor(config)
+    elif config.mode == "structured":
+        return StructuredDataExtractor(config)
+    elif config.mode == "sitemap":
+        return SitemapExtractor(config)
     else:
         raise RSSFixerError("No valid blog type specified")
@@ -0,0 +1,184 @@
+"""Parse publication dates in the format a site uses.
+
+Each supported format is a compiled regular expression and a converter for
+its match. A DateParser tries the formats in order for the first date of a
+feed and remembers the one that matched, so the rest of the entries, which
+almost always use the same format, are parsed with a single search. The
+formats are only tried again for a date the remembered one can't parse.
+
+A numeric date like 03/04/2024 reads as both month/day/year and
+day/month/year. Such a date is parsed in the first of them, but the format
+is only remembered from a date that only one of them can read, like
+25/04/2024, so the first date of a page doesn't decide it by chance.
+"""
+
+import email.utils
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+# Timestamps above this are in milliseconds
+MILLISECOND_TIMESTAMP = 10**11
+
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sept", "sep"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+_MONTH = "(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+_DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+
+
+@dataclass(frozen=True)
+class DateFormat:
+    """A date format: a pattern to find the date and a converter for the match."""
+
+    name: str
+    pattern: re.Pattern
+    convert: Callable[[re.Match], datetime]
+
+    def parse(self, text: str) -> datetime | None:
+        """Find and convert a date in a text.
+
+        Args:
+            text: Text that may contain a date
+
+        Returns:
+            Time zone aware datetime, or None if the text has no date in this format
+
+        """
+        match = self.pattern.search(text)
+        if not match:
+            return None
+        try:
+            date = self.convert(match)
+        except (ValueError, TypeError, OverflowError):
+            return None
+        return date if date.tzinfo else date.replace(tzinfo=UTC)
+
+
+def _numeric(year: int, month: int, day: int) -> Callable[[re.Match], datetime]:
+    """Build a converter for a numeric date from the group numbers of its parts."""
+    return lambda match: datetime(int(match[year]), int(match[month]), int(match[day]))
+
+
+FORMATS = (
+    DateFormat(
+        "iso",
+        re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"),
+        lambda match: datetime.fromisoformat(match[0]),
+    ),
+    DateFormat(
+        "rfc2822",
+        re.compile(r"(?:[A-Z][a-z]{2}, )?\d{1,2} [A-Z][a-z]{2} \d{4} \d{2}:\d{2}(?::\d{2})? (?:[+-]\d{4}|[A-Z]{1,4})"),
+        lambda match: email.utils.parsedate_to_datetime(match[0]),
+    ),
+    DateFormat(
+        "month day year",
+        re.compile(rf"\b{_MONTH} {_DAY},? (\d{{4}})\b", re.IGNORECASE),
+        lambda match: datetime(int(match[3]), MONTHS[match[1].lower()], int(match[2])),
+    ),
+    DateFormat(
+        "day month year",
+        re.compile(rf"\b{_DAY}\.? {_MONTH},? (\d{{4}})\b", re.IGNORECASE),
+        lambda match: datetime(int(match[3]), MONTHS[match[2].lower()], int(match[1])),
+    ),
+    DateFormat("year/month/day", re.compile(r"\b(\d{4})/(\d{1,2})/(\d{1,2})\b"), _numeric(1, 2, 3)),
+    DateFormat("day.month.year", re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b"), _numeric(3, 2, 1)),
+    DateFormat("month/day/year", re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b"), _numeric(3, 1, 2)),
+    DateFormat("day/month/year", re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b"), _numeric(3, 2, 1)),
+)
+
+# Other formats that find the same dates, and may read them differently
+READINGS = {
+    date_format.name: tuple(
+        other for other in FORMATS if other is not date_format and other.pattern.pattern == date_format.pattern.pattern
+    )
+    for date_format in FORMATS
+}
+
+
+class DateParser:
+    """Date parser that remembers the format of the first date it parses."""
+
+    def __init__(self):
+        """Initialize the parser without a detected format."""
+        self.format: DateFormat | None = None
+
+    def parse(self, value: Any) -> datetime | None:
+        """Parse a date string or a Unix timestamp.
+
+        Dates without a time zone are taken to be in UTC.
+
+        Args:
+            value: Text containing a date, or a timestamp in seconds or milliseconds
+
+        Returns:
+            Time zone aware datetime, or None if no date is found
+
+        """
+        if isinstance(value, bool) or value is None:
+            return None
+        if isinstance(value, int | float):
+            return _from_timestamp(value)
+
+        text = " ".join(str(value).split())
+        if not text:
+            return None
+        if self.format:
+            date = self.format.parse(text)
+            if date:
+                return date
+        for date_format in FORMATS:
+            if date_format is self.format:
+                continue
+            date = date_format.parse(text)
+            if date:
+                if not _is_ambiguous(date_format, text, date):
+                    self.format = date_format
+                return date
+        return None
+
+
+def parse_date(value: Any) -> datetime | None:
+    """Parse a single date without remembering its format.
+
+    Args:
+        value: Text containing a date, or a timestamp in seconds or milliseconds
+
+    Returns:
+        Time zone aware datetime, or None if no date is found
+
+    """
+    return DateParser().parse(value)
+
+
+def _is_ambiguous(date_format: DateFormat, text: str, date: datetime) -> bool:
+    """Check if another format reads the date in a text as a different date."""
+    return any(other.parse(text) not in (None, date) for other in READINGS[date_format.name])
+
+
+def _from_timestamp(value: float) -> datetime | None:
+    """Convert a Unix timestamp in seconds or milliseconds."""
+    try:
+        return datetime.fromtimestamp(value / 1000 if value > MILLISECOND_TIMESTAMP else value, UTC)
+    except (ValueError, OverflowError, OSError):
+        return None
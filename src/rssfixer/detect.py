@@ -0,0 +1,282 @@
+"""Detect extractor options for a page.
+
+The page is fetched once. A single pass over the DOM groups elements by a
+fingerprint of their tag path and class signature, and the embedded JSON is
+decoded once and searched for arrays of objects with URL and title like keys.
+Each distinct configuration is then verified by running the real extractor on
+the already parsed page, or on the already decoded JSON, so the reported
+number of entries is what a feed with those options would get.
+"""
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+
+from .cli import get_extractor
+from .exceptions import RSSFixerError
+from .models import FeedConfig, LinkEntry
+
+URL_KEYS = ("url", "href", "link", "permalink", "slug", "path", "uri")
+TITLE_KEYS = ("title", "headline", "name", "heading", "label")
+DESCRIPTION_KEYS = ("description", "summary", "excerpt", "preamble", "teaser", "abstract", "intro")
+
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# Elements that are never entries themselves
+SKIPPED_TAGS = frozenset(
+    {"a", "b", "br", "em", "i", "img", "link", "meta", "path", "script", "span", "strong", "style", "svg", "time"},
+)
+
+MIN_REPEAT = 3
+LINK_DEPTH = 4
+MAX_HTML_CANDIDATES = 8
+
+# Priority of stable sources over HTML selectors when counts are equal
+PRIORITIES = {"json": 2, "list": 1}
+
+
+@dataclass
+class Candidate:
+    """A verified extractor configuration."""
+
+    options: list[str]
+    count: int
+    links: list[LinkEntry] = field(default_factory=list)
+    priority: int = 0
+
+    @property
+    def score(self) -> tuple[int, int]:
+        """Sort key, more entries first and stable sources before HTML selectors."""
+        return (self.count, self.priority)
+
+
+def detect(soup: BeautifulSoup, url: str) -> list[Candidate]:
+    """Find and rank extractor configurations for a parsed page.
+
+    Args:
+        soup: Parsed HTML content
+        url: URL of the page, used for the suggested command lines
+
+    Returns:
+        Verified candidates, best first
+
+    """
+    groups, scripts = _scan(soup)
+    documents = _decode(scripts)
+
+    attempts: list[tuple[str, dict[str, str]]] = [("list", {})]
+    attempts.extend(("json", fields) for fields in _json_options(documents))
+    attempts.extend(("html", fields) for fields in _html_options(groups))
+
+    candidates = []
+    seen: set[tuple] = set()
+    for mode, fields in attempts:
+        options = [
+            f"--{mode}",
+            *chain.from_iterable((f"--{name.replace('_', '-')}", value) for name, value in fields.items()),
+        ]
+        candidate = _verify(soup, documents, FeedConfig(url=url, mode=mode, **fields), options)
+        if not candidate:
+            continue
+        # Skip selectors that only find the same entries as a previous one
+        key = (candidate.count, *(link.url for link in candidate.links))
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append(candidate)
+
+    return sorted(candidates, key=lambda candidate: candidate.score, reverse=True)
+
+
+def _scan(soup: BeautifulSoup) -> tuple[dict[tuple, list[Tag]], list[str]]:
+    """Group elements by fingerprint in one pass over the document.
+
+    Args:
+        soup: Parsed HTML content
+
+    Returns:
+        Elements grouped by (parent path, tag, class signature) and the text of JSON script tags
+
+    """
+    fingerprints: dict[int, int] = {id(soup): 0}
+    groups: dict[tuple, list[Tag]] = {}
+    linked: set[int] = set()
+    scripts: list[str] = []
+
+    for node in soup.descendants:
+        if not isinstance(node, Tag):
+            continue
+
+        parent_fingerprint = fingerprints.get(id(node.parent), 0)
+        class_signature = tuple(sorted(node.get("class") or ()))
+        fingerprints[id(node)] = hash((parent_fingerprint, node.name, class_signature))
+
+        if node.name == "a" and node.get("href"):
+            for depth, parent in enumerate(node.parents):
+                if depth == LINK_DEPTH:
+                    break
+                linked.add(id(parent))
+        elif node.name == "script" and node.get("type") == "application/json":
+            scripts.append(node.text)
+
+        if node.name not in SKIPPED_TAGS:
+            groups.setdefault((parent_fingerprint, node.name, class_signature), []).append(node)
+
+    return {
+        key: members
+        for key, members in groups.items()
+        if sum(1 for member in members if id(member) in linked) >= MIN_REPEAT
+    }, scripts
+
+
+def _decode(scripts: list[str]) -> list[Any]:
+    """Parse the text of JSON script tags, skipping empty and invalid ones.
+
+    Args:
+        scripts: Text of JSON script tags
+
+    Returns:
+        Parsed JSON documents in page order
+
+    """
+    documents = []
+    for text in scripts:
+        if not text.strip():
+            continue
+        try:
+            documents.append(json.loads(text))
+        except json.JSONDecodeError:
+            continue
+    return documents
+
+
+def _html_options(groups: dict[tuple, list[Tag]]) -> list[dict[str, str]]:
+    """Build --html options for the largest groups of repeated elements.
+
+    Options that would select the same elements as an earlier group are only
+    returned once. Class options are left out where the default does the same.
+
+    Args:
+        groups: Repeated elements with links, grouped by fingerprint
+
+    Returns:
+        FeedConfig fields to verify
+
+    """
+    ranked = sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)[:MAX_HTML_CANDIDATES]
+
+    option_sets: dict[tuple, dict[str, str]] = {}
+    for (_, name, class_signature), members in ranked:
+        sample = members[:5]
+        headings = Counter(heading.name for member in sample if (heading := member.find(HEADINGS)))
+        fields = {"html_entries": name}
+        if class_signature:
+            fields["html_entries_class"] = class_signature[0]
+        # The default title and description classes would have to match too
+        fields["html_title"] = headings.most_common(1)[0][0] if headings else "a"
+        fields["html_title_class"] = ""
+        if any(member.find("p") for member in sample):
+            fields.update(html_description="p", html_description_class="")
+        else:
+            fields["html_description"] = ""
+        option_sets.setdefault(tuple(fields.items()), fields)
+    return list(option_sets.values())
+
+
+def _json_options(documents: list[Any]) -> list[dict[str, str]]:
+    """Build --json options for arrays of objects with URL and title keys.
+
+    Args:
+        documents: Parsed JSON documents
+
+    Returns:
+        FeedConfig fields to verify, each set once
+
+    """
+    option_sets: dict[tuple, dict[str, str]] = {}
+    stack: list[Any] = list(documents)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, list):
+                    fields = _json_entry_options(key, value)
+                    if fields:
+                        option_sets.setdefault(tuple(fields.items()), fields)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return list(option_sets.values())
+
+
+def _json_entry_options(key: str, entries: list[Any]) -> dict[str, str] | None:
+    """Build --json options if a list looks like feed entries.
+
+    Args:
+        key: Key holding the list
+        entries: The list
+
+    Returns:
+        FeedConfig fields or None
+
+    """
+    objects = [entry for entry in entries[:5] if isinstance(entry, dict)]
+    if not objects:
+        return None
+
+    def common_key(candidates: tuple[str, ...]) -> str | None:
+        for candidate in candidates:
+            if all(isinstance(entry.get(candidate), str) and entry[candidate] for entry in objects):
+                return candidate
+        return None
+
+    url_key = common_key(URL_KEYS)
+    title_key = common_key(TITLE_KEYS)
+    if not url_key or not title_key:
+        return None
+
+    fields = {"json_entries": key, "json_url": url_key, "json_title": title_key}
+    description_key = common_key(DESCRIPTION_KEYS)
+    if description_key:
+        fields["json_description"] = description_key
+    return fields
+
+
+def _verify(soup: BeautifulSoup, documents: list[Any], config: FeedConfig, options: list[str]) -> Candidate | None:
+    """Run the extractor for a configuration.
+
+    JSON entries are looked up in the already decoded documents instead of
+    decoding the script tags of the page again.
+
+    Args:
+        soup: Parsed HTML content
+        documents: Parsed JSON documents of the page
+        config: Configuration to try
+        options: Command line options for the configuration
+
+    Returns:
+        Candidate with the extracted links or None if nothing was found
+
+    """
+    try:
+        extractor = get_extractor(config)
+        if config.mode != "json":
+            links = extractor.extract_links(soup)
+        else:
+            entries = extractor.find_entries(documents)
+            context = extractor.new_context()
+            context.use_document(soup)
+            links = (
+                []
+                if entries is None
+                else list(islice(extractor.iter_entry_links(entries, context), config.max_entries))
+            )
+    except RSSFixerError:
+        return None
+    if not links:
+        return None
+    return Candidate(options=options, count=len(links), links=links, priority=PRIORITIES.get(config.mode, 0))
@@ -0,0 +1,111 @@
+"""New entries as a stream of newline delimited JSON.
+
+The canonical URLs of the entries of a feed are kept in its state file with
+the time they were first seen. Entries whose URL isn't known yet are written
+as one JSON object per line, so consumers can follow the file instead of
+downloading and comparing whole feeds.
+
+All lines of a run are appended with a single write to a file opened with
+O_APPEND, so runs writing to the same file at once don't mix their lines.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Iterable
+from datetime import datetime
+
+from .exceptions import FileWriteError
+from .models import FeedConfig, LinkEntry
+from .state import FeedState
+from .urls import canonicalize
+
+# Known entry URLs kept per feed, the newest are kept when there are more
+MAX_KNOWN_URLS = 10_000
+
+
+def find_new_entries(
+    links: Iterable[LinkEntry],
+    config: FeedConfig,
+    state: FeedState,
+    now: datetime,
+    skip_first: bool = False,
+) -> list[dict]:
+    """Find the entries that no earlier run has seen and remember them.
+
+    On the first run for a feed every entry is new, unless skip_first is set.
+
+    Args:
+        links: Entries of the feed
+        config: Feed configuration, its URL identifies the feed
+        state: State of the feed, its first_seen times are updated
+        now: Time of this run
+        skip_first: Only remember the entries if no earlier run has seen any
+
+    Returns:
+        A record for each new entry, in feed order
+
+    """
+    base = config.base_url or config.url
+    first = not state.first_seen
+    known = state.first_seen
+    current = set()
+    records = []
+    for link in links:
+        url = canonicalize(link.url, base)
+        current.add(url)
+        if url in known:
+            continue
+        known[url] = now
+        records.append(
+            {
+                "feed": config.url,
+                "url": url,
+                "title": link.title,
+                "description": link.description or "",
+                "published": link.published.isoformat() if link.published else None,
+                "first_seen": now.isoformat(),
+            },
+        )
+    state.first_seen = _prune(known, current)
+    return [] if first and skip_first else records
+
+
+def append_records(records: list[dict], path: str) -> None:
+    """Append records as newline delimited JSON.
+
+    Args:
+        records: Records to write
+        path: File to append to, or - for stdout
+
+    Raises:
+        FileWriteError: If the file can't be written
+
+    """
+    if not records:
+        return
+    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    if path == "-":
+        sys.stdout.write(data)
+        sys.stdout.flush()
+        return
+
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            view = memoryview(data.encode("utf-8"))
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+    except OSError as e:
+        raise FileWriteError(f"Unable to append new entries to {path}") from e
+
+
+def _prune(known: dict[str, datetime], current: set[str]) -> dict[str, datetime]:
+    """Keep the entries of this run and the newest others, up to MAX_KNOWN_URLS."""
+    if len(known) <= MAX_KNOWN_URLS:
+        return known
+    others = sorted((url for url in known if url not in current), key=known.__getitem__, reverse=True)
+    keep = current.union(others[: max(0, MAX_KNOWN_URLS - len(current))])
+    return {url: seen for url, seen in known.items() if url in keep}
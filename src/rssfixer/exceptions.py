@@ -19,6 +19,12 @@ class NetworkError(RSSFixerError):
     pass
 
 
+class FileReadError(RSSFixerError):
+    """Raised when unable to read an input file."""
+
+    pass
+
+
 class FileWriteError(RSSFixerError):
     """Raised when unable to write output file."""
 
@@ -35,3 +41,48 @@ class HTMLParsingError(RSSFixerError):
     """Raised when HTML parsing fails."""
 
     pass
+
+
+class WARCParsingError(RSSFixerError):
+    """Raised when a WARC archive can't be read."""
+
+    pass
+
+
+class SitemapParsingError(RSSFixerError):
+    """Raised when a sitemap can't be parsed."""
+
+    pass
+
+
+class BudgetExceededError(RSSFixerError):
+    """Raised when parsing or extraction exceeds a resource budget."""
+
+    def __init__(self, budget: str, limit: int):
+        """Initialize the error with the budget that was exceeded.
+
+        Args:
+            budget: Name of the budget, for example "DOM nodes"
+            limit: The configured limit
+
+        """
+        # Both values are passed on so the error can be pickled by worker processes
+        super().__init__(budget, limit)
+        self.budget = budget
+        self.limit = limit
+
+    def __str__(self) -> str:
+        """Describe the budget that was exceeded."""
+        return f"{self.budget} budget exceeded, limit is {self.limit}"
+
+
+class DeadlineExceededError(RSSFixerError):
+    """Raised when a run takes longer than its deadline."""
+
+    pass
+
+
+class OutputLockedError(RSSFixerError):
+    """Raised when another run holds the lock for the output file."""
+
+    pass
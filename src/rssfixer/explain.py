@@ -0,0 +1,158 @@
+"""Report how the configured selectors matched a page.
+
+An ExplainReport is filled in while a feed is generated with --explain. It
+records for every selector how many elements it matched and the time spent,
+and for every entry that was dropped the reason it was dropped. The report
+is printed even when extraction fails, which is when it is needed most.
+"""
+
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+# Length of the sample shown for each selector
+SAMPLE_LENGTH = 80
+MILLISECONDS = 1000
+
+
+@dataclass
+class SelectorStats:
+    """Matches and time spent for one selector."""
+
+    option: str
+    value: str
+    matches: int = 0
+    calls: int | None = None
+    seconds: float | None = None
+    sample: str = ""
+
+
+@dataclass
+class ExplainReport:
+    """Selector statistics and dropped entries for one feed."""
+
+    url: str
+    input_bytes: int = 0
+    parse_seconds: float = 0.0
+    entries: int = 0
+    selectors: dict[str, SelectorStats] = field(default_factory=dict)
+    dropped: Counter = field(default_factory=Counter)
+
+    def record(self, option: str, value: Any, result: Any, seconds: float | None, per_entry: bool = False) -> None:
+        """Record one use of a selector.
+
+        Args:
+            option: Command line option of the selector
+            value: Configured value of the option
+            result: What the selector found, counted as a match if not empty
+            seconds: Time spent, None if the selector is timed together with another one
+            per_entry: True if the selector is applied once per entry
+
+        """
+        stats = self.selectors.get(option)
+        if stats is None:
+            stats = self.selectors[option] = SelectorStats(option, str(value), calls=0 if per_entry else None)
+        if per_entry:
+            stats.calls += 1
+            stats.matches += bool(result)
+        else:
+            stats.matches += len(result) if isinstance(result, list) else bool(result)
+        if seconds is not None:
+            stats.seconds = (stats.seconds or 0.0) + seconds
+        if result and not stats.sample:
+            stats.sample = sample(result)
+
+    def measure(self, option: str, value: Any, function: Callable, *args: Any, per_entry: bool = True) -> Any:
+        """Call a selector function and record the result.
+
+        Args:
+            option: Command line option of the selector
+            value: Configured value of the option
+            function: Function applying the selector
+            *args: Arguments for the function
+            per_entry: True if the selector is applied once per entry
+
+        Returns:
+            Return value of the function
+
+        """
+        start = time.perf_counter()
+        result = function(*args)
+        self.record(option, value, result, time.perf_counter() - start, per_entry)
+        return result
+
+    def measure_iter(self, option: str, value: Any, iterable: Iterable) -> Iterator:
+        """Record the elements found by a lazy selector as they are consumed.
+
+        Args:
+            option: Command line option of the selector
+            value: Configured value of the option
+            iterable: Elements found by the selector
+
+        Yields:
+            The elements of iterable
+
+        """
+        iterator = iter(iterable)
+        self.record(option, value, None, 0.0)
+        while True:
+            start = time.perf_counter()
+            item = next(iterator, None)
+            self.record(option, value, item, time.perf_counter() - start)
+            if item is None:
+                return
+            yield item
+
+    def drop(self, reason: str) -> None:
+        """Count an entry dropped during extraction.
+
+        Args:
+            reason: Why the entry was dropped, for example "no title"
+
+        """
+        self.dropped[reason] += 1
+
+    def format(self) -> str:
+        """Format the report for printing.
+
+        Returns:
+            Report with one line per selector
+
+        """
+        lines = [
+            f"EXPLAIN: {self.url} ({self.input_bytes} bytes, parsed in {self.parse_seconds * MILLISECONDS:.1f} ms)",
+        ]
+        for stats in self.selectors.values():
+            found = (
+                f"{stats.matches} of {stats.calls} entries" if stats.calls is not None else f"{stats.matches} matches"
+            )
+            line = f"  {stats.option} {stats.value}: {found}"
+            if stats.seconds is not None:
+                line += f" in {stats.seconds * MILLISECONDS:.1f} ms"
+            if stats.sample:
+                line += f", e.g. {stats.sample}"
+            lines.append(line)
+        if self.dropped:
+            reasons = ", ".join(f"{count} {reason}" for reason, count in self.dropped.most_common())
+            lines.append(f"  dropped: {reasons}")
+        lines.append(f"  entries: {self.entries}")
+        return "\n".join(lines)
+
+
+def sample(value: Any) -> str:
+    """Shorten a matched element or value to a single line.
+
+    Args:
+        value: Element, list of elements or text
+
+    Returns:
+        At most SAMPLE_LENGTH characters
+
+    """
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    text = re.sub(r"\s+", " ", str(value)).strip()
+    return text if len(text) <= SAMPLE_LENGTH else text[: SAMPLE_LENGTH - 3] + "..."
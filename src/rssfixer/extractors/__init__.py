@@ -1,15 +1,20 @@
 """Link extractors package."""
 
-from .base import LinkExtractor
+from .base import ExtractionContext, LinkExtractor
 from .html import HtmlExtractor
 from .json import JsonExtractor
 from .list import ListExtractor
 from .release import ReleaseExtractor
+from .sitemap import SitemapExtractor
+from .structured import StructuredDataExtractor
 
 __all__ = [
+    "ExtractionContext",
     "HtmlExtractor",
     "JsonExtractor",
     "LinkExtractor",
     "ListExtractor",
     "ReleaseExtractor",
+    "SitemapExtractor",
+    "StructuredDataExtractor",
 ]
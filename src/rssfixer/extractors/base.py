@@ -1,44 +1,75 @@
 """Abstract base class for link extractors."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from itertools import chain, islice
+from typing import Any, ClassVar
 
+import requests
 from bs4 import BeautifulSoup
 
+from ..budgets import Deadline, NodeBudget
+from ..dates import DateParser
 from ..exceptions import NoLinksFoundError
-from ..models import LinkEntry
+from ..explain import ExplainReport
+from ..models import FeedConfig, LinkEntry
+from ..simhash import SimHashIndex, entry_fingerprint
+from ..urls import base_href, canonicalize
 
 
-class LinkExtractor(ABC):
-    """Abstract base class for extracting links from web pages."""
+class ExtractionContext:
+    """State for one extraction: seen entries, budgets and the explain report.
+
+    Extractors only hold their compiled configuration, so one extractor can
+    be shared between threads as long as every extraction has its own context.
+    """
 
-    def __init__(self, arguments):
-        """Initialize extractor with parsed command line arguments.
+    def __init__(
+        self,
+        config: FeedConfig,
+        report: ExplainReport | None = None,
+        session: requests.Session | None = None,
+        deadline: Deadline | None = None,
+    ):
+        """Initialize the state for extracting a feed.
 
         Args:
-            arguments: Parsed command line arguments
+            config: Feed configuration with the budgets
+            report: Optional report to record selector matches and dropped entries in
+            session: Optional session for extractors that fetch more pages
+            deadline: Optional deadline for pages fetched during extraction
 
         """
-        self.arguments = arguments
-        self._unique_links: set[str] = set()
+        self.report = report
+        self.session = session
+        self.deadline = deadline
+        # Canonical URLs of the entries so far, resolved against the base of the feed
+        self.unique_links: set[str] = set()
+        self.base = config.base_url or config.url
+        self.page_url = config.url
+        # Set by a <base href> element, which relative links on the page are resolved against
+        self.document_base: str | None = None
+        self.unique_titles: set[str] = set()
+        self.dates = DateParser()
+        # Elements visited while extracting, counted against --max-nodes
+        self.nodes = NodeBudget("DOM nodes", config.max_nodes)
 
-    @abstractmethod
-    def extract_links(self, soup: BeautifulSoup) -> list[LinkEntry]:
-        """Extract links from parsed HTML.
+    def use_document(self, soup: BeautifulSoup) -> None:
+        """Resolve relative links against the <base href> of a page, if it has one.
 
         Args:
-            soup: Parsed HTML content using BeautifulSoup
-
-        Returns:
-            List of LinkEntry objects
-
-        Raises:
-            NoLinksFoundError: If no links are found or extraction fails
+            soup: Parsed page, before any page filter is applied
 
         """
-        pass
+        self.document_base = base_href(soup, self.page_url) or self.document_base
+
+    def add_unique_link(self, url: str, title: str, description: str = "") -> LinkEntry | None:
+        """Add a link if its canonical URL is unique.
 
-    def _add_unique_link(self, url: str, title: str, description: str = "") -> LinkEntry | None:
-        """Add a link if it's unique.
+        The entry gets the URL without tracking parameters. Relative URLs stay
+        relative unless the page has a <base href>, and are resolved when the
+        feed is rendered. Duplicates are found by the URL resolved against
+        --base-url or the page URL, as it will be in the feed.
 
         Args:
             url: The link URL
@@ -52,25 +83,192 @@ class LinkExtractor(ABC):
             ValueError: If URL or title is invalid
 
         """
-        if url in self._unique_links:
+        url = canonicalize(url, self.document_base)
+        # A canonical absolute URL without a fragment is the same resolved against the base
+        key = url if url.startswith(("http://", "https://")) and "#" not in url else canonicalize(url, self.base)
+        if key in self.unique_links:
+            self.drop("duplicate")
             return None
 
-        self._unique_links.add(url)
+        self.unique_links.add(key)
         return LinkEntry(url=url, title=title, description=description)
 
-    def _validate_links(self, links: list[LinkEntry]) -> list[LinkEntry]:
-        """Validate that links were found.
+    def select(self, option: str, value: Any, function: Callable, *args: Any, per_entry: bool = True) -> Any:
+        """Apply a selector, recording the result if explaining.
+
+        Args:
+            option: Command line option of the selector
+            value: Configured value of the option
+            function: Function applying the selector
+            *args: Arguments for the function
+            per_entry: True if the selector is applied once per entry
+
+        Returns:
+            Return value of the function
+
+        """
+        if self.report is None:
+            return function(*args)
+        return self.report.measure(option, value, function, *args, per_entry=per_entry)
+
+    def select_all(self, option: str, value: Any, elements: Iterator) -> Iterator:
+        """Wrap the elements found by a lazy selector, recording them if explaining.
 
         Args:
-            links: List of extracted links
+            option: Command line option of the selector
+            value: Configured value of the option
+            elements: Elements found by the selector
 
         Returns:
-            The same list if valid
+            Iterator over the same elements
+
+        """
+        if self.report is None:
+            return elements
+        return self.report.measure_iter(option, value, elements)
+
+    def drop(self, reason: str) -> None:
+        """Record why an entry was dropped if explaining.
+
+        Args:
+            reason: Why the entry was dropped
+
+        """
+        if self.report is not None:
+            self.report.drop(reason)
+
+
+class LinkExtractor(ABC):
+    """Abstract base class for extracting links from web pages.
+
+    An extractor is the compiled configuration of a feed and is not changed
+    by extraction. Everything that belongs to one extraction is kept in an
+    ExtractionContext, so the same extractor can be used for many pages and
+    from several threads at once.
+
+    Extractors that read the raw page instead of the parsed HTML set
+    needs_soup to False and get the undecoded page content passed as soup.
+    Those that also set streams_input get a fetched page as an iterator of
+    chunks while it is downloaded. Extractors that set fetches_pages fetch
+    more pages while extracting, through the session and within the deadline
+    of the context.
+    """
+
+    needs_soup: ClassVar[bool] = True
+    streams_input: ClassVar[bool] = False
+    fetches_pages: ClassVar[bool] = False
+
+    def __init__(self, config):
+        """Initialize extractor with the feed configuration.
+
+        Args:
+            config: FeedConfig, or parsed command line arguments to build one from
+
+        """
+        self.config = config if isinstance(config, FeedConfig) else FeedConfig.from_arguments(config)
+
+    def new_context(
+        self,
+        report: ExplainReport | None = None,
+        session: requests.Session | None = None,
+        deadline: Deadline | None = None,
+    ) -> ExtractionContext:
+        """Create the state for one extraction.
+
+        Args:
+            report: Optional report to record selector matches and dropped entries in
+            session: Optional session for extractors that fetch more pages
+            deadline: Optional deadline for pages fetched during extraction
+
+        Returns:
+            New extraction context
+
+        """
+        return ExtractionContext(self.config, report, session, deadline)
+
+    @abstractmethod
+    def iter_links(self, soup: BeautifulSoup, context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Lazily extract links from parsed HTML.
+
+        Duplicates are skipped as they are found, so every yielded entry is
+        unique. The document is only walked as far as the consumer reads.
+
+        Args:
+            soup: Parsed HTML content using BeautifulSoup
+            context: State for this extraction
+
+        Yields:
+            LinkEntry objects in document order
+
+        """
+        pass
+
+    def stream_links(self, soup: BeautifulSoup, context: ExtractionContext | None = None) -> Iterator[LinkEntry]:
+        """Extract links as a stream, limited to --max-entries.
+
+        Near duplicates are skipped before the limit is applied if
+        --near-duplicates is set.
+
+        The first entry is extracted before returning, so an empty result is
+        reported right away as for extract_links.
+
+        Args:
+            soup: Parsed HTML content using BeautifulSoup
+            context: State for this extraction, a new one if not given
+
+        Returns:
+            Iterator over LinkEntry objects
 
         Raises:
-            NoLinksFoundError: If no links found
+            NoLinksFoundError: If no links are found or extraction fails
 
         """
-        if not links:
+        if context is None:
+            context = self.new_context()
+        if isinstance(soup, BeautifulSoup):
+            context.use_document(soup)
+        links = self.iter_links(soup, context)
+        if self.config.near_duplicates is not None:
+            links = self._collapse_near_duplicates(links, context)
+        links = islice(links, self.config.max_entries)
+        first = next(links, None)
+        if first is None:
             raise NoLinksFoundError("No links found during extraction")
-        return links
+        return chain([first], links)
+
+    def _collapse_near_duplicates(self, links: Iterator[LinkEntry], context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Skip entries whose title and description are near duplicates of an earlier entry.
+
+        Args:
+            links: Unique links in document order
+            context: State for this extraction
+
+        Yields:
+            The first link of every group of near duplicates
+
+        """
+        index = SimHashIndex(self.config.near_duplicates)
+        for link in links:
+            value = entry_fingerprint(link.title, link.description)
+            if value is not None:
+                if index.find(value) is not None:
+                    context.drop("near duplicate")
+                    continue
+                index.add(value, link.url)
+            yield link
+
+    def extract_links(self, soup: BeautifulSoup, context: ExtractionContext | None = None) -> list[LinkEntry]:
+        """Extract links from parsed HTML.
+
+        Args:
+            soup: Parsed HTML content using BeautifulSoup
+            context: State for this extraction, a new one if not given
+
+        Returns:
+            List of LinkEntry objects
+
+        Raises:
+            NoLinksFoundError: If no links are found or extraction fails
+
+        """
+        return list(self.stream_links(soup, context))
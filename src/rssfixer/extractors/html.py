@@ -1,107 +1,191 @@
 """HTML extractor for links in specific HTML elements."""
 
 import re
+import time
+from collections.abc import Iterator
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 from ..models import LinkEntry
-from ..utils import safe_find_text
-from .base import LinkExtractor
+from ..utils import iter_elements
+from .base import ExtractionContext, LinkExtractor
 
 
 class HtmlExtractor(LinkExtractor):
-    """Extractor for links in specific HTML elements."""
+    """Extractor for links in specific HTML elements.
 
-    def extract_links(self, soup: BeautifulSoup) -> list[LinkEntry]:
+    The URL, title, description and date of an entry are found in a single walk
+    of the entry, which stops as soon as every field has been found. Each
+    field is the first matching element in document order, the same as a
+    separate find() per field would return.
+    """
+
+    def __init__(self, config):
+        """Initialize extractor and compile the class and title patterns.
+
+        Args:
+            config: FeedConfig, or parsed command line arguments to build one from
+
+        """
+        super().__init__(config)
+        config = self.config
+        self._title_filter = re.compile(config.title_filter) if config.title_filter else None
+        # Each field is (name, tag name, class pattern, option, value for the explain report)
+        fields = [
+            ("url", config.html_url, None, "--html-url", config.html_url),
+            (
+                "title",
+                config.html_title,
+                _compile_class(config.html_title_class),
+                "--html-title",
+                _selector(config.html_title, config.html_title_class),
+            ),
+        ]
+        if config.html_description:
+            fields.append(
+                (
+                    "description",
+                    config.html_description,
+                    _compile_class(config.html_description_class),
+                    "--html-description",
+                    _selector(config.html_description, config.html_description_class),
+                ),
+            )
+        if config.html_date:
+            fields.append(
+                (
+                    "date",
+                    config.html_date,
+                    _compile_class(config.html_date_class),
+                    "--html-date",
+                    _selector(config.html_date, config.html_date_class),
+                ),
+            )
+        self._fields = tuple(fields)
+
+        # Tag names of all fields, to skip other elements early
+        names = {field[1] for field in fields}
+        self._names = None if None in names else frozenset(names)
+
+    def iter_links(self, soup: BeautifulSoup, context: ExtractionContext) -> Iterator[LinkEntry]:
         """Extract links from specific HTML elements.
 
         Args:
             soup: Parsed HTML content
+            context: State for this extraction
 
-        Returns:
-            List of LinkEntry objects from HTML elements
-
-        Raises:
-            NoLinksFoundError: If no links are found
+        Yields:
+            LinkEntry objects from HTML elements
 
         """
-        links = []
-
+        config = self.config
+        entries = iter_elements(soup, config.html_entries, config.html_entries_class, context.nodes)
+        selector = _selector(config.html_entries, config.html_entries_class)
+        entries = context.select_all("--html-entries", selector, entries)
         # Iterate through all elements of the specified type
-        for entry in soup.find_all(self.arguments.html_entries, self.arguments.html_entries_class):
-            # Extract URL safely
-            url = self._get_html_url(entry)
+        for entry in entries:
+            fields = self._find_fields(entry, context)
+
+            # The first element for the URL must have a link
+            url = fields["url"].get("href", "") if "url" in fields else ""
             if not url:
+                context.drop("no URL")
                 continue
 
-            # Extract title safely
-            title = self._get_html_title(entry)
+            title = fields["title"].text.strip() if "title" in fields else ""
             if not title:
+                context.drop("no title")
                 continue
 
             # Apply title filter if specified
-            if self.arguments.title_filter:
-                if not re.search(self.arguments.title_filter, title):
-                    continue
+            if self._title_filter and not self._title_filter.search(title):
+                context.drop("title filter")
+                continue
 
-            # Extract description safely
-            description = self._get_html_description(entry)
+            description = fields["description"].text.strip() if "description" in fields else ""
 
-            entry_obj = self._add_unique_link(url, title, description)
+            entry_obj = context.add_unique_link(url, title, description)
             if entry_obj:
-                links.append(entry_obj)
+                if "date" in fields:
+                    entry_obj.published = context.dates.parse(fields["date"].get("datetime") or fields["date"].text)
+                yield entry_obj
 
-        return self._validate_links(links)
-
-    def _get_html_url(self, entry) -> str:
-        """Extract URL from HTML entry.
+    def _find_fields(self, entry: Tag, context: ExtractionContext) -> dict[str, Tag]:
+        """Find the first element for every field in one walk of an entry.
 
         Args:
-            entry: BeautifulSoup element
+            entry: Entry element
+            context: State for this extraction
 
         Returns:
-            URL string or empty string if not found
-
-        """
-        try:
-            url_elements = entry.find_all(self.arguments.html_url)
-            if url_elements and "href" in url_elements[0].attrs:
-                return url_elements[0]["href"]
-        except (AttributeError, KeyError, IndexError):
-            pass
-        return ""
+            Element for each field that was found, by field name
 
-    def _get_html_title(self, entry) -> str:
-        """Extract title from HTML entry.
-
-        Args:
-            entry: BeautifulSoup element
-
-        Returns:
-            Title text or empty string if not found
-
-        """
-        return safe_find_text(
-            entry,
-            self.arguments.html_title,
-            self.arguments.html_title_class if hasattr(self.arguments, "html_title_class") else None,
-        )
-
-    def _get_html_description(self, entry) -> str:
-        """Extract description from HTML entry.
-
-        Args:
-            entry: BeautifulSoup element
-
-        Returns:
-            Description text or empty string if not found
+        Raises:
+            BudgetExceededError: If more than --max-nodes elements have been visited
 
         """
-        if not hasattr(self.arguments, "html_description") or not self.arguments.html_description:
-            return ""
-
-        return safe_find_text(
-            entry,
-            self.arguments.html_description,
-            self.arguments.html_description_class if hasattr(self.arguments, "html_description_class") else None,
-        )
+        start = time.perf_counter()
+        found: dict[str, Tag] = {}
+        pending = self._fields
+        names = self._names
+        visited = 0
+        for visited, node in enumerate(entry.descendants, 1):
+            if not isinstance(node, Tag) or (names is not None and node.name not in names):
+                continue
+            matched = [
+                field
+                for field in pending
+                if (field[1] is None or node.name == field[1]) and (field[2] is None or _class_matches(node, field[2]))
+            ]
+            if matched:
+                for field in matched:
+                    found[field[0]] = node
+                pending = [field for field in pending if field[0] not in found]
+                if not pending:
+                    break
+        # Elements inside nested entries are walked once for every enclosing
+        # entry, so each walk is counted and not only the walk of the document
+        context.nodes.visit(visited)
+
+        if context.report is not None:
+            # The walk is timed as a whole and counted as time spent on the entries
+            config = self.config
+            entries = _selector(config.html_entries, config.html_entries_class)
+            context.report.record("--html-entries", entries, None, time.perf_counter() - start)
+            for name, _, _, option, value in self._fields:
+                context.report.record(option, value, found.get(name), None, per_entry=True)
+        return found
+
+
+def _compile_class(class_name: str | None) -> re.Pattern | None:
+    """Compile a class pattern, None if no class is required."""
+    return re.compile(class_name) if class_name else None
+
+
+def _class_matches(element: Tag, pattern: re.Pattern) -> bool:
+    """Check a class pattern like find() does.
+
+    The pattern is searched for in each class and, for several classes, in
+    the whole class attribute.
+
+    Args:
+        element: Element to check
+        pattern: Compiled class pattern
+
+    Returns:
+        True if the element matches
+
+    """
+    classes = element.get("class")
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return bool(pattern.search(classes))
+    if any(pattern.search(name) for name in classes):
+        return True
+    return len(classes) > 1 and bool(pattern.search(" ".join(classes)))
+
+
+def _selector(name: str | None, class_name: str | None) -> str:
+    """Format a tag name and class for the explain report, like a CSS selector."""
+    return f"{name}.{class_name}" if class_name else str(name)
@@ -1,61 +1,116 @@
 """JSON extractor for links in JSON data embedded in HTML."""
 
 import json
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from typing import Any
 
 from bs4 import BeautifulSoup
 
-from ..exceptions import JSONParsingError
+from ..budgets import NodeBudget
+from ..exceptions import BudgetExceededError, JSONParsingError
+from ..jsonpath import WILDCARD, compile_path, find_all, get_value, is_path
 from ..models import LinkEntry
-from .base import LinkExtractor
+from .base import ExtractionContext, LinkExtractor
 
 
 class JsonExtractor(LinkExtractor):
-    """Extractor for links in JSON data embedded in HTML pages."""
+    """Extractor for links in JSON data embedded in HTML pages.
 
-    def extract_links(self, soup: BeautifulSoup) -> list[LinkEntry]:
+    --json-entries is either a key that is searched for or a path that is
+    followed directly. The entry fields are always paths, where a single key
+    is a path of one step.
+    """
+
+    def __init__(self, config):
+        """Initialize extractor and compile the JSON paths.
+
+        Args:
+            config: FeedConfig, or parsed command line arguments to build one from
+
+        Raises:
+            JSONParsingError: If a path is not valid
+
+        """
+        super().__init__(config)
+        entries = self.config.json_entries
+        self._entries_path = compile_path(entries) if is_path(entries) else None
+        self._url_path = compile_path(self.config.json_url)
+        self._title_path = compile_path(self.config.json_title)
+        self._description_path = compile_path(self.config.json_description)
+        self._date_path = compile_path(self.config.json_date) if self.config.json_date else None
+
+    def iter_links(self, soup: BeautifulSoup, context: ExtractionContext) -> Iterator[LinkEntry]:
         """Extract links from JSON data in HTML.
 
         Args:
             soup: Parsed HTML content
+            context: State for this extraction
 
-        Returns:
-            List of LinkEntry objects from JSON data
+        Yields:
+            LinkEntry objects from JSON data
 
         Raises:
             JSONParsingError: If JSON parsing fails or required keys missing
-            NoLinksFoundError: If no links are found
 
         """
-        entries = self._find_json_entries(soup)
+        entries = context.select(
+            "--json-entries",
+            self.config.json_entries,
+            self._find_json_entries,
+            soup,
+            per_entry=False,
+        )
         if entries is None:
             raise JSONParsingError("Unable to find JSON object with entries")
+        yield from self.iter_entry_links(entries, context)
+
+    def iter_entry_links(self, entries: list[Any], context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Extract links from a list of JSON entries.
+
+        Args:
+            entries: Entries found with --json-entries
+            context: State for this extraction
 
-        links = []
+        Yields:
+            LinkEntry objects in list order
 
-        # Extract links from JSON entries
+        Raises:
+            JSONParsingError: If a required key is missing
+
+        """
         for entry in entries:
             if not isinstance(entry, dict):
+                context.drop("not an object")
                 continue
 
             try:
-                url = entry[self.arguments.json_url]
-                title = entry[self.arguments.json_title]
+                url = context.select("--json-url", self.config.json_url, get_value, entry, self._url_path)
+                title = context.select("--json-title", self.config.json_title, get_value, entry, self._title_path)
 
                 if not url or not title:
+                    context.drop("no URL or title")
                     continue
 
             except KeyError as e:
                 raise JSONParsingError(f"Required JSON key missing: {e}") from e
 
             # Extract description if available
-            description = entry.get(self.arguments.json_description, "")
-
-            entry_obj = self._add_unique_link(url, title, description)
+            description = context.select(
+                "--json-description",
+                self.config.json_description,
+                _first_value,
+                entry,
+                self._description_path,
+                "",
+            )
+
+            entry_obj = context.add_unique_link(url, title, description)
             if entry_obj:
-                links.append(entry_obj)
-
-        return self._validate_links(links)
+                if self._date_path:
+                    date = context.select("--json-date", self.config.json_date, _first_value, entry, self._date_path)
+                    entry_obj.published = context.dates.parse(date)
+                yield entry_obj
 
     def _find_json_entries(self, soup: BeautifulSoup) -> list[dict[str, Any]] | None:
         """Find JSON entries in script tags.
@@ -67,23 +122,68 @@ class JsonExtractor(LinkExtractor):
             List of entries from JSON data, or None if not found
 
         """
-        # Find JSON string in the page
-        for json_script in soup.find_all("script", type="application/json"):
-            try:
-                if not json_script.text.strip():
-                    continue
+        return self.find_entries(self._decode_scripts(soup))
+
+    def find_entries(self, documents: Iterable[Any]) -> list[Any] | None:
+        """Find the entries in the first JSON document that has them.
+
+        Args:
+            documents: Parsed JSON documents in page order
 
-                json_object = json.loads(json_script.text)
-                entries = self._find_entries_recursive(json_object, self.arguments.json_entries)
-                if entries is not None and isinstance(entries, list):
-                    return entries
-            except (json.JSONDecodeError, AttributeError):
+        Returns:
+            List of entries, or None if not found
+
+        """
+        for json_object in documents:
+            try:
+                if self._entries_path is None:
+                    entries = self._search_entries(json_object, self.config.json_entries)
+                else:
+                    entries = self._entries_at_path(json_object, self._entries_path)
+            except AttributeError:
                 continue
+            if entries is not None and isinstance(entries, list):
+                return entries
 
         return None
 
-    def _find_entries_recursive(self, json_object: Any, entries_key: str) -> list[dict[str, Any]] | None:
-        """Recursively find entries in JSON object.
+    @staticmethod
+    def _decode_scripts(soup: BeautifulSoup) -> Iterator[Any]:
+        """Parse the JSON script tags of a page, skipping empty and invalid ones."""
+        for json_script in soup.find_all("script", type="application/json"):
+            if not json_script.text.strip():
+                continue
+            try:
+                yield json.loads(json_script.text)
+            except json.JSONDecodeError:
+                continue
+
+    def _entries_at_path(self, json_object: Any, path: tuple) -> list[Any] | None:
+        """Get the entries at a compiled path.
+
+        A trailing [*] is optional. If the path matches several arrays, for
+        example sections[*].posts, their items are concatenated.
+
+        Args:
+            json_object: Parsed JSON
+            path: Compiled --json-entries path
+
+        Returns:
+            List of entries, or None if the path doesn't lead to an array
+
+        """
+        if path[-1] is WILDCARD:
+            path = path[:-1]
+        arrays = [value for value in find_all(json_object, path) if isinstance(value, list)]
+        if not arrays:
+            return None
+        return arrays[0] if len(arrays) == 1 else list(chain.from_iterable(arrays))
+
+    def _search_entries(self, json_object: Any, entries_key: str) -> list[dict[str, Any]] | None:
+        """Search depth first for the first array under a key.
+
+        The search uses an explicit stack instead of recursion and visits
+        values in the same order as a recursive walk.
 
         Args:
             json_object: JSON data structure to search
@@ -92,18 +192,30 @@ class JsonExtractor(LinkExtractor):
         Returns:
             List of entries if found, None otherwise
 
+        Raises:
+            BudgetExceededError: If the search goes deeper than --json-max-depth
+                or visits more than --json-max-nodes values
+
         """
-        if isinstance(json_object, dict):
-            for key, value in json_object.items():
-                if key == entries_key and isinstance(value, list):
-                    return value
-                result = self._find_entries_recursive(value, entries_key)
-                if result is not None:
-                    return result
-        elif isinstance(json_object, list):
-            for item in json_object:
-                result = self._find_entries_recursive(item, entries_key)
-                if result is not None:
-                    return result
+        max_depth = self.config.json_max_depth
+        budget = NodeBudget("JSON nodes", self.config.json_max_nodes)
+        # Each stack entry is a key (None for array items), its value and depth
+        stack: list[tuple[Any, Any, int]] = [(None, json_object, 0)]
+        while stack:
+            key, value, depth = stack.pop()
+            budget.visit()
+            if key == entries_key and isinstance(value, list):
+                return value
+            if depth >= max_depth and isinstance(value, dict | list) and value:
+                raise BudgetExceededError("JSON depth", max_depth)
+            if isinstance(value, dict):
+                stack.extend((child_key, child, depth + 1) for child_key, child in reversed(value.items()))
+            elif isinstance(value, list):
+                stack.extend((None, child, depth + 1) for child in reversed(value))
 
         return None
+
+
+def _first_value(entry: Any, path: tuple, default: Any = None) -> Any:
+    """Get the first value at a path, or the default if there is none."""
+    return next(iter(find_all(entry, path)), default)
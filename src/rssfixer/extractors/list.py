@@ -1,11 +1,14 @@
 """List extractor for links in HTML <ul> elements."""
 
+import re
+from collections.abc import Iterator
 from typing import ClassVar
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
+from ..budgets import NodeBudget
 from ..models import LinkEntry
-from .base import LinkExtractor
+from .base import ExtractionContext, LinkExtractor
 
 
 class ListExtractor(LinkExtractor):
@@ -13,43 +16,88 @@ class ListExtractor(LinkExtractor):
 
     EXCLUDED_URL_PATTERNS: ClassVar[list[str]] = ["/category/", "/author/"]
 
-    def extract_links(self, soup: BeautifulSoup) -> list[LinkEntry]:
-        """Extract links from <ul> lists in HTML.
+    def __init__(self, config):
+        """Initialize extractor and compile the URL exclusion patterns.
 
         Args:
-            soup: Parsed HTML content
-
-        Returns:
-            List of LinkEntry objects from <ul> elements
-
-        Raises:
-            NoLinksFoundError: If no links are found
+            config: FeedConfig, or parsed command line arguments to build one from
 
         """
-        links = []
-
-        # Iterate through all the <ul> elements in the page
-        for links_list in soup.find_all("ul", class_=None):
-            for li in links_list.find_all("li"):
-                link = li.find("a")
-                if not link or "href" not in link.attrs:
-                    continue
-
-                url = link["href"]
-                title = link.text.strip()
+        super().__init__(config)
+        patterns = [*self.EXCLUDED_URL_PATTERNS, *self.config.list_exclude]
+        self._excluded_urls = re.compile("|".join(re.escape(pattern) for pattern in patterns)) if patterns else None
 
-                if not url or not title:
-                    continue
-
-                # Exclude URLs containing specified patterns
-                if any(pattern in url for pattern in self.EXCLUDED_URL_PATTERNS):
-                    continue
+    def iter_links(self, soup: BeautifulSoup, context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Extract links from <ul> lists in HTML.
 
-                # Use title as description for list items
-                description = title
+        Args:
+            soup: Parsed HTML content
+            context: State for this extraction
 
-                entry = self._add_unique_link(url, title, description)
-                if entry:
-                    links.append(entry)
+        Yields:
+            LinkEntry objects from <ul> elements
 
-        return self._validate_links(links)
+        """
+        for link in context.select_all("--list", "ul li a", _iter_list_anchors(soup, context.nodes)):
+            url = link.get("href")
+            if not url:
+                context.drop("no URL")
+                continue
+
+            title = link.text.strip()
+            if not title:
+                context.drop("no title")
+                continue
+
+            # Exclude URLs containing specified patterns
+            if self._excluded_urls and self._excluded_urls.search(url):
+                context.drop("excluded URL")
+                continue
+
+            # Use title as description for list items
+            description = title
+
+            entry = context.add_unique_link(url, title, description)
+            if entry:
+                yield entry
+
+
+def _iter_list_anchors(soup: BeautifulSoup, budget: NodeBudget) -> Iterator[Tag]:
+    """Yield the first <a> of every <li> inside a <ul> without class.
+
+    The document is walked once in document order. An anchor is yielded
+    when it is the first one inside at least one enclosing <li>, which is
+    what calling li.find("a") on every such <li> would return, without
+    walking nested lists again.
+
+    Args:
+        soup: Parsed HTML content
+        budget: Budget that every visited element is counted against
+
+    Yields:
+        Anchor elements in document order
+
+    Raises:
+        BudgetExceededError: If more than --max-nodes elements are visited
+
+    """
+    # Each stack entry holds the node, whether it is inside a <ul> without
+    # class and the innermost <li> still waiting for its first anchor. A
+    # waiting <li> is a [found, parent] pair linked to the enclosing one.
+    stack: list[tuple[Tag, bool, list | None]] = [(soup, False, None)]
+    while stack:
+        node, in_list, item = stack.pop()
+        budget.visit()
+
+        if node.name == "ul" and "class" not in node.attrs:
+            in_list = True
+        elif node.name == "li" and in_list:
+            item = [False, item]
+        elif node.name == "a" and item and not item[0]:
+            waiting = item
+            while waiting and not waiting[0]:
+                waiting[0] = True
+                waiting = waiting[1]
+            yield node
+
+        stack.extend((child, in_list, item) for child in reversed(node.contents) if isinstance(child, Tag))
@@ -0,0 +1,358 @@
+"""Sitemap extractor for sites that only publish sitemap.xml.
+
+Sitemaps and sitemap indexes are parsed with expat as a stream of events,
+so no tree is built. The page itself and every sitemap an index points to
+are decompressed and parsed chunk by chunk while they are read, and only the
+newest entries are kept in a heap of fixed size. Memory use therefore
+depends on the number of entries in the feed and not on the size of the
+sitemaps.
+"""
+
+import heapq
+import re
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import chain, count
+from typing import ClassVar
+from urllib.parse import unquote, urljoin, urlsplit
+from xml.parsers import expat
+
+from ..budgets import check_size
+from ..exceptions import SitemapParsingError
+from ..models import DEFAULT_SITEMAP_ENTRIES, LinkEntry
+from ..utils import FETCH_CHUNK_SIZE, stream_content
+from .base import ExtractionContext, LinkExtractor
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# An index can point to other indexes, but not deeper than this
+MAX_SITEMAP_DEPTH = 2
+
+# Titles of Google News sitemaps, other titles like image:title are ignored
+NEWS_TITLE = "http://www.google.com/schemas/sitemap-news/0.9 title"
+
+# Relative --sitemap-since, like 30d
+_DAYS = re.compile(r"(\d+)d")
+_SLUG_SEPARATORS = re.compile(r"[-_+\s]+")
+_EXTENSION = re.compile(r"\.[a-z0-9]{1,5}$", re.IGNORECASE)
+
+OLDEST = datetime.min.replace(tzinfo=UTC)
+
+
+@dataclass
+class SitemapRecord:
+    """A <url> or <sitemap> element of a sitemap."""
+
+    kind: str
+    loc: str
+    lastmod: str = ""
+    title: str = ""
+
+
+class SitemapExtractor(LinkExtractor):
+    """Extractor for the newest pages listed in a sitemap or sitemap index."""
+
+    needs_soup: ClassVar[bool] = False
+    streams_input: ClassVar[bool] = True
+    fetches_pages: ClassVar[bool] = True
+
+    def __init__(self, config):
+        """Initialize extractor and compile the URL filter.
+
+        Args:
+            config: FeedConfig, or parsed command line arguments to build one from
+
+        """
+        super().__init__(config)
+        self._include = re.compile(self.config.sitemap_include) if self.config.sitemap_include else None
+        self._limit = self.config.max_entries or DEFAULT_SITEMAP_ENTRIES
+
+    def iter_links(self, soup: str | bytes | Iterator[bytes], context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Extract the newest pages from a sitemap or sitemap index.
+
+        Args:
+            soup: Raw sitemap content, plain or gzip compressed, or a stream of chunks of it
+            context: State for this extraction
+
+        Yields:
+            LinkEntry objects, newest first, pages without lastmod last
+
+        Raises:
+            SitemapParsingError: If a sitemap is not well-formed XML
+            NetworkError: If a sitemap in an index can't be fetched
+            BudgetExceededError: If a sitemap is larger than --max-input-bytes
+                decompressed or more than --max-nodes elements are parsed
+
+        """
+        if isinstance(soup, Iterator):
+            chunks = soup
+        else:
+            content = soup.encode("utf-8") if isinstance(soup, str) else soup
+            chunks = (content[start : start + FETCH_CHUNK_SIZE] for start in range(0, len(content), FETCH_CHUNK_SIZE))
+        since = parse_since(self.config.sitemap_since)
+
+        # Min-heap of the newest pages, the oldest of them at the top
+        newest: list[tuple[datetime, int, SitemapRecord]] = []
+        kept: set[str] = set()
+        order = count()
+        pages = self._iter_pages(self.config.url, chunks, context, since, 0)
+        for record, published in context.select_all("--sitemap", "url", pages):
+            if record.loc in kept:
+                context.drop("duplicate")
+                continue
+            item = (published or OLDEST, -next(order), record)
+            if len(newest) < self._limit:
+                heapq.heappush(newest, item)
+                kept.add(record.loc)
+                continue
+            context.drop("older than the newest entries")
+            if item[:2] > newest[0][:2]:
+                kept.discard(heapq.heapreplace(newest, item)[2].loc)
+                kept.add(record.loc)
+
+        for published, _, record in sorted(newest, key=lambda item: item[:2], reverse=True):
+            title = record.title.strip() or title_from_url(record.loc)
+            link = context.add_unique_link(record.loc, title)
+            if link:
+                link.published = None if published is OLDEST else published
+                yield link
+
+    def _iter_pages(
+        self,
+        url: str,
+        chunks: Iterable[bytes],
+        context: ExtractionContext,
+        since: datetime | None,
+        depth: int,
+    ) -> Iterator[tuple[SitemapRecord, datetime | None]]:
+        """Yield the pages of a sitemap, following the sitemaps of an index.
+
+        Args:
+            url: URL of the sitemap, to resolve relative locations
+            chunks: Raw sitemap content
+            context: State for this extraction
+            since: Only pages and sitemaps modified since this time, None for all
+            depth: Number of indexes followed to get to this sitemap
+
+        Yields:
+            Pages that pass the filters and their lastmod time
+
+        """
+        for record in parse_sitemap(chunks, self.config.max_input_bytes, context):
+            loc = urljoin(url, record.loc.strip())
+            published = parse_lastmod(record.lastmod, context)
+            if since is not None and published is not None and published < since:
+                context.drop("lastmod before --sitemap-since")
+                continue
+
+            if record.kind == "sitemap":
+                if depth >= MAX_SITEMAP_DEPTH:
+                    context.drop("sitemap index nested too deep")
+                    continue
+                headers = {"User-Agent": self.config.user_agent}
+                child = stream_content(
+                    loc,
+                    headers,
+                    session=context.session,
+                    deadline=context.deadline,
+                    max_bytes=self.config.max_input_bytes,
+                )
+                yield from self._iter_pages(loc, child, context, since, depth + 1)
+                continue
+
+            if since is not None and published is None:
+                context.drop("no lastmod")
+                continue
+            if self._include and not self._include.search(loc):
+                context.drop("--sitemap-include")
+                continue
+            record.loc = loc
+            yield record, published
+
+
+def parse_sitemap(
+    chunks: Iterable[bytes],
+    max_bytes: int | None,
+    context: ExtractionContext,
+) -> Iterator[SitemapRecord]:
+    """Parse a sitemap or sitemap index incrementally.
+
+    Gzip compressed content is decompressed on the fly. Documents with a DTD
+    are rejected, so entity expansion can't be used to blow up the input.
+
+    Args:
+        chunks: Raw content, plain or gzip compressed
+        max_bytes: Largest decompressed size, None for no limit
+        context: State for this extraction, its node budget is counted against
+
+    Yields:
+        <url> and <sitemap> records in document order
+
+    Raises:
+        SitemapParsingError: If the content is not well-formed XML or has a DTD
+        BudgetExceededError: If the content is larger than max_bytes decompressed
+            or has more elements than the node budget
+
+    """
+    records: list[SitemapRecord] = []
+    # Names of the open elements and the text of the current field
+    names: list[str] = []
+    text: list[str] = []
+    current: SitemapRecord | None = None
+
+    def start(name: str, _attributes: dict) -> None:
+        nonlocal current
+        context.nodes.visit()
+        local = name.rpartition(" ")[2]
+        if local in ("url", "sitemap") and current is None:
+            current = SitemapRecord(local, "")
+        names.append(name)
+        text.clear()
+
+    def end(name: str) -> None:
+        nonlocal current
+        names.pop()
+        if current is None:
+            return
+        local = name.rpartition(" ")[2]
+        if local == current.kind:
+            if current.loc.strip():
+                records.append(current)
+            current = None
+        elif local in ("loc", "lastmod") and len(names) and names[-1].rpartition(" ")[2] == current.kind:
+            setattr(current, local, "".join(text))
+        elif name == NEWS_TITLE:
+            current.title = "".join(text)
+        text.clear()
+
+    def reject_doctype(*_args) -> None:
+        raise SitemapParsingError("Sitemaps with a DTD are not supported")
+
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text.append
+    parser.StartDoctypeDeclHandler = reject_doctype
+    parser.buffer_text = True
+
+    size = 0
+    try:
+        for data in decompress(chunks):
+            size += len(data)
+            check_size(size, max_bytes)
+            parser.Parse(data, False)
+            yield from records
+            records.clear()
+        parser.Parse(b"", True)
+        yield from records
+    except expat.ExpatError as e:
+        raise SitemapParsingError(f"Invalid sitemap: {e}") from e
+    except zlib.error as e:
+        raise SitemapParsingError(f"Invalid compressed sitemap: {e}") from e
+
+
+def decompress(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Decompress gzip content on the fly, passing other content through.
+
+    Every piece of output is at most FETCH_CHUNK_SIZE bytes, so a small
+    compressed chunk can't expand to a large piece of memory at once.
+
+    Args:
+        chunks: Raw content
+
+    Yields:
+        Decompressed content
+
+    Raises:
+        zlib.error: If the gzip content is corrupt
+
+    """
+    chunks = iter(chunks)
+    first = b""
+    for chunk in chunks:
+        first += chunk
+        if len(first) >= len(GZIP_MAGIC):
+            break
+    if not first.startswith(GZIP_MAGIC):
+        if first:
+            yield first
+        yield from chunks
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    for chunk in chain([first], chunks):
+        data = chunk
+        while data:
+            yield decompressor.decompress(data, FETCH_CHUNK_SIZE)
+            data = decompressor.unconsumed_tail
+            # Files made of several gzip members continue with a new decompressor
+            if decompressor.eof and decompressor.unused_data:
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    yield decompressor.flush()
+
+
+def parse_lastmod(value: str, context: ExtractionContext) -> datetime | None:
+    """Parse a lastmod value, which is a W3C datetime in valid sitemaps.
+
+    Args:
+        value: Text of the lastmod element
+        context: State for this extraction, with a parser for other date formats
+
+    Returns:
+        Time zone aware datetime, None if there is no date
+
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value)
+    except ValueError:
+        return context.dates.parse(value)
+    return published if published.tzinfo else published.replace(tzinfo=UTC)
+
+
+def parse_since(value: str | None, now: datetime | None = None) -> datetime | None:
+    """Parse --sitemap-since, a date or a number of days like 30d.
+
+    Args:
+        value: Option value, None if not set
+        now: Time that a number of days is counted back from, the current time if not given
+
+    Returns:
+        Time zone aware datetime, None if not set
+
+    Raises:
+        ValueError: If the value is neither a date nor a number of days
+
+    """
+    if value is None:
+        return None
+    days = _DAYS.fullmatch(value.strip())
+    if days:
+        return (now or datetime.now(UTC)) - timedelta(days=int(days.group(1)))
+    since = datetime.fromisoformat(value.strip())
+    return since if since.tzinfo else since.replace(tzinfo=UTC)
+
+
+def title_from_url(url: str) -> str:
+    """Make a title from the last part of the path of a URL.
+
+    Args:
+        url: Page URL, like https://example.com/blog/new-release-notes.html
+
+    Returns:
+        Title like "New release notes", or the URL if the path is empty
+
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if not segments:
+        return url
+    slug = _SLUG_SEPARATORS.sub(" ", _EXTENSION.sub("", unquote(segments[-1]))).strip()
+    if not slug:
+        return url
+    return slug[0].upper() + slug[1:]
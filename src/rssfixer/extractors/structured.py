@@ -0,0 +1,315 @@
+"""Structured data extractor for JSON-LD and framework hydration payloads.
+
+Many sites describe their posts in ``<script type="application/ld+json">``
+with schema.org types, or ship the data for the page in ``__NEXT_DATA__``
+(Next.js) or ``__NUXT_DATA__`` (Nuxt 3). These scripts are found with a
+regular expression on the raw page, so the page is never parsed as HTML.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, ClassVar
+
+from ..budgets import NodeBudget
+from ..models import LinkEntry
+from .base import ExtractionContext, LinkExtractor
+
+_SCRIPT = re.compile(
+    rb"<script\b([^>]*(?:application/ld\+json|__NEXT_DATA__|__NUXT_DATA__)[^>]*)>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# schema.org types that are entries, and the fields to read from them
+ARTICLE_TYPES = frozenset(
+    {
+        "Article",
+        "BlogPosting",
+        "NewsArticle",
+        "TechArticle",
+        "ScholarlyArticle",
+        "Report",
+        "SocialMediaPosting",
+        "LiveBlogPosting",
+        "AnalysisNewsArticle",
+        "Review",
+        "Event",
+    },
+)
+
+# Field names tried in order, schema.org names first
+URL_FIELDS = ("url", "@id", "permalink", "href", "link", "slug", "path", "uri")
+TITLE_FIELDS = ("headline", "title", "name")
+DESCRIPTION_FIELDS = ("description", "abstract", "excerpt", "summary")
+DATE_FIELDS = ("datePublished", "dateCreated", "publishedAt", "published_at", "date", "createdAt")
+
+# Nuxt payload wrappers around a single value
+NUXT_WRAPPERS = frozenset({"Reactive", "ShallowReactive", "Ref", "ShallowRef", "NuxtError"})
+
+
+class StructuredDataExtractor(LinkExtractor):
+    """Extractor for JSON-LD, Next.js and Nuxt data embedded in pages.
+
+    JSON-LD objects with an article type are entries wherever they are in
+    the payload, as are list items with a URL and a name. Next.js and Nuxt
+    payloads have no schema, so the array with the most objects that have a
+    URL and a title is used, preferring arrays where the objects have dates.
+    """
+
+    needs_soup: ClassVar[bool] = False
+
+    def iter_links(self, soup: str | bytes, context: ExtractionContext) -> Iterator[LinkEntry]:
+        """Extract links from the structured data in a page.
+
+        Args:
+            soup: Raw page content
+            context: State for this extraction
+
+        Yields:
+            LinkEntry objects in document order
+
+        Raises:
+            BudgetExceededError: If more than --max-nodes values are visited
+
+        """
+        content = soup.encode("utf-8") if isinstance(soup, str) else soup
+        budget = NodeBudget("structured data nodes", self.config.max_nodes)
+        for kind, payload in context.select_all("--structured", "script", iter_payloads(content)):
+            objects = iter_schema_entries(payload, budget) if kind == "ld+json" else best_entry_array(payload, budget)
+            for entry in objects:
+                link = self._entry_to_link(entry, context)
+                if link:
+                    yield link
+
+    def _entry_to_link(self, entry: dict[str, Any], context: ExtractionContext) -> LinkEntry | None:
+        """Map the fields of an entry object to a link.
+
+        Args:
+            entry: Object from the payload
+            context: State for this extraction
+
+        Returns:
+            LinkEntry, or None if the entry is incomplete or a duplicate
+
+        """
+        url = entry_url(entry)
+        title = first_string(entry, TITLE_FIELDS)
+        if not url or not title:
+            context.drop("no URL or title")
+            return None
+
+        link = context.add_unique_link(url, title, first_string(entry, DESCRIPTION_FIELDS))
+        if link:
+            link.published = next(
+                (date for date in (context.dates.parse(entry.get(name)) for name in DATE_FIELDS) if date),
+                None,
+            )
+        return link
+
+
+def iter_payloads(content: bytes) -> Iterator[tuple[str, Any]]:
+    """Find and decode structured data scripts in raw page content.
+
+    Args:
+        content: Raw page content
+
+    Yields:
+        Kind of payload ("ld+json", "next" or "nuxt") and the decoded data
+
+    """
+    for match in _SCRIPT.finditer(content):
+        attributes, body = match.groups()
+        try:
+            data = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError, RecursionError):
+            continue
+        if b"ld+json" in attributes.lower():
+            yield "ld+json", data
+        elif b"__NUXT_DATA__" in attributes:
+            yield "nuxt", unflatten_nuxt(data)
+        else:
+            yield "next", data
+
+
+def iter_schema_entries(payload: Any, budget: NodeBudget | None = None) -> Iterator[dict[str, Any]]:
+    """Find schema.org entries in a JSON-LD payload.
+
+    Objects with an article type are yielded without looking inside them.
+    ListItem objects are yielded if they have a URL and a name themselves,
+    otherwise the item they point to is searched. Breadcrumb lists are
+    navigation, not entries, and are skipped.
+
+    Args:
+        payload: Decoded JSON-LD
+        budget: Optional budget that every visited value is counted against
+
+    Yields:
+        Entry objects in document order
+
+    Raises:
+        BudgetExceededError: If the search exceeds the budget
+
+    """
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if budget is not None:
+            budget.visit()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        types = node.get("@type")
+        if isinstance(types, str):
+            types = {types}
+        else:
+            types = {name for name in types if isinstance(name, str)} if isinstance(types, list) else set()
+        if types & ARTICLE_TYPES:
+            yield node
+            continue
+        if "BreadcrumbList" in types:
+            continue
+        if "ListItem" in types:
+            item = node.get("item")
+            if isinstance(item, str):
+                yield {**node, "url": item}
+                continue
+            if node.get("url") and node.get("name"):
+                yield node
+                continue
+        stack.extend(reversed([value for value in node.values() if isinstance(value, dict | list)]))
+
+
+def best_entry_array(payload: Any, budget: NodeBudget | None = None) -> list[dict[str, Any]]:
+    """Find the array in a payload that most likely holds the entries.
+
+    Args:
+        payload: Decoded Next.js or Nuxt data
+        budget: Optional budget that every visited object and array is counted against
+
+    Returns:
+        Objects with a URL and a title from the best array, empty if none has any
+
+    Raises:
+        BudgetExceededError: If the search exceeds the budget
+
+    """
+    best: list[dict[str, Any]] = []
+    best_score = (0, 0)
+    stack = [payload]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if budget is not None:
+            budget.visit()
+        if isinstance(node, dict):
+            stack.extend(value for value in node.values() if isinstance(value, dict | list))
+            continue
+        if not isinstance(node, list):
+            continue
+
+        entries = [item for item in node if isinstance(item, dict) and is_entry(item)]
+        score = (sum(1 for entry in entries if any(entry.get(name) for name in DATE_FIELDS)), len(entries))
+        if score > best_score:
+            best, best_score = entries, score
+        stack.extend(item for item in node if isinstance(item, dict | list))
+    return best
+
+
+def is_entry(item: dict[str, Any]) -> bool:
+    """Check if an object has a URL and a title."""
+    return bool(entry_url(item) and first_string(item, TITLE_FIELDS))
+
+
+def entry_url(entry: dict[str, Any]) -> str:
+    """Get the URL of an entry object.
+
+    Args:
+        entry: Object from a payload
+
+    Returns:
+        URL, or an empty string if there is none
+
+    """
+    url = first_string(entry, URL_FIELDS)
+    if not url:
+        page = entry.get("mainEntityOfPage")
+        if isinstance(page, dict):
+            page = page.get("@id") or page.get("url")
+        url = page if isinstance(page, str) else ""
+    # Blank node identifiers in JSON-LD are not URLs
+    return "" if url.startswith("_:") else url
+
+
+def first_string(entry: dict[str, Any], names: tuple[str, ...]) -> str:
+    """Get the first non-empty string among some fields.
+
+    Args:
+        entry: Object from a payload
+        names: Field names to try in order
+
+    Returns:
+        Stripped value, or an empty string
+
+    """
+    for name in names:
+        value = entry.get(name)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def unflatten_nuxt(values: Any) -> Any:
+    """Rebuild the data in a Nuxt 3 payload.
+
+    Nuxt serializes its state as a flat array where containers refer to
+    other values by index, with wrappers like ``["Reactive", 3]`` and
+    ``["Date", "2023-04-17T10:00:00Z"]``. Shared and cyclic references are
+    kept as shared objects.
+
+    Args:
+        values: Decoded __NUXT_DATA__ array
+
+    Returns:
+        The rebuilt root value, or values unchanged if it is not a payload
+
+    """
+    if not isinstance(values, list) or not values:
+        return values
+
+    hydrated: dict[int, Any] = {}
+    pending: list[tuple[Any, list[tuple[Any, Any]]]] = []
+
+    def resolve(index: Any) -> Any:
+        if not isinstance(index, int) or not 0 <= index < len(values):
+            return None
+        if index not in hydrated:
+            value = values[index]
+            # Containers are registered before they are filled in to allow cycles
+            if isinstance(value, dict):
+                hydrated[index] = {}
+                pending.append((hydrated[index], list(value.items())))
+            elif isinstance(value, list) and value and isinstance(value[0], str):
+                hydrated[index] = None
+                if value[0] in NUXT_WRAPPERS and len(value) > 1:
+                    hydrated[index] = resolve(value[1])
+                elif value[0] == "Date" and len(value) > 1:
+                    hydrated[index] = value[1]
+            elif isinstance(value, list):
+                hydrated[index] = [None] * len(value)
+                pending.append((hydrated[index], list(enumerate(value))))
+            else:
+                hydrated[index] = value
+        return hydrated[index]
+
+    root = resolve(0)
+    while pending:
+        container, items = pending.pop()
+        for key, index in items:
+            container[key] = resolve(index)
+    return root
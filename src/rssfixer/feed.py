@@ -1,23 +1,131 @@
-"""RSS/Atom feed generation functionality."""
+"""RSS, Atom and JSON Feed generation functionality.
 
+RSS and Atom are written with feedgen. JSON Feed 1.1 is a plain JSON object,
+so it is built from dicts and serialized directly with the json module.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
 from typing import Any
 
 from feedgen.feed import FeedGenerator
 
-from .models import LinkEntry
+from .models import FeedConfig, LinkEntry
+from .urls import canonicalize
+
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
 
 
-def create_rss_feed(links: list[LinkEntry], arguments: Any) -> str:
-    """Create an RSS or Atom feed from a list of links.
+def create_rss_feed(links: Iterable[LinkEntry], arguments: Any) -> str:
+    """Create an RSS or Atom feed from a list or stream of links.
 
     Args:
-        links: List of LinkEntry objects
-        arguments: Parsed command line arguments
+        links: LinkEntry objects, consumed once in order
+        arguments: FeedConfig or parsed command line arguments
 
     Returns:
         RSS or Atom feed as string
 
     """
+    return render_feed(links, arguments).decode("utf-8")
+
+
+def feed_digest(links: Iterable[LinkEntry], arguments: Any) -> str:
+    """Compute a digest of everything a feed is rendered from.
+
+    The digest covers the ordered entries and the feed options that are part of
+    the output, so it only changes when the rendered feed would change. Markup
+    around the entries, like tokens or ads, doesn't affect it.
+
+    Args:
+        links: LinkEntry objects in feed order
+        arguments: FeedConfig or parsed command line arguments
+
+    Returns:
+        Hex digest
+
+    """
+    digest = hashlib.sha256()
+    options = [arguments.url, arguments.title, arguments.base_url, getattr(arguments, "atom", False)]
+    formats = getattr(arguments, "formats", ())
+    if formats:
+        options.append(list(formats))
+    digest.update(json.dumps(options).encode("utf-8") + b"\n")
+    for link in links:
+        published = link.published.isoformat() if link.published else None
+        digest.update(json.dumps([link.url, link.title, link.description, published]).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def render_feed(links: Iterable[LinkEntry], arguments: Any) -> bytes:
+    """Render an RSS or Atom feed from a list or stream of links.
+
+    Args:
+        links: LinkEntry objects, consumed once in order
+        arguments: FeedConfig or parsed command line arguments
+
+    Returns:
+        RSS or Atom feed as UTF-8 encoded bytes
+
+    """
+    return _render_xml(links, arguments, getattr(arguments, "atom", False))
+
+
+def render_feeds(links: Iterable[LinkEntry], config: FeedConfig) -> dict[str, bytes]:
+    """Render the feed in every output format from one list of links.
+
+    Args:
+        links: LinkEntry objects in feed order
+        config: Feed configuration with the formats
+
+    Returns:
+        UTF-8 encoded feed for each format, in the order of the formats
+
+    """
+    links = list(links)
+    feeds = {}
+    for name, _ in config.outputs():
+        if name == "jsonfeed":
+            feeds[name] = render_json_feed(links, config)
+        else:
+            feeds[name] = _render_xml(links, config, name == "atom")
+    return feeds
+
+
+def render_json_feed(links: Iterable[LinkEntry], arguments: Any) -> bytes:
+    """Render a JSON Feed 1.1 from a list or stream of links.
+
+    Args:
+        links: LinkEntry objects, consumed once in order
+        arguments: FeedConfig or parsed command line arguments
+
+    Returns:
+        JSON Feed as UTF-8 encoded bytes
+
+    """
+    base = arguments.base_url or arguments.url
+    items = []
+    for link_entry in links:
+        feed_url = canonicalize(link_entry.url, base)
+        item = {"id": feed_url, "url": feed_url, "title": link_entry.title}
+        item["content_text"] = link_entry.description or ""
+        if link_entry.published:
+            item["date_published"] = link_entry.published.isoformat()
+        items.append(item)
+
+    feed = {
+        "version": JSON_FEED_VERSION,
+        "title": arguments.title,
+        "home_page_url": arguments.url,
+        "description": f"JSON feed generated from the links at {arguments.url}",
+        "items": items,
+    }
+    return json.dumps(feed, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+def _render_xml(links: Iterable[LinkEntry], arguments: Any, atom: bool) -> bytes:
+    """Render an RSS or Atom feed with feedgen, see render_feed."""
     feed_description = f"RSS feed generated from the links at {arguments.url}"
 
     # Create the feed generator
@@ -31,23 +139,23 @@ def create_rss_feed(links: list[LinkEntry], arguments: Any) -> str:
     for link_entry in links:
         fe = fg.add_entry()
 
-        # Build full URL if base_url is provided
-        feed_url = link_entry.url
-        if arguments.base_url and not link_entry.url.startswith("http"):
-            feed_url = arguments.base_url + link_entry.url
+        # Resolve relative URLs against --base-url or the page URL
+        feed_url = canonicalize(link_entry.url, arguments.base_url or arguments.url)
 
         fe.link(href=feed_url)
         fe.id(feed_url)
         fe.title(link_entry.title)
+        if link_entry.published:
+            fe.published(link_entry.published)
 
         # Handle Atom vs RSS format differences
-        if getattr(arguments, "atom", False):
+        if atom:
             fe.summary(link_entry.description)
-            fe.content(content=link_entry.description, src=link_entry.url)
+            fe.content(content=link_entry.description, src=feed_url)
         else:
             fe.description(link_entry.description)
 
     # Generate appropriate feed format
-    if getattr(arguments, "atom", False):
-        return fg.atom_str(pretty=True).decode("utf-8")
-    return fg.rss_str(pretty=True).decode("utf-8")
+    if atom:
+        return fg.atom_str(pretty=True)
+    return fg.rss_str(pretty=True)
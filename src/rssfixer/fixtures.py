@@ -0,0 +1,199 @@
+"""Record and replay HTTP responses for offline runs.
+
+Responses are kept in a directory with a manifest.json that maps each URL
+to the status, headers and SHA-256 digest of its body. Bodies are stored
+zlib compressed under objects/, named by digest, so identical pages are
+only stored once.
+
+The store is used through a requests transport adapter mounted on a
+session. Everything that fetches through that session is recorded or
+replayed without other changes.
+"""
+
+import hashlib
+import io
+import json
+import threading
+import zlib
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from .exceptions import RSSFixerError
+from .utils import write_atomic
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Headers that describe the transfer, not the stored (decoded) body
+TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+class MissingFixtureError(requests.exceptions.RequestException):
+    """Raised in replay mode for URLs that were not recorded."""
+
+
+class FixtureStore:
+    """Content addressed store of HTTP responses."""
+
+    def __init__(self, directory: str):
+        """Open a store, reading the manifest if there is one.
+
+        Args:
+            directory: Directory for the manifest and objects
+
+        Raises:
+            RSSFixerError: If the manifest can't be read
+
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._responses: dict[str, dict] = {}
+
+        manifest = self.directory / MANIFEST
+        if manifest.exists():
+            try:
+                data = json.loads(manifest.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                raise RSSFixerError(f"Unable to read fixture manifest {manifest}: {e}") from e
+            if data.get("version") != MANIFEST_VERSION:
+                raise RSSFixerError(f"Unsupported fixture manifest version in {manifest}")
+            self._responses = data["responses"]
+
+    def __contains__(self, url: str) -> bool:
+        """Check if a response is recorded for a URL."""
+        return url in self._responses
+
+    def load(self, url: str) -> tuple[int, dict[str, str], bytes]:
+        """Load a recorded response.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Status code, headers and body
+
+        Raises:
+            KeyError: If no response is recorded for the URL
+
+        """
+        record = self._responses[url]
+        body = zlib.decompress(self._object_path(record["sha256"]).read_bytes())
+        return record["status"], record["headers"], body
+
+    def save(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        """Record a response and update the manifest.
+
+        Args:
+            url: Requested URL
+            status: HTTP status code
+            headers: Response headers
+            body: Decoded response body
+
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        headers = {key: value for key, value in headers.items() if key.lower() not in TRANSFER_HEADERS}
+
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                write_atomic(path, zlib.compress(body))
+            self._responses[url] = {"status": status, "headers": headers, "sha256": digest, "size": len(body)}
+            manifest = {"version": MANIFEST_VERSION, "responses": self._responses}
+            write_atomic(self.directory / MANIFEST, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+    def _object_path(self, digest: str) -> Path:
+        """Get the path of a stored body."""
+        return self.directory / "objects" / digest[:2] / digest
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter that stores every response another adapter receives."""
+
+    def __init__(self, store: FixtureStore, adapter: BaseAdapter | None = None):
+        """Initialize the adapter.
+
+        Args:
+            store: Store to record responses in
+            adapter: Adapter that performs the requests (default: HTTPAdapter)
+
+        """
+        super().__init__()
+        self.store = store
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        """Send the request and record the response."""
+        response = self.adapter.send(request, **kwargs)
+        self.store.save(request.url, response.status_code, dict(response.headers), response.content)
+        return response
+
+    def close(self):
+        """Close the wrapped adapter."""
+        self.adapter.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that answers from a store without network access."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        """Initialize the adapter.
+
+        Args:
+            store: Store with recorded responses
+            **kwargs: Passed on to HTTPAdapter
+
+        """
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        """Build the response from the store."""
+        if request.url not in self.store:
+            raise MissingFixtureError(f"no recorded response in {self.store.directory}", request=request)
+        try:
+            status, headers, body = self.store.load(request.url)
+        except (OSError, zlib.error) as e:
+            raise MissingFixtureError(f"unable to read recorded response: {e}", request=request) from e
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def create_session(record: str | None = None, replay: str | None = None) -> requests.Session:
+    """Create a session that records to or replays from a fixture directory.
+
+    Args:
+        record: Directory to record responses in
+        replay: Directory to replay responses from
+
+    Returns:
+        Session with the fixture adapter mounted for http and https
+
+    Raises:
+        RSSFixerError: If both record and replay are given or the replay directory is missing
+
+    """
+    if record and replay:
+        raise RSSFixerError("Only one of record and replay can be used")
+
+    session = requests.Session()
+    if record:
+        adapter: BaseAdapter = RecordingAdapter(FixtureStore(record))
+    elif replay:
+        if not Path(replay).is_dir():
+            raise RSSFixerError(f"Fixture directory {replay} does not exist")
+        adapter = ReplayAdapter(FixtureStore(replay))
+    else:
+        return session
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,110 @@
+"""Compile and resolve simple paths into parsed JSON.
+
+A path is a list of object keys separated by dots. ``[n]`` selects an item
+of an array and ``[*]`` all of its items, for example
+``props.pageProps.blogs[*]`` or ``fields.slug``. Paths are compiled once to a
+tuple of steps, so resolving one costs the length of the path and not the
+size of the document.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+from .exceptions import JSONParsingError
+
+# Step matching all items of an array
+WILDCARD = None
+
+_STEP = re.compile(r"(?:^|\.)([^.\[\]]+)|\[(\*|-?\d+)\]")
+
+
+def is_path(expression: str) -> bool:
+    """Check if an expression is a path rather than a single key.
+
+    Args:
+        expression: Value of a --json-* option
+
+    Returns:
+        True if the expression contains a dot or an index
+
+    """
+    return "." in expression or "[" in expression
+
+
+@lru_cache(maxsize=128)
+def compile_path(expression: str) -> tuple[str | int | None, ...]:
+    """Compile a path to a tuple of steps.
+
+    Args:
+        expression: Path like ``props.pageProps.blogs[*]``
+
+    Returns:
+        Keys as str, indexes as int and WILDCARD for ``[*]``
+
+    Raises:
+        JSONParsingError: If the path is not valid
+
+    """
+    steps: list[str | int | None] = []
+    position = 0
+    for match in _STEP.finditer(expression):
+        key, index = match.groups()
+        # Keys after the first one are separated by a dot
+        if match.start() != position or (key is not None and match.group().startswith(".") == (position == 0)):
+            break
+        if key is not None:
+            steps.append(key)
+        else:
+            steps.append(WILDCARD if index == "*" else int(index))
+        position = match.end()
+    if not steps or position != len(expression):
+        raise JSONParsingError(f"Invalid JSON path {expression!r}")
+    return tuple(steps)
+
+
+def find_all(data: Any, steps: tuple[str | int | None, ...]) -> list[Any]:
+    """Resolve a compiled path, following every item for WILDCARD steps.
+
+    Args:
+        data: Parsed JSON
+        steps: Compiled path
+
+    Returns:
+        All values at the path, empty if there are none
+
+    """
+    values = [data]
+    for step in steps:
+        found = []
+        for value in values:
+            if step is WILDCARD:
+                if isinstance(value, list):
+                    found.extend(value)
+            elif isinstance(step, int):
+                if isinstance(value, list) and -len(value) <= step < len(value):
+                    found.append(value[step])
+            elif isinstance(value, dict) and step in value:
+                found.append(value[step])
+        values = found
+    return values
+
+
+def get_value(data: Any, steps: tuple[str | int | None, ...]) -> Any:
+    """Get the first value at a compiled path.
+
+    Args:
+        data: Parsed JSON
+        steps: Compiled path
+
+    Returns:
+        First value at the path
+
+    Raises:
+        KeyError: If there is no value at the path
+
+    """
+    values = find_all(data, steps)
+    if not values:
+        raise KeyError(".".join(str(step) for step in steps))
+    return values[0]
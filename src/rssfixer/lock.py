@@ -0,0 +1,192 @@
+"""Advisory locks that stop overlapping runs from writing the same output.
+
+The lock is held on ``<output>.lock`` for the whole run. A run that finds the
+lock held either gives up (skip), waits for it (wait) or waits and takes it
+over once it is older than a limit (steal), which covers a run that hangs.
+A lock is taken over by moving the lock file aside, removing it and locking a
+new one, so the old holder keeps a lock on a file no other run can open. For the same reason a
+run only counts as holding the lock if the file it locked is still the one at
+the path, and checks that again before it writes the output.
+"""
+
+import os
+import secrets
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+from .budgets import Deadline
+from .exceptions import FileWriteError, OutputLockedError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+LOCK_POLICIES = ("skip", "wait", "steal")
+DEFAULT_STEAL_AFTER = 600
+
+# Exit status of a run skipped because of the lock, EX_TEMPFAIL in sysexits.h
+EXIT_LOCKED = 75
+
+# Seconds between attempts when waiting for a lock
+WAIT_INTERVAL = 0.5
+
+
+def lock_path(output: str) -> Path:
+    """Get the path of the lock file for an output file."""
+    return Path(f"{output}.lock")
+
+
+@dataclass(frozen=True)
+class OutputLock:
+    """A lock held on the lock file of an output file."""
+
+    output: str
+    path: Path
+    fd: int
+
+    def verify(self) -> None:
+        """Check that the lock hasn't been taken over by another run.
+
+        Raises:
+            OutputLockedError: If the lock file was removed or replaced
+
+        """
+        if not _is_current(self.fd, self.path):
+            raise OutputLockedError(f"the lock for {self.output} was taken over by another run")
+
+
+@contextmanager
+def output_lock(
+    output: str,
+    policy: str,
+    steal_after: float = DEFAULT_STEAL_AFTER,
+    deadline: Deadline | None = None,
+) -> Iterator[OutputLock]:
+    """Hold the lock for an output file.
+
+    Args:
+        output: Path of the output file
+        policy: "skip", "wait" or "steal"
+        steal_after: Age in seconds after which a lock is taken over with the steal policy
+        deadline: Optional deadline for waiting
+
+    Yields:
+        The lock, which is held until the block ends
+
+    Raises:
+        OutputLockedError: If the lock is held by another run and the policy is skip
+        DeadlineExceededError: If the deadline passes while waiting
+        FileWriteError: If the lock file can't be created
+
+    """
+    if policy not in LOCK_POLICIES:
+        raise ValueError(f"Unknown lock policy {policy!r}, expected one of {', '.join(LOCK_POLICIES)}")
+
+    path = lock_path(output)
+    while True:
+        fd = _try_lock(path)
+        if fd is not None:
+            break
+        if policy == "skip":
+            raise OutputLockedError(f"{output} is locked by another run")
+        if policy == "steal" and _remove_stale(path, steal_after):
+            continue
+        if deadline is not None:
+            deadline.check("locking")
+        time.sleep(WAIT_INTERVAL)
+
+    try:
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        yield OutputLock(output, path, fd)
+    finally:
+        # Only remove the file if the lock has not been taken over
+        if _is_current(fd, path):
+            path.unlink(missing_ok=True)
+        os.close(fd)
+
+
+def _try_lock(path: Path) -> int | None:
+    """Try to lock the lock file without waiting.
+
+    Args:
+        path: Path of the lock file
+
+    Returns:
+        Descriptor of the locked file, None if another run holds the lock
+
+    Raises:
+        FileWriteError: If the lock file can't be created
+
+    """
+    while True:
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError as e:
+            raise FileWriteError(f"Unable to create lock file {path}") from e
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return None
+        if _is_current(fd, path):
+            return fd
+        # Removed by the previous holder or taken over after it was opened
+        os.close(fd)
+
+
+def _is_current(fd: int, path: Path) -> bool:
+    """Check that a locked descriptor is still the file at the path."""
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(path))
+    except OSError:
+        return False
+
+
+def _remove_stale(path: Path, steal_after: float) -> bool:
+    """Remove the lock file if it was locked longer ago than steal_after.
+
+    Another waiter may have taken the lock over since this one found it
+    stale, and its new lock file must not be removed. The file is therefore
+    renamed to a name no other run uses and only removed if it is the file
+    found stale and is still stale, since a new file can reuse the inode of a
+    removed one. Otherwise it is linked back to the path, unless a newer lock
+    file is already there.
+
+    Args:
+        path: Path of the lock file
+        steal_after: Age in seconds after which a lock is stale
+
+    Returns:
+        True if the stale lock file was removed
+
+    """
+    try:
+        found = os.stat(path)
+    except OSError:
+        return False
+    if time.time() - found.st_mtime <= steal_after:
+        return False
+
+    aside = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}")
+    try:
+        os.rename(path, aside)
+    except OSError:
+        return False
+    try:
+        moved = os.stat(aside)
+        if os.path.samestat(moved, found) and time.time() - moved.st_mtime > steal_after:
+            return True
+        with suppress(OSError):
+            os.link(aside, path)
+        return False
+    finally:
+        aside.unlink(missing_ok=True)
@@ -1,15 +1,50 @@
 """Data models for RSS fixer."""
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
+)
+
+MODES = ("list", "html", "json", "release", "structured", "sitemap")
+
+# Output formats, their names in messages and the extension of their output
+# file when it isn't the first format
+FEED_FORMATS = ("rss", "atom", "jsonfeed")
+FORMAT_NAMES = {"rss": "RSS", "atom": "Atom", "jsonfeed": "JSON"}
+FORMAT_EXTENSIONS = {"rss": ".xml", "atom": ".atom", "jsonfeed": ".json"}
+
+# Limits for the search for --json-entries when it is a key and not a path
+DEFAULT_JSON_MAX_DEPTH = 64
+DEFAULT_JSON_MAX_NODES = 1_000_000
+
+# Budgets for the page content and the elements visited during extraction
+DEFAULT_MAX_INPUT_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_NODES = 10_000_000
+
+# Entries kept from a sitemap without --max-entries
+DEFAULT_SITEMAP_ENTRIES = 50
+
+# Size and orders of aggregate feeds
+DEFAULT_AGGREGATE_ENTRIES = 50
+AGGREGATE_ORDERS = ("date", "first-seen")
+
+# Fetch threads and worker process recycling for commands that generate many feeds
+DEFAULT_FETCH_THREADS = 8
+DEFAULT_MAX_TASKS_PER_CHILD = 100
 
 
 @dataclass
 class LinkEntry:
-    """Represents a single feed entry with URL, title, and optional description."""
+    """Represents a single feed entry with URL, title, and optional description and date."""
 
     url: str
     title: str
     description: str | None = ""
+    published: datetime | None = None
 
     def __post_init__(self):
         """Validate required fields after initialization."""
@@ -21,3 +56,146 @@ class LinkEntry:
         self.title = self.title.strip()
         if self.description:
             self.description = self.description.strip()
+
+
+@dataclass(frozen=True)
+class FeedConfig:
+    """Configuration for generating one feed.
+
+    Field names match the destinations of the command line options, and the
+    defaults are the same as on the command line.
+    """
+
+    url: str
+    mode: str = "list"
+    title: str = "My RSS Feed"
+    output: str = "rss_feed.xml"
+    input: str | None = None
+    atom: bool = False
+    formats: tuple[str, ...] = ()
+    format_outputs: tuple[tuple[str, str], ...] = ()
+    base_url: str | None = None
+    user_agent: str = DEFAULT_USER_AGENT
+    filter_type: str | None = None
+    filter_name: str | None = None
+    title_filter: str | None = None
+    max_entries: int | None = None
+    near_duplicates: int | None = None
+    list_exclude: tuple[str, ...] = ()
+    html_entries: str = "article"
+    html_entries_class: str = ""
+    html_url: str = "a"
+    html_title: str = "h3"
+    html_title_class: str = "title"
+    html_description: str = "div"
+    html_description_class: str = "summary"
+    html_date: str | None = None
+    html_date_class: str = ""
+    json_entries: str = "entries"
+    json_url: str = "url"
+    json_title: str = "title"
+    json_description: str = "description"
+    json_date: str | None = None
+    json_max_depth: int = DEFAULT_JSON_MAX_DEPTH
+    json_max_nodes: int = DEFAULT_JSON_MAX_NODES
+    max_input_bytes: int | None = DEFAULT_MAX_INPUT_BYTES
+    max_nodes: int | None = DEFAULT_MAX_NODES
+    deadline: float | None = None
+    release_entries: str | None = None
+    release_url: str | None = None
+    sitemap_include: str | None = None
+    sitemap_since: str | None = None
+    record: str | None = None
+    replay: str | None = None
+    debug: bool = False
+
+    def __post_init__(self):
+        """Validate the extractor mode and output formats and keep the configuration hashable."""
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown mode {self.mode!r}, expected one of {', '.join(MODES)}")
+        object.__setattr__(self, "list_exclude", tuple(self.list_exclude))
+        object.__setattr__(self, "formats", tuple(self.formats))
+        object.__setattr__(self, "format_outputs", tuple(tuple(item) for item in self.format_outputs))
+
+        unknown = [name for name in self.formats if name not in FEED_FORMATS]
+        if unknown or len(set(self.formats)) != len(self.formats):
+            raise ValueError(f"Invalid formats {','.join(self.formats)}, expected some of {', '.join(FEED_FORMATS)}")
+        outputs = self.outputs()
+        formats = [name for name, _ in outputs]
+        for name, _ in self.format_outputs:
+            if name not in formats:
+                raise ValueError(f"Output given for {name}, which is not one of the formats {','.join(formats)}")
+        if len({path for _, path in outputs}) != len(outputs):
+            raise ValueError("The formats have the same output file, set them with --format-output FORMAT=FILE")
+
+    def outputs(self) -> list[tuple[str, str]]:
+        """List the output file of every format.
+
+        The first format is written to output, and other formats to output
+        with the extension of the format unless --format-output is given.
+        Without formats, an RSS feed or an Atom feed with --atom is written.
+
+        Returns:
+            Format and path of each feed to write, in the order of the formats
+
+        """
+        formats = self.formats or (("atom",) if self.atom else ("rss",))
+        paths = dict(self.format_outputs)
+        root = os.path.splitext(self.output)[0]
+        outputs = []
+        for number, name in enumerate(formats):
+            default = self.output if number == 0 else root + FORMAT_EXTENSIONS[name]
+            outputs.append((name, paths.get(name, default)))
+        return outputs
+
+    @classmethod
+    def from_arguments(cls, arguments: Any) -> "FeedConfig":
+        """Create a configuration from parsed command line arguments.
+
+        Attributes missing on arguments get their default value.
+
+        Args:
+            arguments: Parsed command line arguments or any object with the same attributes
+
+        Returns:
+            Feed configuration
+
+        """
+        values = {}
+        for name in cls.__dataclass_fields__:
+            if name == "mode":
+                values[name] = next((mode for mode in MODES if getattr(arguments, mode, False)), "list")
+            elif hasattr(arguments, name):
+                values[name] = getattr(arguments, name)
+        if "url" not in values:
+            values["url"] = ""
+        values["list_exclude"] = tuple(values.get("list_exclude") or ())
+        values["formats"] = tuple(values.get("formats") or ())
+        values["format_outputs"] = tuple(values.get("format_outputs") or ())
+        return cls(**values)
+
+
+@dataclass
+class FeedStats:
+    """Timings and counts for one generated feed."""
+
+    input_bytes: int = 0
+    entries: int = 0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    extract_seconds: float = 0.0
+    render_seconds: float = 0.0
+    # The entries matched the previous digest, so nothing was rendered
+    unchanged: bool = False
+
+
+@dataclass
+class FeedResult:
+    """A generated feed with the entries it was built from."""
+
+    feed: bytes
+    entries: list[LinkEntry] = field(default_factory=list)
+    stats: FeedStats = field(default_factory=FeedStats)
+    digest: str = ""
+    # Rendered feed of every output format, feed is the one of the first format
+    feeds: dict[str, bytes] = field(default_factory=dict)
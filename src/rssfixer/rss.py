@@ -1,13 +1,34 @@
 """Generate rss feed for "blogs" without rss feed."""
 
+import os
+import shlex
 import sys
+from collections.abc import Callable
+from contextlib import ExitStack
+from datetime import UTC, datetime
 
-from bs4 import BeautifulSoup
-
-from .cli import get_extractor, parse_arguments
-from .exceptions import RSSFixerError
-from .feed import create_rss_feed
-from .utils import fetch_html, filter_html, save_rss_feed
+from .aggregate import AggregateOptions, run_aggregate
+from .api import extract_feed, render_result
+from .batch import BatchOptions, load_feeds, run_batch
+from .budgets import Deadline
+from .cli import (
+    parse_aggregate_arguments,
+    parse_arguments,
+    parse_batch_arguments,
+    parse_detect_arguments,
+    parse_schedule_arguments,
+    parse_warc_arguments,
+)
+from .detect import detect
+from .emit import append_records, find_new_entries
+from .exceptions import OutputLockedError, RSSFixerError
+from .explain import ExplainReport
+from .lock import EXIT_LOCKED, OutputLock, output_lock
+from .models import FeedConfig
+from .schedule import format_interval, plan
+from .state import EXIT_UNCHANGED, FeedStateStore
+from .utils import fetch_html, parse_html, save_feeds
+from .warc import run_warc
 
 
 def main(args=None):
@@ -15,33 +36,24 @@ def main(args=None):
     if args is None:
         args = sys.argv[1:]
 
-    try:
-        args = parse_arguments(args)
-
-        # Get HTML content from URL
-        headers = {"User-Agent": args.user_agent}
-        html_content = fetch_html(args.url, headers)
-        soup = BeautifulSoup(html_content, "html.parser")
+    if args and args[0] in COMMANDS:
+        return run_command(COMMANDS[args[0]], args[1:])
+    return run_command(single_feed, args)
 
-        # Filter web page if specified
-        if args.filter_type and args.filter_name:
-            soup = filter_html(soup, args.filter_type, args.filter_name)
 
-        if args.debug:
-            print("DEBUG: Filtered HTML\n")
-            print(soup.prettify())
+def run_command(command: Callable[[list[str]], int], args: list[str]) -> int:
+    """Run a command and report the errors that end it.
 
-        # Get appropriate extractor and extract links
-        extractor = get_extractor(args)
-        links = extractor.extract_links(soup)
+    Args:
+        command: Function that handles the arguments of the command
+        args: Command line arguments for the command
 
-        # Create RSS feed and save to file
-        rss_feed = create_rss_feed(links, args)
-        if args.stdout:
-            print(rss_feed)
-        else:
-            save_rss_feed(rss_feed, args.output, getattr(args, "atom", False), args.quiet)
+    Returns:
+        Exit status of the command, 1 if it failed
 
+    """
+    try:
+        return command(args)
     except RSSFixerError as e:
         print(f"ERROR: {e}")
         return 1
@@ -52,8 +64,199 @@ def main(args=None):
         print(f"UNEXPECTED ERROR: {e}")
         return 1
 
+
+def single_feed(args):
+    """Handle arguments for a single feed."""
+    args = parse_arguments(args)
+    config = FeedConfig.from_arguments(args)
+    deadline = Deadline(config.deadline)
+    report = ExplainReport(config.url) if args.explain else None
+    try:
+        with ExitStack() as stack:
+            # Held from before the fetch until the feed is saved
+            lock = None
+            if args.lock and not args.stdout:
+                lock = stack.enter_context(output_lock(config.output, args.lock, args.lock_steal_after, deadline))
+            try:
+                return generate(args, config, report, deadline, lock)
+            finally:
+                if report is not None:
+                    print(report.format(), file=sys.stderr)
+    except OutputLockedError as e:
+        if not args.quiet:
+            print(f"SKIPPED: {e}")
+        return EXIT_LOCKED
+
+
+def generate(
+    args,
+    config: FeedConfig,
+    report: ExplainReport | None,
+    deadline: Deadline,
+    lock: OutputLock | None = None,
+) -> int:
+    """Generate a single feed and print or save it in every output format.
+
+    With --skip-unchanged, the digest of the entries is compared with the one
+    saved for the output, and an unchanged feed isn't rendered or saved. With
+    --emit-new, the entries that earlier runs haven't seen are appended to
+    the new entries file after the feed is saved. With --lock, the lock is
+    checked again before saving, in case another run has taken it over.
+
+    Args:
+        args: Parsed command line arguments
+        config: Feed configuration
+        report: Report for --explain, None if not used
+        deadline: Deadline for the whole run
+        lock: Lock held on the output, None if not locked
+
+    Returns:
+        0 if the feed was printed or saved, EXIT_UNCHANGED if it was unchanged
+
+    Raises:
+        RSSFixerError: If the feed can't be generated or saved
+        OutputLockedError: If the lock was taken over by another run
+
+    """
+    skip_unchanged = args.skip_unchanged and not args.stdout
+    store = None
+    if skip_unchanged or args.emit_new:
+        store = FeedStateStore.for_output(config.output, args.state_dir)
+    state = store.load() if store else None
+
+    result = extract_feed(config, report=report, deadline=deadline)
+    saved = all(os.path.exists(path) for _, path in config.outputs())
+    if skip_unchanged and state and result.digest == state.feed_digest and saved:
+        result.stats.unchanged = True
+        if not args.quiet:
+            print(f"UNCHANGED: {config.output}")
+    else:
+        render_result(result, config, deadline)
+
+        # Print feed or save to file
+        deadline.check("saving")
+        if args.stdout:
+            print(result.feed.decode("utf-8"))
+        else:
+            if lock is not None:
+                lock.verify()
+            save_feeds(result.feeds, config, args.quiet)
+            if state:
+                state.feed_digest = result.digest
+
+    if store and state:
+        if args.emit_new:
+            records = find_new_entries(result.entries, config, state, datetime.now(UTC), args.emit_skip_first)
+            append_records(records, args.emit_new)
+        store.save(state)
+    return EXIT_UNCHANGED if result.stats.unchanged else 0
+
+
+def batch(args):
+    """Handle arguments for the batch command."""
+    args = parse_batch_arguments(args)
+    feeds = load_feeds(args.config)
+    options = BatchOptions(
+        workers=args.workers,
+        max_tasks_per_child=args.max_tasks_per_child,
+        fetch_threads=args.fetch_threads,
+        quiet=args.quiet,
+        record=args.record,
+        replay=args.replay,
+        adaptive=args.adaptive,
+        state_dir=args.state_dir,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        skip_unchanged=args.skip_unchanged,
+        emit_new=args.emit_new,
+        emit_skip_first=args.emit_skip_first,
+    )
+    return run_batch(feeds, options)
+
+
+def show_schedule(args):
+    """Handle arguments for the schedule command."""
+    args = parse_schedule_arguments(args)
+    feeds = load_feeds(args.config)
+    states = [FeedStateStore.for_output(config.output, args.state_dir).load() for config in feeds]
+
+    now = datetime.now(UTC)
+    for config, state in zip(feeds, states, strict=True):
+        schedule = plan(state.poll, args.min_interval, args.max_interval)
+        when = "now" if schedule.due(now) else f"{schedule.next_poll:%Y-%m-%d %H:%M %Z}"
+        print(f"{config.url} -> {config.output}")
+        print(f"   next poll: {when}, every {format_interval(schedule.interval)}")
+        if state.poll is not None:
+            changed = f"{state.poll.changed:%Y-%m-%d %H:%M %Z}" if state.poll.changed else "never"
+            print(f"   history: {state.poll.checks} checks, {state.poll.changes} changes, last change {changed}")
+        print(f"   reason: {schedule.reason}")
+    return 0
+
+
+def aggregate(args):
+    """Handle arguments for the aggregate command."""
+    args = parse_aggregate_arguments(args)
+    sources = load_feeds(args.config)
+    options = AggregateOptions(
+        url=args.url,
+        output=args.output,
+        title=args.title,
+        atom=args.atom,
+        max_entries=args.max_entries,
+        order=args.order,
+        near_duplicates=args.near_duplicates,
+        state_dir=args.state_dir,
+    )
+    batch_options = BatchOptions(
+        workers=args.workers,
+        max_tasks_per_child=args.max_tasks_per_child,
+        fetch_threads=args.fetch_threads,
+        quiet=args.quiet,
+        record=args.record,
+        replay=args.replay,
+    )
+    return run_aggregate(sources, options, batch_options)
+
+
+def warc(args):
+    """Handle arguments for the warc command."""
+    args = parse_warc_arguments(args)
+    feeds = load_feeds(args.config)
+    options = BatchOptions(
+        workers=args.workers,
+        max_tasks_per_child=args.max_tasks_per_child,
+        fetch_threads=args.fetch_threads,
+        quiet=args.quiet,
+    )
+    return run_warc(args.warc, feeds, options)
+
+
+def detect_options(args):
+    """Handle arguments for the detect command."""
+    args = parse_detect_arguments(args)
+    html_content = fetch_html(args.url, {"User-Agent": args.user_agent})
+    candidates = detect(parse_html(html_content), args.url)
+
+    if not candidates:
+        print("No usable extractor options found")
+        return 1
+
+    for number, candidate in enumerate(candidates[: args.limit], start=1):
+        print(f"{number}. {candidate.count} entries")
+        print(f"   rssfixer {shlex.join([*candidate.options, args.url])}")
+        for link in candidate.links[: args.preview]:
+            print(f"     - {link.title[:70]} <{link.url}>")
     return 0
 
 
+COMMANDS = {
+    "aggregate": aggregate,
+    "batch": batch,
+    "detect": detect_options,
+    "schedule": show_schedule,
+    "warc": warc,
+}
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,151 @@
+"""Adaptive poll intervals learned from the change history of each feed.
+
+Every successful check records whether the set of entry URLs changed since the
+previous check. A feed that keeps returning the same entries is polled less
+often: the interval starts at the minimum and doubles for every check in a row
+without a change, up to the maximum. A change resets it to the minimum, so a
+feed that starts posting again is soon polled often again.
+
+Once a feed has changed a few times, the interval is also kept below half the
+average time between its changes, so that a feed is polled at least twice for
+each new post it usually has.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .state import PollState
+
+DEFAULT_MIN_INTERVAL = 60 * 60
+DEFAULT_MAX_INTERVAL = 7 * 24 * 60 * 60
+
+# Changes needed before the average time between them is trusted
+MIN_CHANGES = 2
+
+
+@dataclass
+class Schedule:
+    """When a feed should be polled next and why."""
+
+    interval: timedelta
+    next_poll: datetime | None
+    reason: str
+
+    def due(self, now: datetime) -> bool:
+        """Check if the feed should be polled.
+
+        Args:
+            now: Current time
+
+        Returns:
+            True if the feed has never been checked or the interval has passed
+
+        """
+        return self.next_poll is None or now >= self.next_poll
+
+
+def entry_digest(urls: Iterable[str]) -> str:
+    """Compute a digest of a set of entry URLs.
+
+    Args:
+        urls: Entry URLs in any order
+
+    Returns:
+        Hex digest that only changes when the set of URLs changes
+
+    """
+    digest = hashlib.sha256()
+    for url in sorted(set(urls)):
+        digest.update(url.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def record_poll(poll: PollState | None, urls: Iterable[str], now: datetime) -> PollState:
+    """Record a successful check of a feed.
+
+    Args:
+        poll: Change history before the check, None for the first check
+        urls: Entry URLs found by the check
+        now: Time of the check
+
+    Returns:
+        Updated change history
+
+    """
+    digest = entry_digest(urls)
+    if poll is None:
+        return PollState(since=now, checked=now, digest=digest)
+
+    poll.checks += 1
+    poll.checked = now
+    if digest == poll.digest:
+        poll.unchanged += 1
+    else:
+        poll.digest = digest
+        poll.changed = now
+        poll.changes += 1
+        poll.unchanged = 0
+    return poll
+
+
+def plan(poll: PollState | None, min_interval: float, max_interval: float) -> Schedule:
+    """Compute when a feed should be polled next.
+
+    Args:
+        poll: Change history of the feed, None if it has never been checked
+        min_interval: Shortest interval in seconds
+        max_interval: Longest interval in seconds
+
+    Returns:
+        Interval, time of the next poll and the reasoning behind them
+
+    """
+    shortest = timedelta(seconds=min_interval)
+    longest = timedelta(seconds=max(min_interval, max_interval))
+    if poll is None:
+        return Schedule(shortest, None, "never checked")
+
+    # Doubles for every unchanged check, without computing huge powers of two
+    interval = shortest
+    for _ in range(poll.unchanged):
+        if interval >= longest:
+            break
+        interval *= 2
+    interval = min(interval, longest)
+
+    if poll.unchanged == 0:
+        reason = "changed at the last check" if poll.changed == poll.checked else "checked once"
+    else:
+        reason = f"unchanged for {poll.unchanged} checks"
+    if interval == longest and interval > shortest:
+        reason += ", at the maximum interval"
+
+    if poll.changed is not None and poll.changes >= MIN_CHANGES:
+        average = (poll.changed - poll.since) / poll.changes
+        cap = max(shortest, average / 2)
+        if cap < interval:
+            interval = cap
+            reason += f", limited to half the average {format_interval(average)} between changes"
+
+    return Schedule(interval, poll.checked + interval, reason)
+
+
+def format_interval(interval: timedelta) -> str:
+    """Format an interval with its two largest units, like ``2d 4h``.
+
+    Args:
+        interval: Interval to format
+
+    Returns:
+        Short description of the interval
+
+    """
+    seconds = int(interval.total_seconds())
+    parts = []
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60), ("s", 1)):
+        count, seconds = divmod(seconds, size)
+        if count:
+            parts.append(f"{count}{unit}")
+    return " ".join(parts[:2]) or "0s"
@@ -0,0 +1,134 @@
+"""Near-duplicate detection with SimHash fingerprints.
+
+A fingerprint is a 64-bit SimHash of the word pairs in the normalized title
+and description of an entry. Entries whose fingerprints differ in at most
+``distance`` bits are near duplicates, for example the same post published
+under several URLs with small changes to the text.
+
+The index splits fingerprints into ``distance + 1`` bands. Two fingerprints
+within the distance differ in at most ``distance`` bands, so they are equal in
+at least one, and only fingerprints sharing a band with the one looked up are
+compared. A lookup therefore only looks at a small part of a large history.
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Hashable
+from itertools import pairwise
+
+BITS = 64
+MAX_DISTANCE = 16
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> list[str]:
+    """Split text into lowercase words without accents or punctuation.
+
+    Args:
+        text: Title or description
+
+    Returns:
+        Words in order
+
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return _WORD.findall("".join(char for char in text if not unicodedata.combining(char)))
+
+
+def fingerprint(text: str) -> int | None:
+    """Compute the SimHash of a text.
+
+    Pairs of adjacent words are used as features, so the order of the words
+    matters, and a single word is used as is.
+
+    Args:
+        text: Text to fingerprint, usually the title and description of an entry
+
+    Returns:
+        64-bit fingerprint, None for a text without words
+
+    """
+    words = normalize(text)
+    if not words:
+        return None
+    features = Counter(f"{first} {second}" for first, second in pairwise(words)) or Counter(words)
+    totals = [0] * BITS
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=BITS // 8).digest())
+        for bit in range(BITS):
+            totals[bit] += weight if value >> bit & 1 else -weight
+    return sum(1 << bit for bit, total in enumerate(totals) if total > 0)
+
+
+def entry_fingerprint(title: str, description: str) -> int | None:
+    """Compute the SimHash of the title and description of an entry.
+
+    A description that repeats the title, as for list entries, is left out.
+
+    Args:
+        title: Entry title
+        description: Entry description
+
+    Returns:
+        64-bit fingerprint, None if there are no words
+
+    """
+    return fingerprint(title if description == title else f"{title} {description}")
+
+
+class SimHashIndex:
+    """Index of fingerprints for finding near duplicates."""
+
+    def __init__(self, distance: int):
+        """Initialize an empty index.
+
+        Args:
+            distance: Largest number of differing bits for a near duplicate
+
+        Raises:
+            ValueError: If the distance is outside 0 to MAX_DISTANCE
+
+        """
+        if not 0 <= distance <= MAX_DISTANCE:
+            raise ValueError(f"Distance must be between 0 and {MAX_DISTANCE}, got {distance}")
+        self.distance = distance
+        bands = distance + 1
+        # Bit offset and mask of each band, the last bands are one bit wider if needed
+        width, extra = divmod(BITS, bands)
+        self._bands: list[tuple[int, int]] = []
+        offset = 0
+        for band in range(bands):
+            size = width + (band >= bands - extra)
+            self._bands.append((offset, (1 << size) - 1))
+            offset += size
+        self._buckets: list[defaultdict[int, list[tuple[int, Hashable]]]] = [defaultdict(list) for _ in range(bands)]
+
+    def add(self, value: int, key: Hashable) -> None:
+        """Add a fingerprint.
+
+        Args:
+            value: Fingerprint
+            key: Returned by find for near duplicates of the fingerprint
+
+        """
+        for buckets, (offset, mask) in zip(self._buckets, self._bands, strict=True):
+            buckets[value >> offset & mask].append((value, key))
+
+    def find(self, value: int) -> Hashable | None:
+        """Find a near duplicate of a fingerprint.
+
+        Args:
+            value: Fingerprint
+
+        Returns:
+            Key of a fingerprint within the distance, None if there is none
+
+        """
+        for buckets, (offset, mask) in zip(self._buckets, self._bands, strict=True):
+            for candidate, key in buckets.get(value >> offset & mask, ()):
+                if (candidate ^ value).bit_count() <= self.distance:
+                    return key
+        return None
@@ -0,0 +1,155 @@
+"""State kept between runs for an output file.
+
+The state is a small JSON file next to the output, ``.<output name>.state.json``,
+or ``<output name>.state.json`` in a directory given with --state-dir. It is
+written atomically, so an interrupted run leaves the previous state.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .exceptions import FileReadError, FileWriteError
+from .utils import write_atomic
+
+STATE_VERSION = 1
+
+# Exit status of a run that skipped an unchanged feed
+EXIT_UNCHANGED = 3
+
+
+@dataclass
+class PollState:
+    """Change history of the entries of a polled feed."""
+
+    # First and latest successful check
+    since: datetime
+    checked: datetime
+    # Digest of the entry URLs at the latest check
+    digest: str
+    # Latest check where the entries had changed, None if they never have
+    changed: datetime | None = None
+    checks: int = 1
+    changes: int = 0
+    # Checks in a row without a change
+    unchanged: int = 0
+
+
+@dataclass
+class FeedState:
+    """What earlier runs have seen for an output file."""
+
+    # When each entry URL was first seen
+    first_seen: dict[str, datetime] = field(default_factory=dict)
+    poll: PollState | None = None
+    # Digest of the entries the output was last rendered from
+    feed_digest: str | None = None
+
+
+class FeedStateStore:
+    """Loads and saves the state for an output file."""
+
+    def __init__(self, path: str | Path):
+        """Initialize the store.
+
+        Args:
+            path: Path of the state file
+
+        """
+        self.path = Path(path)
+
+    @classmethod
+    def for_output(cls, output: str, state_dir: str | None = None) -> "FeedStateStore":
+        """Get the store for an output file.
+
+        Args:
+            output: Path of the output file
+            state_dir: Directory for state files, None to keep the state next to the output
+
+        Returns:
+            Store for the output
+
+        """
+        name = Path(output).name
+        if state_dir is None:
+            return cls(Path(output).with_name(f".{name}.state.json"))
+        return cls(Path(state_dir) / f"{name}.state.json")
+
+    def load(self) -> FeedState:
+        """Load the state, empty if no run has saved one yet.
+
+        Returns:
+            Saved state
+
+        Raises:
+            FileReadError: If the state file can't be read or parsed
+
+        """
+        try:
+            data = json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return FeedState()
+        except (OSError, ValueError) as e:
+            raise FileReadError(f"Unable to read state file {self.path}: {e}") from e
+
+        try:
+            poll = data.get("poll")
+            return FeedState(
+                first_seen={url: datetime.fromisoformat(seen) for url, seen in data.get("first_seen", {}).items()},
+                poll=None if poll is None else _load_poll(poll),
+                feed_digest=data.get("feed_digest"),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise FileReadError(f"Invalid state file {self.path}: {e}") from e
+
+    def save(self, state: FeedState) -> None:
+        """Save the state atomically.
+
+        Args:
+            state: State to save
+
+        Raises:
+            FileWriteError: If the state file can't be written
+
+        """
+        data = {
+            "version": STATE_VERSION,
+            "first_seen": {url: seen.isoformat() for url, seen in state.first_seen.items()},
+        }
+        if state.poll is not None:
+            data["poll"] = _dump_poll(state.poll)
+        if state.feed_digest is not None:
+            data["feed_digest"] = state.feed_digest
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, json.dumps(data, indent=1, sort_keys=True).encode("utf-8"))
+        except OSError as e:
+            raise FileWriteError(f"Unable to write state file {self.path}") from e
+
+
+def _load_poll(data: dict) -> PollState:
+    """Create the poll state from its JSON form."""
+    changed = data.get("changed")
+    return PollState(
+        since=datetime.fromisoformat(data["since"]),
+        checked=datetime.fromisoformat(data["checked"]),
+        digest=str(data["digest"]),
+        changed=None if changed is None else datetime.fromisoformat(changed),
+        checks=int(data["checks"]),
+        changes=int(data["changes"]),
+        unchanged=int(data["unchanged"]),
+    )
+
+
+def _dump_poll(poll: PollState) -> dict:
+    """Convert the poll state to its JSON form."""
+    return {
+        "since": poll.since.isoformat(),
+        "checked": poll.checked.isoformat(),
+        "digest": poll.digest,
+        "changed": None if poll.changed is None else poll.changed.isoformat(),
+        "checks": poll.checks,
+        "changes": poll.changes,
+        "unchanged": poll.unchanged,
+    }
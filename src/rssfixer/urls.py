@@ -0,0 +1,119 @@
+"""Canonical entry URLs.
+
+The same post is often linked with tracking parameters, with a fragment, or
+relative to the page, so comparing the raw links finds duplicates too late or
+not at all. Every entry URL is brought to one canonical form before it is
+compared: resolved against the base URL as in RFC 3986, with the scheme and
+host in lowercase, without the default port, without tracking parameters and
+without a fragment unless it points into the base document itself.
+
+Pages link the same URLs over and over, so the normalizer is memoized.
+"""
+
+import functools
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+
+# Number of URLs whose canonical form is kept
+CANONICAL_CACHE_SIZE = 4096
+
+# Query parameters that only tell where a visitor came from
+TRACKING_PARAMETERS = frozenset(
+    {
+        "_hsenc",
+        "_hsmi",
+        "dclid",
+        "fbclid",
+        "gbraid",
+        "gclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "mkt_tok",
+        "msclkid",
+        "wbraid",
+        "yclid",
+    },
+)
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+@functools.lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize(url: str, base: str | None = None) -> str:
+    """Bring a URL to its canonical form.
+
+    Without a base, relative URLs stay relative and only lose their tracking
+    parameters, so they can be resolved later against the base of the feed.
+
+    Args:
+        url: URL as found on the page
+        base: URL to resolve relative URLs against, None to leave them relative
+
+    Returns:
+        Canonical URL, empty if the URL is empty
+
+    """
+    url = url.strip()
+    if not url:
+        return url
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    query = "&".join(parameter for parameter in parts.query.split("&") if not is_tracking(parameter))
+    fragment = parts.fragment if _same_document(url, base) else ""
+    return urlunsplit((scheme, _netloc(parts.netloc, scheme), parts.path, query, fragment))
+
+
+def is_tracking(parameter: str) -> bool:
+    """Check if a query parameter is only used for tracking.
+
+    Args:
+        parameter: Query parameter like ``utm_source=feed``
+
+    Returns:
+        True if the parameter can be removed from a URL
+
+    """
+    name = parameter.partition("=")[0].lower()
+    return name in TRACKING_PARAMETERS or name.startswith(TRACKING_PREFIXES)
+
+
+def base_href(soup: BeautifulSoup, url: str) -> str | None:
+    """Find the base URL that a page sets with a <base href> element.
+
+    Args:
+        soup: Parsed page
+        url: URL of the page, to resolve a relative base against
+
+    Returns:
+        Absolute base URL, None if the page doesn't set one
+
+    """
+    base = (soup.head or soup).find("base", href=True)
+    if base is None or not base["href"].strip():
+        return None
+    return urljoin(url, base["href"].strip())
+
+
+def _netloc(netloc: str, scheme: str) -> str:
+    """Lowercase the host and remove the default port of the scheme."""
+    userinfo, at, hostport = netloc.rpartition("@")
+    host, colon, port = hostport.rpartition(":")
+    # No port, or the colon is part of an IPv6 address
+    if not colon or "]" in port:
+        host, port = hostport, ""
+    if port == DEFAULT_PORTS.get(scheme):
+        port = ""
+    return f"{userinfo}{at}{host.lower()}{':' if port else ''}{port}"
+
+
+def _same_document(url: str, base: str | None) -> bool:
+    """Check if a URL points into the base document, so its fragment is kept."""
+    if base:
+        return urldefrag(url)[0] == urldefrag(base)[0]
+    # A relative reference that is only a fragment
+    return url.startswith("#")
@@ -1,60 +1,380 @@
 """Utility functions for RSS fixer."""
 
+import mmap
+import os
 import re
+import secrets
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
+import urllib3
+from bs4 import BeautifulSoup, Tag
 
-from .exceptions import FileWriteError, HTMLParsingError, NetworkError
+from .budgets import Deadline, NodeBudget, check_size
+from .exceptions import FileReadError, FileWriteError, HTMLParsingError, NetworkError
+from .models import FORMAT_NAMES, FeedConfig
 
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
 
-def fetch_html(url: str, headers: dict[str, str], timeout: int = 10) -> str:
+# Size of the chunks a response body is read in
+FETCH_CHUNK_SIZE = 64 * 1024
+
+
+def fetch_html(
+    url: str,
+    headers: dict[str, str],
+    timeout: int = 10,
+    session: requests.Session | None = None,
+    deadline: Deadline | None = None,
+) -> str:
     """Fetch HTML content from a URL.
 
     Args:
         url: URL to fetch
         headers: HTTP headers to send
         timeout: Request timeout in seconds
+        session: Optional session to reuse connections
+        deadline: Optional deadline for the whole download
 
     Returns:
         HTML content as string
 
     Raises:
         NetworkError: If request fails
+        DeadlineExceededError: If the deadline passes before the download is done
+
+    """
+    return fetch_response(url, headers, timeout, session, deadline).text
+
+
+def fetch_content(
+    url: str,
+    headers: dict[str, str],
+    timeout: int = 10,
+    session: requests.Session | None = None,
+    deadline: Deadline | None = None,
+) -> bytes:
+    """Fetch the raw response body from a URL.
+
+    The body is left undecoded so it can be handed to a parser in another process
+    without a round trip through str.
+
+    Args:
+        url: URL to fetch
+        headers: HTTP headers to send
+        timeout: Request timeout in seconds
+        session: Optional session to reuse connections
+        deadline: Optional deadline for the whole download
+
+    Returns:
+        Response body as bytes
+
+    Raises:
+        NetworkError: If request fails
+        DeadlineExceededError: If the deadline passes before the download is done
+
+    """
+    return fetch_response(url, headers, timeout, session, deadline).content
+
+
+def fetch_response(  # noqa: PLR0913, PLR0917
+    url: str,
+    headers: dict[str, str],
+    timeout: int = 10,
+    session: requests.Session | None = None,
+    deadline: Deadline | None = None,
+    max_bytes: int | None = None,
+) -> requests.Response:
+    """Perform a GET request and translate failures to NetworkError.
+
+    The body is read with _iter_body, so a server sending it slowly is stopped
+    by the deadline and a body larger than max_bytes is not downloaded.
+
+    Args:
+        url: URL to fetch
+        headers: HTTP headers to send
+        timeout: Request timeout in seconds
+        session: Optional session to reuse connections
+        deadline: Optional deadline for the whole download
+        max_bytes: Maximum size of the body, None for no limit
+
+    Returns:
+        Successful response with the body loaded
+
+    Raises:
+        NetworkError: If request fails
+        DeadlineExceededError: If the deadline passes before the download is done
+        BudgetExceededError: If the body is larger than max_bytes
+
+    """
+    if deadline is not None:
+        timeout = deadline.timeout(timeout, "fetch")
+    try:
+        with (session or requests).get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in _iter_body(response, timeout, deadline, max_bytes):
+                body += chunk
+            # Lets .content and .text use the body read above
+            response._content = bytes(body)
+        return response
+    except requests.exceptions.RequestException as e:
+        raise _network_error(url, e, deadline) from e
+
+
+def stream_content(  # noqa: PLR0913, PLR0917
+    url: str,
+    headers: dict[str, str],
+    timeout: int = 10,
+    session: requests.Session | None = None,
+    deadline: Deadline | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[bytes]:
+    """Fetch the raw response body from a URL as a stream of chunks.
+
+    Only one chunk is held at a time, so bodies of any size can be processed
+    while they are downloaded.
+
+    Args:
+        url: URL to fetch
+        headers: HTTP headers to send
+        timeout: Request timeout in seconds
+        session: Optional session to reuse connections
+        deadline: Optional deadline for the whole download
+        max_bytes: Maximum size of the body, None for no limit
+
+    Yields:
+        Chunks of the response body
+
+    Raises:
+        NetworkError: If request fails
+        DeadlineExceededError: If the deadline passes before the download is done
+        BudgetExceededError: If the body is larger than max_bytes
 
     """
+    if deadline is not None:
+        timeout = deadline.timeout(timeout, "fetch")
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return response.text
-    except requests.exceptions.Timeout as e:
-        raise NetworkError(f"Request timed out for {url}") from e
-    except requests.exceptions.ConnectionError as e:
-        raise NetworkError(f"Unable to connect to {url}") from e
+        with (session or requests).get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            yield from _iter_body(response, timeout, deadline, max_bytes)
     except requests.exceptions.RequestException as e:
-        raise NetworkError(f"Request failed for {url}: {e}") from e
+        raise _network_error(url, e, deadline) from e
+
+
+def _iter_body(
+    response: requests.Response,
+    timeout: float,
+    deadline: Deadline | None,
+    max_bytes: int | None = None,
+) -> Iterator[bytes]:
+    """Read the body of a streamed response in chunks, stopping at the deadline or the size limit.
+
+    A Content-Length larger than max_bytes fails before anything is read, and
+    the bytes received are counted so that a body without a length is stopped
+    as soon as it passes the limit.
+
+    Args:
+        response: Response opened with stream=True
+        timeout: Longest wait for data in seconds
+        deadline: Optional deadline for the whole download
+        max_bytes: Maximum size of the body, None for no limit
+
+    Yields:
+        Chunks of the decoded body, at most FETCH_CHUNK_SIZE bytes each
+
+    Raises:
+        requests.exceptions.RequestException: If reading the body fails
+        DeadlineExceededError: If the deadline passes before the download is done
+        BudgetExceededError: If the body is larger than max_bytes
+
+    """
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit():
+        check_size(int(length), max_bytes)
+    size = 0
+    for chunk in _read_chunks(response, timeout, deadline):
+        size += len(chunk)
+        check_size(size, max_bytes)
+        yield chunk
+
+
+def _read_chunks(response: requests.Response, timeout: float, deadline: Deadline | None) -> Iterator[bytes]:
+    """Read the body of a streamed response in chunks, stopping at the deadline.
 
+    Every byte received resets a socket timeout, and a full chunk can take
+    forever from a server that sends a byte at a time. With a deadline, every
+    read therefore returns as soon as some data has arrived, and the socket
+    timeout is set to the time left before each read, so no read blocks past
+    the deadline.
+
+    Without a deadline that expires, or when the body has already been read,
+    for example by the adapter that records fixtures, the body is read with
+    iter_content as usual.
+
+    Args:
+        response: Response opened with stream=True
+        timeout: Longest wait for data in seconds
+        deadline: Optional deadline for the whole download
+
+    Yields:
+        Chunks of the decoded body, at most FETCH_CHUNK_SIZE bytes each
+
+    Raises:
+        requests.exceptions.RequestException: If reading the body fails
+        DeadlineExceededError: If the deadline passes before the download is done
+
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if deadline is None or deadline.expires is None or read1 is None or response._content_consumed:
+        for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+            if deadline is not None:
+                deadline.check("fetch")
+            yield chunk
+        return
+
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    try:
+        while True:
+            if sock is not None:
+                sock.settimeout(deadline.timeout(timeout, "fetch"))
+            chunk = read1(FETCH_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            deadline.check("fetch")
+            yield chunk
+    # Translated like requests does for iter_content
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+    except urllib3.exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+
+
+def _network_error(url: str, error: requests.exceptions.RequestException, deadline: Deadline | None) -> NetworkError:
+    """Translate a failed request to NetworkError.
+
+    Args:
+        url: URL that was fetched
+        error: Exception raised by requests
+        deadline: Optional deadline for the download
+
+    Returns:
+        NetworkError describing the failure
+
+    Raises:
+        DeadlineExceededError: If the failure is a timeout caused by the deadline
+
+    """
+    # A timeout caused by the shortened timeout is reported as the deadline
+    if deadline is not None:
+        deadline.check("fetch")
+    if isinstance(error, requests.exceptions.Timeout):
+        return NetworkError(f"Request timed out for {url}")
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return NetworkError(f"Unable to connect to {url}")
+    return NetworkError(f"Request failed for {url}: {error}")
 
-def filter_html(soup: BeautifulSoup, filter_type: str, filter_name: str | None) -> BeautifulSoup:
+
+@contextmanager
+def open_input(path: str, max_bytes: int | None = None) -> Iterator[bytes | mmap.mmap]:
+    """Open a local file, or stdin for "-", as page content.
+
+    Large files are memory-mapped. The mapping is bytes-like and can be given
+    to BeautifulSoup directly, which reads it once without an intermediate
+    buffer. The mapping is only valid inside the with block.
+
+    Args:
+        path: Path to the file or "-" for stdin
+        max_bytes: Maximum size of the content, None for no limit
+
+    Yields:
+        File content as bytes or a read-only memory map
+
+    Raises:
+        FileReadError: If the file can't be read
+        BudgetExceededError: If the content is larger than max_bytes
+
+    """
+    if path == "-":
+        # Read one byte more than allowed to notice larger input without reading all of it
+        content = sys.stdin.buffer.read(-1 if max_bytes is None else max_bytes + 1)
+        check_size(len(content), max_bytes)
+        yield content
+        return
+
+    try:
+        f = Path(path).open("rb")
+    except OSError as e:
+        raise FileReadError(f"Unable to read input file {path}") from e
+
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        check_size(size, max_bytes)
+        if size < MMAP_THRESHOLD:
+            yield f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+
+def parse_html(
+    content: str | bytes | mmap.mmap,
+    filter_type: str | None = None,
+    filter_name: str | None = None,
+    max_nodes: int | None = None,
+) -> BeautifulSoup:
+    """Parse HTML content and apply the optional page filter.
+
+    Args:
+        content: HTML content as string, bytes or memory map
+        filter_type: HTML element type to filter by (optional)
+        filter_name: Element name/class to filter by (optional)
+        max_nodes: Maximum number of elements the filter visits, None for no limit
+
+    Returns:
+        Parsed (and possibly filtered) BeautifulSoup object
+
+    Raises:
+        HTMLParsingError: If the filter matches nothing
+        BudgetExceededError: If the filter visits more than max_nodes elements
+
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    if filter_type and filter_name:
+        soup = filter_html(soup, filter_type, filter_name, max_nodes)
+    return soup
+
+
+def filter_html(
+    soup: BeautifulSoup,
+    filter_type: str,
+    filter_name: str | None,
+    max_nodes: int | None = None,
+) -> BeautifulSoup:
     """Filter web page content by HTML element type and name.
 
     Args:
         soup: Parsed HTML content
         filter_type: HTML element type to filter by
         filter_name: Element name/class to filter by (optional)
+        max_nodes: Maximum number of elements to visit, None for no limit
 
     Returns:
         Filtered BeautifulSoup object
 
     Raises:
         HTMLParsingError: If no entries found
+        BudgetExceededError: If more than max_nodes elements are visited
 
     """
-    if filter_name is None:
-        filtered_elements = soup.find_all(filter_type)
-    else:
-        filtered_elements = soup.find_all(filter_type, filter_name)
+    budget = NodeBudget("DOM nodes", max_nodes)
+    filtered_elements = list(iter_elements(soup, filter_type, filter_name, budget))
 
     if not filtered_elements:
         raise HTMLParsingError(f"No entries found for filter {filter_type}:{filter_name}")
@@ -62,6 +382,65 @@ def filter_html(soup: BeautifulSoup, filter_type: str, filter_name: str | None)
     return BeautifulSoup(str(filtered_elements), "html.parser")
 
 
+def iter_elements(
+    element,
+    name: str | None,
+    class_name: str | None = None,
+    budget: NodeBudget | None = None,
+) -> Iterator[Tag]:
+    """Lazily find elements by tag name and class.
+
+    Matches the same elements as element.find_all(name, class_name) but yields
+    them while walking the tree, so callers that stop early don't pay for a
+    walk of the whole document.
+
+    Args:
+        element: BeautifulSoup element to search within
+        name: Tag name to match, or None for all tags
+        class_name: Optional class to match, either one of the classes or the whole class attribute
+        budget: Optional budget that every visited node is counted against
+
+    Yields:
+        Matching elements in document order
+
+    Raises:
+        BudgetExceededError: If the walk exceeds the budget
+
+    """
+    # Visited nodes are counted against the budget in one call per match
+    visited = counted = 0
+    for visited, node in enumerate(element.descendants, 1):
+        if not isinstance(node, Tag) or (name is not None and node.name != name):
+            continue
+        if class_name and not has_class(node, class_name):
+            continue
+        if budget is not None:
+            budget.visit(visited - counted)
+            counted = visited
+        yield node
+    if budget is not None:
+        budget.visit(visited - counted)
+
+
+def has_class(element: Tag, class_name: str) -> bool:
+    """Check if an element has a class, or exactly the given class attribute.
+
+    Args:
+        element: BeautifulSoup element
+        class_name: Class to look for
+
+    Returns:
+        True if the element matches
+
+    """
+    classes = element.get("class")
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return classes == class_name
+    return class_name in classes or " ".join(classes) == class_name
+
+
 def safe_find_text(element, selector: str, class_name: str | None = None, default: str = "") -> str:
     """Safely extract text from HTML element.
 
@@ -85,11 +464,14 @@ def safe_find_text(element, selector: str, class_name: str | None = None, defaul
         return default
 
 
-def save_rss_feed(rss_feed: str, output_path: str, is_atom: bool = False, quiet: bool = False) -> None:
+def save_rss_feed(rss_feed: str | bytes, output_path: str, is_atom: bool = False, quiet: bool = False) -> None:
     """Save the RSS feed to a file.
 
+    The file is replaced atomically, so a failed or interrupted run leaves
+    the previous feed in place.
+
     Args:
-        rss_feed: RSS feed content as string
+        rss_feed: RSS feed content as string or UTF-8 encoded bytes
         output_path: Path to save the file
         is_atom: Whether this is an Atom feed (for messaging)
         quiet: Whether to suppress output messages
@@ -97,13 +479,73 @@ def save_rss_feed(rss_feed: str, output_path: str, is_atom: bool = False, quiet:
     Raises:
         FileWriteError: If file writing fails
 
+    """
+    save_feed(rss_feed, output_path, "atom" if is_atom else "rss", quiet)
+
+
+def save_feed(feed: str | bytes, output_path: str, feed_format: str = "rss", quiet: bool = False) -> None:
+    """Save a feed in any output format to a file.
+
+    The file is replaced atomically, so a failed or interrupted run leaves
+    the previous feed in place.
+
+    Args:
+        feed: Feed content as string or UTF-8 encoded bytes
+        output_path: Path to save the file
+        feed_format: Output format of the feed, one of FEED_FORMATS (for messaging)
+        quiet: Whether to suppress output messages
+
+    Raises:
+        FileWriteError: If file writing fails
+
     """
     try:
-        with Path(output_path).open("w", encoding="utf-8") as f:
-            f.write(rss_feed)
+        write_atomic(output_path, feed if isinstance(feed, bytes) else feed.encode("utf-8"))
     except OSError as e:
         raise FileWriteError(f"Unable to write to file {output_path}") from e
 
     if not quiet:
-        feed_type = "Atom" if is_atom else "RSS"
-        print(f"{feed_type} feed created: {output_path}")
+        print(f"{FORMAT_NAMES[feed_format]} feed created: {output_path}")
+
+
+def save_feeds(feeds: dict[str, bytes], config: FeedConfig, quiet: bool = False) -> None:
+    """Save the rendered feed of every output format to its output file.
+
+    Args:
+        feeds: Rendered feed for each format, from render_feeds
+        config: Feed configuration with the output files
+        quiet: Whether to suppress output messages
+
+    Raises:
+        FileWriteError: If file writing fails
+
+    """
+    for name, path in config.outputs():
+        save_feed(feeds[name], path, name, quiet)
+
+
+def write_atomic(path: str | Path, data: bytes) -> None:
+    """Write a file so that readers see either the old or the new content.
+
+    The data is written to a temporary file in the same directory which then
+    replaces the target. The temporary file is created with the permissions
+    a new file would get, since feeds are often read by a web server.
+
+    Args:
+        path: Path to write
+        data: File content
+
+    Raises:
+        OSError: If the file can't be written
+
+    """
+    path = Path(path)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}")
+    fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
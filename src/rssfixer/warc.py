@@ -0,0 +1,234 @@
+"""Generate feeds from responses stored in a WARC archive.
+
+The archive is read once as a stream. Only response records for configured
+feed URLs are kept in memory, everything else is skipped, so memory use does
+not depend on the size of the archive. Matching pages are parsed in the same
+process pool as the batch command. Feeds whose extractor fetches more pages,
+like a sitemap index, are extracted on a thread as in the batch command, and
+those pages are fetched within the deadline of the feed.
+"""
+
+import gzip
+import os
+import zlib
+from collections.abc import Collection, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import BinaryIO
+
+import requests
+
+from .batch import BatchOptions, create_process_pool, extract_entries, fetch_entries, fetches_pages, write_feed
+from .exceptions import WARCParsingError
+from .models import FeedConfig
+
+GZIP_MAGIC = b"\x1f\x8b"
+SKIP_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class WarcResponse:
+    """An HTTP response stored in a WARC file."""
+
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+def iter_responses(path: str, urls: Collection[str] | None = None) -> Iterator[WarcResponse]:
+    """Stream HTTP responses from a WARC file.
+
+    Both plain and gzip compressed (per record or whole file) archives are
+    supported. Chunked transfer encoding and gzip or deflate content
+    encoding are removed from the body.
+
+    Args:
+        path: Path to the WARC file
+        urls: Only return responses for these target URLs, all if None
+
+    Yields:
+        Responses in archive order
+
+    Raises:
+        WARCParsingError: If the file is not a valid WARC file
+
+    """
+    try:
+        with Path(path).open("rb") as raw:
+            magic = raw.read(2)
+            raw.seek(0)
+            stream: BinaryIO = gzip.GzipFile(fileobj=raw) if magic == GZIP_MAGIC else raw
+            yield from _iter_records(stream, urls)
+    except (OSError, EOFError, zlib.error) as e:
+        raise WARCParsingError(f"Unable to read WARC file {path}: {e}") from e
+
+
+def _iter_records(stream: BinaryIO, urls: Collection[str] | None) -> Iterator[WarcResponse]:
+    """Read records from an uncompressed WARC stream."""
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue
+        if not line.startswith(b"WARC/"):
+            raise WARCParsingError(f"Expected WARC record header, found {line[:40]!r}")
+
+        headers = _read_headers(stream)
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError) as e:
+            raise WARCParsingError("WARC record without valid Content-Length") from e
+
+        url = headers.get("warc-target-uri", "").strip("<>")
+        if headers.get("warc-type") != "response" or (urls is not None and url not in urls):
+            _skip(stream, length)
+            continue
+
+        block = stream.read(length)
+        if len(block) != length:
+            raise WARCParsingError(f"Truncated WARC record for {url}")
+        response = _parse_http_response(url, block)
+        if response:
+            yield response
+
+
+def _read_headers(stream: BinaryIO) -> dict[str, str]:
+    """Read header lines up to an empty line, with lower case names."""
+    headers = {}
+    for line in iter(stream.readline, b""):
+        if not line.strip():
+            break
+        name, _, value = line.decode("utf-8", "replace").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _skip(stream: BinaryIO, length: int) -> None:
+    """Skip a record block without keeping it in memory."""
+    while length > 0:
+        chunk = stream.read(min(length, SKIP_CHUNK_SIZE))
+        if not chunk:
+            raise WARCParsingError("Truncated WARC record")
+        length -= len(chunk)
+
+
+def _parse_http_response(url: str, block: bytes) -> WarcResponse | None:
+    """Split an HTTP response block into status, headers and decoded body.
+
+    Args:
+        url: Target URL of the record
+        block: Record block with the raw HTTP response
+
+    Returns:
+        Response, or None if the block is not an HTTP response
+
+    """
+    head, separator, body = block.partition(b"\r\n\r\n")
+    if not separator:
+        head, separator, body = block.partition(b"\n\n")
+    lines = head.decode("iso-8859-1").splitlines()
+    if not lines or not lines[0].startswith("HTTP/"):
+        return None
+    try:
+        status = int(lines[0].split()[1])
+    except (IndexError, ValueError):
+        return None
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = _dechunk(body)
+    encoding = headers.get("content-encoding", "").lower()
+    try:
+        if encoding in {"gzip", "x-gzip"}:
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+    except (OSError, EOFError, zlib.error) as e:
+        raise WARCParsingError(f"Unable to decode {encoding} body for {url}") from e
+
+    return WarcResponse(url=url, status=status, headers=headers, body=body)
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Remove chunked transfer encoding."""
+    chunks = []
+    position = 0
+    while position < len(body):
+        line_end = body.find(b"\r\n", position)
+        if line_end == -1:
+            break
+        try:
+            size = int(body[position:line_end].split(b";")[0], 16)
+        except ValueError as e:
+            raise WARCParsingError("Invalid chunked transfer encoding") from e
+        if size == 0:
+            break
+        start = line_end + 2
+        chunks.append(body[start : start + size])
+        position = start + size + 2
+    return b"".join(chunks)
+
+
+def run_warc(path: str, feeds: list[FeedConfig], options: BatchOptions | None = None) -> int:
+    """Generate feeds from the responses in a WARC file.
+
+    The first successful response for each feed URL is used. At most two
+    pages per worker are kept in memory while waiting to be parsed.
+
+    Args:
+        path: Path to the WARC file
+        feeds: Configuration for each feed
+        options: Pool size and output options
+
+    Returns:
+        0 if all feeds were generated, 1 if any feed failed or was not found
+
+    """
+    options = options or BatchOptions()
+    wanted: dict[str, list[FeedConfig]] = {}
+    for config in feeds:
+        for url in {config.url, requests.Request("GET", config.url).prepare().url}:
+            wanted.setdefault(url, []).append(config)
+
+    failures = 0
+    found: set[int] = set()
+    max_pending = 2 * (options.workers or os.cpu_count() or 1)
+    with (
+        create_process_pool(options) as parsers,
+        ThreadPoolExecutor(max_workers=options.fetch_threads) as fetchers,
+    ):
+        pending: dict[Future, FeedConfig] = {}
+
+        for response in iter_responses(path, wanted):
+            if not HTTPStatus.OK <= response.status < HTTPStatus.MULTIPLE_CHOICES:
+                continue
+            for config in wanted[response.url]:
+                if id(config) in found:
+                    continue
+                found.add(id(config))
+                if fetches_pages(config):
+                    pending[fetchers.submit(fetch_entries, config, None, response.body)] = config
+                else:
+                    pending[parsers.submit(extract_entries, response.body, config)] = config
+
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                failures += sum(not write_feed(future, pending.pop(future), options) for future in done)
+
+        for future in list(pending):
+            failures += not write_feed(future, pending.pop(future), options)
+
+    for config in feeds:
+        if id(config) not in found:
+            print(f"ERROR: {config.url}: no response found in {path}")
+            failures += 1
+
+    return 1 if failures else 0
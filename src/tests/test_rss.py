@@ -138,37 +138,37 @@ def test_fetch_html_no_url(requests_mock):
 
 
 def test_find_json_entries(example_json_object):
-    """Test JsonExtractor._find_entries_recursive() with match."""
+    """Test JsonExtractor._search_entries() with match."""
 
     class MockArgs:
         json_entries = "home"
 
     extractor = JsonExtractor(MockArgs())
     # The method only returns values that are lists, not dicts
-    result = extractor._find_entries_recursive(example_json_object, "home")
+    result = extractor._search_entries(example_json_object, "home")
     assert result is None  # "home" contains a dict, not a list
 
 
 def test_find_json_entries_not_found(example_json_object):
-    """Test JsonExtractor._find_entries_recursive() when the entry is not found."""
+    """Test JsonExtractor._search_entries() when the entry is not found."""
 
     class MockArgs:
         json_entries = "xyzzy"
 
     extractor = JsonExtractor(MockArgs())
-    result = extractor._find_entries_recursive(example_json_object, "xyzzy")
+    result = extractor._search_entries(example_json_object, "xyzzy")
     assert result is None
 
 
 @pytest.mark.parametrize("json_object,entries_key,expected", test_cases)
 def test_find_entries(json_object, entries_key, expected):
-    """Test JsonExtractor._find_entries_recursive when correct."""
+    """Test JsonExtractor._search_entries when correct."""
 
     class MockArgs:
         pass
 
     extractor = JsonExtractor(MockArgs())
-    result = extractor._find_entries_recursive(json_object, entries_key)
+    result = extractor._search_entries(json_object, entries_key)
     assert result == expected
 
 
@@ -194,6 +194,39 @@ def test_extract_links_ul_simple(example_html_string):
     assert links[2].title == "Example 3"
 
 
+def test_extract_links_ul_exclude(example_html_string):
+    """Test ListExtractor.extract_links() with --list-exclude patterns."""
+    soup = BeautifulSoup(example_html_string, "html.parser")
+    arguments = rss.parse_arguments(
+        ["--list", "--list-exclude", "example.com/1", "--list-exclude", "/3", "https://example.com"],
+    )
+    links = ListExtractor(arguments).extract_links(soup)
+    assert [link.url for link in links] == ["https://example.com/2"]
+
+
+def test_extract_links_ul_nested():
+    """Test ListExtractor.extract_links() with nested lists - each link once in document order."""
+    html = """
+    <ul class="menu"><li><a href="/skip">Skip</a></li></ul>
+    <ul>
+        <li><a href="/1">One</a>
+            <ul class="sub">
+                <li><a href="/2">Two</a></li>
+                <li><a href="/category/x">Category</a></li>
+            </ul>
+        </li>
+        <li><span>No link</span></li>
+        <li><a href="/3">Three</a></li>
+    </ul>
+    """
+
+    class MockArgs:
+        pass
+
+    links = ListExtractor(MockArgs()).extract_links(BeautifulSoup(html, "html.parser"))
+    assert [link.url for link in links] == ["/1", "/2", "/3"]
+
+
 def test_extract_links_ul_simple_no_match(example_html_string_no_match):
     """Test ListExtractor.extract_links() without match."""
 
@@ -288,6 +321,51 @@ def test_extract_links_html_no_match_description():
     assert links == correct_links
 
 
+def test_extract_links_html_max_entries():
+    """Test HtmlExtractor.extract_links() with --max-entries stops after N entries."""
+    max_entries = 3
+    with open("src/tests/data/input/tripwire.html", encoding="utf-8") as f:
+        content = f.read()
+    soup = BeautifulSoup(content, "html.parser")
+    arguments = rss.parse_arguments(
+        ["--html", "--max-entries", str(max_entries), "http://www.tripwire.com/state-of-security"],
+    )
+    extractor = HtmlExtractor(arguments)
+    entries_read = 0
+    find_fields = extractor._find_fields
+
+    def counting_find_fields(entry, context):
+        nonlocal entries_read
+        entries_read += 1
+        return find_fields(entry, context)
+
+    extractor._find_fields = counting_find_fields
+    links = extractor.extract_links(soup)
+    with open("src/tests/data/output/tripwire", "rb") as f:
+        correct_links = pickle.load(f)
+    assert links == correct_links[:max_entries]
+    assert entries_read == max_entries
+
+
+def test_stream_links_no_match(example_html_string_no_match):
+    """Test ListExtractor.stream_links() raises before the stream is consumed."""
+
+    class MockArgs:
+        pass
+
+    soup = BeautifulSoup(example_html_string_no_match, "html.parser")
+    with pytest.raises(NoLinksFoundError):
+        ListExtractor(MockArgs()).stream_links(soup)
+
+
+def test_stream_links_json_no_json(example_html_string):
+    """Test JsonExtractor.stream_links() without JSON - should fail right away."""
+    soup = BeautifulSoup(example_html_string, "html.parser")
+    arguments = rss.parse_arguments(["--json", "https://www.truesec.com/hub/blog"])
+    with pytest.raises(JSONParsingError):
+        JsonExtractor(arguments).stream_links(soup)
+
+
 def test_extract_links_json():
     """Test JsonExtractor.extract_links() working."""
     with open("src/tests/data/input/truesec.html", encoding="utf-8") as f:
@@ -0,0 +1,121 @@
+"""Test aggregate feeds built from several sources."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+from rssfixer import rss
+from rssfixer.aggregate import AggregateOptions, merge_entries, run_aggregate
+from rssfixer.batch import BatchOptions, load_feeds
+from rssfixer.models import LinkEntry
+from rssfixer.state import FeedState, FeedStateStore
+
+URL = "https://example.com/advisories"
+DAY = datetime(2023, 4, 17, tzinfo=UTC)
+
+LIST_PAGE = """<ul>
+<li><a href="/one">Vendor one advisory</a></li>
+<li><a href="https://b.example.com/shared">Shared advisory</a></li>
+</ul>"""
+
+HTML_PAGE = """
+<article><a href="/two"><h3 class="title">Vendor two advisory</h3></a><time>2023-04-18</time></article>
+<article><a href="/shared"><h3 class="title">Shared advisory</h3></a><time>2023-04-16</time></article>
+"""
+
+SOURCES_TOML = """
+[[feed]]
+url = "https://a.example.com/"
+list = true
+base-url = "https://a.example.com"
+
+[[feed]]
+url = "https://b.example.com/"
+html = true
+html-date = "time"
+base-url = "https://b.example.com"
+"""
+
+DATED_SOURCE_TOML = """
+[[feed]]
+url = "https://b.example.com/"
+html = true
+html-date = "time"
+"""
+
+
+def entry(url: str, days: int | None) -> LinkEntry:
+    """Create an entry published the given number of days after DAY."""
+    return LinkEntry(url=url, title=url, published=None if days is None else DAY + timedelta(days=days))
+
+
+def published(link: LinkEntry) -> datetime:
+    """Order by publication date."""
+    return link.published
+
+
+def test_merge_entries():
+    """Test sources are merged newest first, without duplicates and up to the limit."""
+    streams = [
+        [entry("a1", 1), entry("a3", 3), entry("shared", 0)],
+        iter([entry("b2", 2), entry("shared", 4)]),
+        [],
+    ]
+    merged = merge_entries(streams, published, 4)
+    assert [link.url for link in merged] == ["shared", "a3", "b2", "a1"]
+
+
+def test_run_aggregate(tmp_path, requests_mock):
+    """Test the sources are merged into one feed and first seen times are kept."""
+    requests_mock.get("https://a.example.com/", text=LIST_PAGE)
+    requests_mock.get("https://b.example.com/", text=HTML_PAGE)
+    sources_file = tmp_path / "sources.toml"
+    sources_file.write_text(SOURCES_TOML, encoding="utf-8")
+    output = tmp_path / "all.xml"
+
+    store = FeedStateStore.for_output(str(output))
+    earlier = DAY + timedelta(days=10)
+    store.save(FeedState(first_seen={"https://a.example.com/one": earlier, "https://gone.example.com/": earlier}))
+
+    options = AggregateOptions(url=URL, output=str(output), title="Advisories", max_entries=3)
+    batch = BatchOptions(workers=1, quiet=True)
+    sources = load_feeds(str(sources_file))
+    assert run_aggregate(sources, options, batch) == 0
+
+    # The shared entry is only taken once
+    feed = output.read_text(encoding="utf-8")
+    assert feed.count("<item>") == options.max_entries
+    for url in ("https://b.example.com/shared", "https://a.example.com/one", "https://b.example.com/two"):
+        assert f"<link>{url}</link>" in feed
+
+    state = json.loads(store.path.read_text(encoding="utf-8"))
+    assert store.path.name == ".all.xml.state.json"
+    assert state["first_seen"]["https://a.example.com/one"] == earlier.isoformat()
+    assert "https://gone.example.com/" not in state["first_seen"]
+
+
+def test_run_aggregate_newest_per_source(tmp_path, requests_mock):
+    """Test the newest entries of a source are used, wherever they are on the page."""
+    requests_mock.get("https://b.example.com/", text="\n".join(reversed(HTML_PAGE.strip().splitlines())))
+    sources_file = tmp_path / "sources.toml"
+    sources_file.write_text(DATED_SOURCE_TOML, encoding="utf-8")
+    output = tmp_path / "all.xml"
+
+    # Vendor two advisory is the newest dated entry, and the last on its page
+    options = AggregateOptions(url=URL, output=str(output), max_entries=1)
+    assert run_aggregate(load_feeds(str(sources_file)), options, BatchOptions(workers=1, quiet=True)) == 0
+    assert "<link>https://b.example.com/two</link>" in output.read_text(encoding="utf-8")
+
+
+def test_main_aggregate_failed_source(tmp_path, requests_mock, capsys):
+    """Test a failed source is reported and the others are still used."""
+    requests_mock.get("https://a.example.com/", text=LIST_PAGE)
+    requests_mock.get("https://b.example.com/", status_code=500)
+    sources_file = tmp_path / "sources.toml"
+    sources_file.write_text(SOURCES_TOML, encoding="utf-8")
+    output = tmp_path / "all.xml"
+
+    arguments = ["aggregate", str(sources_file), "--url", URL, "--output", str(output), "--workers", "1", "-q"]
+    assert rss.main([*arguments, "--state-dir", str(tmp_path / "state")]) == 1
+    assert "ERROR: https://b.example.com/" in capsys.readouterr().out
+    assert "https://a.example.com/one" in output.read_text(encoding="utf-8")
+    assert (tmp_path / "state" / "all.xml.state.json").exists()
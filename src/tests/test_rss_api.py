@@ -0,0 +1,104 @@
+"""Test the Python API."""
+
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.cli import get_extractor
+from rssfixer.exceptions import NoLinksFoundError
+from rssfixer.explain import ExplainReport
+from rssfixer.extractors.html import HtmlExtractor
+
+
+def test_feed_config_defaults_match_arguments():
+    """Test FeedConfig defaults are the same as the command line defaults."""
+    for mode in ("list", "html", "json"):
+        arguments = rss.parse_arguments([f"--{mode}", "https://example.com"])
+        assert FeedConfig.from_arguments(arguments) == FeedConfig(url="https://example.com", mode=mode)
+
+
+def test_feed_config_invalid_mode():
+    """Test FeedConfig with an unknown mode - should fail."""
+    with pytest.raises(ValueError):
+        FeedConfig(url="https://example.com", mode="xml")
+
+
+def test_extractor_with_config():
+    """Test HtmlExtractor with a FeedConfig instead of arguments."""
+    with open("src/tests/data/input/tripwire.html", encoding="utf-8") as f:
+        content = f.read()
+    with open("src/tests/data/output/tripwire", "rb") as f:
+        correct_links = pickle.load(f)
+    config = FeedConfig(url="http://www.tripwire.com/state-of-security", mode="html")
+    result = generate_feed(config, html=content)
+    assert result.entries == correct_links
+    assert HtmlExtractor(config).config is config
+
+
+def test_generate_feed_html():
+    """Test generate_feed() with pre-fetched content gives the same feed as the command line."""
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        content = f.read()
+    with open("src/tests/data/output/nccgroup.xml", encoding="utf-8") as f:
+        correct_rss_feed = f.read()
+    config = FeedConfig(url="https://research.nccgroup.com/", title="nccgroup")
+    result = generate_feed(config, html=content)
+    rss_feed = re.sub(
+        r"<lastBuildDate>.*</lastBuildDate>",
+        "<lastBuildDate>Fri, 21 Apr 2023 12:15:48 +0000</lastBuildDate>",
+        result.feed.decode("utf-8"),
+    )
+    assert rss_feed == correct_rss_feed
+    assert result.stats.entries == len(result.entries)
+    assert result.stats.input_bytes == len(content.encode("utf-8"))
+    assert result.stats.fetch_seconds == 0
+
+
+def test_generate_feed_session(requests_mock):
+    """Test generate_feed() fetches with the given session."""
+    url = "https://research.nccgroup.com/"
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        requests_mock.get(url, text=f.read())
+    with requests.Session() as session:
+        result = generate_feed(FeedConfig(url=url), session=session)
+    assert requests_mock.call_count == 1
+    assert result.entries
+
+
+def test_generate_feed_no_links():
+    """Test generate_feed() on a page without links - should fail."""
+    with pytest.raises(NoLinksFoundError):
+        generate_feed(FeedConfig(url="https://example.com"), html="<html><body></body></html>")
+
+
+def test_extractor_shared_between_threads():
+    """Test one extractor gives the same entries for every extraction, also from several threads."""
+    with open("src/tests/data/input/tripwire.html", encoding="utf-8") as f:
+        content = f.read()
+    with open("src/tests/data/output/tripwire", "rb") as f:
+        correct_links = pickle.load(f)
+    config = FeedConfig(url="http://www.tripwire.com/state-of-security", mode="html")
+    extractor = get_extractor(config)
+    assert get_extractor(FeedConfig(url=config.url, mode="html")) is extractor
+
+    # Entries from the first extraction must not count as duplicates in the next ones
+    pages = [BeautifulSoup(content, "html.parser") for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+        results = list(pool.map(extractor.extract_links, pages))
+    assert all(links == correct_links for links in results)
+
+
+def test_extraction_context_report():
+    """Test dropped entries are recorded in the report of the extraction context."""
+    html = '<ul><li><a href="/a">A</a></li><li><a href="/a">A again</a></li><li><a href="/b">B</a></li></ul>'
+    extractor = get_extractor(FeedConfig(url="https://example.com"))
+    report = ExplainReport("https://example.com")
+    links = extractor.extract_links(BeautifulSoup(html, "html.parser"), extractor.new_context(report))
+    assert [link.url for link in links] == ["/a", "/b"]
+    assert report.dropped["duplicate"] == 1
+    assert len(extractor.extract_links(BeautifulSoup(html, "html.parser"))) == len(links)
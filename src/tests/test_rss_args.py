@@ -3,6 +3,8 @@
 import pytest
 
 from rssfixer import rss
+from rssfixer.batch import BatchOptions
+from rssfixer.cli import parse_aggregate_arguments, parse_batch_arguments, parse_warc_arguments
 
 # Constants
 EXIT_VALUE = 2
@@ -165,3 +167,40 @@ def test_parse_arguments_invalid_args_list_release():
     """Test argument parsing with invalid args --list and --release - should fail."""
     with pytest.raises(SystemExit):
         rss.parse_arguments(["--list", "--release", "https://example.com"])
+
+
+def test_parse_arguments_list_exclude():
+    """Test argument parsing with repeated --list-exclude - should succeed."""
+    arguments = ["--list", "--list-exclude", "/tag/", "--list-exclude", "/page/", "https://example.com"]
+    args = rss.parse_arguments(arguments)
+    assert args.list_exclude == ["/tag/", "/page/"]
+
+
+def test_rss_args_html_list_exclude():
+    """Test combination of --html and --list-exclude - should fail."""
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        rss.parse_arguments(["--html", "--list-exclude", "/tag/", "https://example.com"])
+    assert pytest_wrapped_e.value.code == EXIT_VALUE
+
+
+def test_parse_arguments_max_entries_invalid():
+    """Test argument parsing with --max-entries 0 - should fail."""
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        rss.parse_arguments(["--list", "--max-entries", "0", "https://example.com"])
+    assert pytest_wrapped_e.value.code == EXIT_VALUE
+
+
+@pytest.mark.parametrize(
+    ("parse", "arguments"),
+    [
+        (parse_batch_arguments, ["feeds.toml"]),
+        (parse_aggregate_arguments, ["--url", "https://example.com", "--output", "feed.xml", "feeds.toml"]),
+        (parse_warc_arguments, ["--config", "feeds.toml", "pages.warc"]),
+    ],
+)
+def test_parse_pool_arguments(parse, arguments):
+    """Test the pool options of the commands for many feeds default to the batch defaults."""
+    args = parse(arguments)
+    assert args.workers is None
+    assert args.max_tasks_per_child == BatchOptions.max_tasks_per_child
+    assert args.fetch_threads == BatchOptions.fetch_threads
@@ -0,0 +1,122 @@
+"""Test batch generation of feeds."""
+
+import pickle
+
+import pytest
+
+from rssfixer import rss
+from rssfixer.batch import BatchOptions, extract_entries, feed_to_argv, load_feeds, run_batch
+from rssfixer.exceptions import RSSFixerError
+from rssfixer.models import FeedConfig, LinkEntry
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://research.nccgroup.com/"
+list = true
+title = "nccgroup"
+output = "{output}"
+quiet = true
+"""
+
+
+def test_feed_to_argv():
+    """Test conversion of a feed table - flags should come first."""
+    feed = {
+        "url": "https://example.com",
+        "html-entries": "div",
+        "html": True,
+        "atom": False,
+    }
+    assert feed_to_argv(feed) == ["--html", "--html-entries", "div", "https://example.com"]
+
+
+def test_feed_to_argv_no_url():
+    """Test conversion of a feed table without url - should fail."""
+    with pytest.raises(RSSFixerError):
+        feed_to_argv({"list": True})
+
+
+def test_load_feeds(tmp_path):
+    """Test loading feed definitions from TOML."""
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=tmp_path / "nccgroup.xml"), encoding="utf-8")
+    feeds = load_feeds(str(config))
+    assert len(feeds) == 1
+    assert feeds[0].mode == "list"
+    assert feeds[0].title == "nccgroup"
+
+
+def test_load_feeds_empty(tmp_path):
+    """Test loading a file without feeds - should fail."""
+    config = tmp_path / "feeds.toml"
+    config.write_text("", encoding="utf-8")
+    with pytest.raises(RSSFixerError):
+        load_feeds(str(config))
+
+
+def test_extract_entries():
+    """Test extract_entries() returns plain tuples matching the extractor output."""
+    with open("src/tests/data/input/nccgroup.html", "rb") as f:
+        content = f.read()
+    config = FeedConfig(url="https://research.nccgroup.com/")
+    with open("src/tests/data/output/nccgroup", "rb") as f:
+        correct_links = pickle.load(f)
+    entries = extract_entries(content, config)
+    assert all(isinstance(entry, tuple) for entry in entries)
+    assert [LinkEntry(*entry) for entry in entries] == correct_links
+
+
+def test_run_batch(tmp_path, requests_mock):
+    """Test run_batch() writes the same feed as a single run."""
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        requests_mock.get("https://research.nccgroup.com/", text=f.read())
+    output = tmp_path / "nccgroup.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output), encoding="utf-8")
+
+    options = BatchOptions(workers=1, max_tasks_per_child=1, quiet=True)
+    assert run_batch(load_feeds(str(config)), options) == 0
+    assert "<title>nccgroup</title>" in output.read_text(encoding="utf-8")
+
+
+def test_main_batch_failure(tmp_path, requests_mock, capsys):
+    """Test the batch command when a fetch fails - should return 1."""
+    requests_mock.get("https://research.nccgroup.com/", status_code=500)
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=tmp_path / "nccgroup.xml"), encoding="utf-8")
+
+    assert rss.main(["batch", "--workers", "1", str(config)]) == 1
+    assert "ERROR: https://research.nccgroup.com/" in capsys.readouterr().out
+
+
+BROKEN_FEED_TOML = """
+[[feed]]
+url = "https://example.com/broken/"
+json = true
+json-entries = "posts"
+json-url = "url"
+json-title = "title"
+output = "{broken}"
+
+[[feed]]
+url = "https://research.nccgroup.com/"
+list = true
+output = "{good}"
+"""
+
+BROKEN_JSON = '<script type="application/json">{"posts": [{"url": 5, "title": "Five"}]}</script>'
+
+
+def test_run_batch_unexpected_error(tmp_path, requests_mock, capsys):
+    """Test an unexpected error in one feed doesn't stop the other feeds."""
+    requests_mock.get("https://example.com/broken/", text=BROKEN_JSON)
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        requests_mock.get("https://research.nccgroup.com/", text=f.read())
+    good = tmp_path / "good.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(BROKEN_FEED_TOML.format(broken=tmp_path / "broken.xml", good=good), encoding="utf-8")
+
+    assert run_batch(load_feeds(str(config)), BatchOptions(workers=1, quiet=True)) == 1
+    assert "UNEXPECTED ERROR: https://example.com/broken/" in capsys.readouterr().out
+    assert good.exists()
+    assert not (tmp_path / "broken.xml").exists()
@@ -0,0 +1,240 @@
+"""Test resource budgets and deadlines for pathological pages and slow servers."""
+
+import os
+import pickle
+import stat
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.batch import extract_entries
+from rssfixer.budgets import Deadline
+from rssfixer.exceptions import BudgetExceededError, DeadlineExceededError, NetworkError
+from rssfixer.utils import fetch_html, fetch_response, filter_html, save_rss_feed
+
+URL = "https://example.com/blog"
+MAX_NODES = 50
+DEEP_NESTING = 5000
+DEADLINE = 20
+TIMEOUT = 10
+FILE_MODE = 0o644
+# A server that sends a byte at a time, slower than any deadline in the tests
+DRIP_BYTES = 200
+DRIP_INTERVAL = 0.05
+SHORT_DEADLINE = 0.5
+MAX_INPUT_BYTES = 10
+
+NESTED_ARTICLES = "<article><a href='/x'><h3 class='title'>X</h3></a>" * 30
+
+
+def test_max_input_bytes():
+    """Test a page larger than --max-input-bytes - should fail."""
+    config = FeedConfig(url=URL, max_input_bytes=10)
+    with pytest.raises(BudgetExceededError, match="input bytes") as error:
+        generate_feed(config, html="<ul><li><a href='/one'>One</a></li></ul>")
+    assert error.value.budget == "input bytes"
+    assert error.value.limit == config.max_input_bytes
+
+
+def test_max_input_bytes_file(tmp_path):
+    """Test the size of an input file is checked before it is read - should fail."""
+    path = tmp_path / "page.html"
+    path.write_text("<ul><li><a href='/one'>One</a></li></ul>", encoding="utf-8")
+    with pytest.raises(BudgetExceededError, match="input bytes"):
+        generate_feed(FeedConfig(url=URL, input=str(path), max_input_bytes=10))
+
+
+def test_max_nodes_nested_entries():
+    """Test nested entries that are walked again for each entry - should fail."""
+    config = FeedConfig(url=URL, mode="html", max_nodes=MAX_NODES * 10)
+    with pytest.raises(BudgetExceededError, match="DOM nodes"):
+        generate_feed(config, html=NESTED_ARTICLES)
+    # The same page is fine with the default budget
+    assert len(generate_feed(FeedConfig(url=URL, mode="html"), html=NESTED_ARTICLES).entries) == 1
+
+
+def test_max_nodes_list():
+    """Test the list extractor counts visited elements - should fail."""
+    html = "<ul>" + "<li><a href='/x'>X</a></li>" * MAX_NODES + "</ul>"
+    with pytest.raises(BudgetExceededError, match="DOM nodes"):
+        generate_feed(FeedConfig(url=URL, max_nodes=MAX_NODES), html=html)
+
+
+def test_filter_html_max_nodes():
+    """Test the page filter counts visited elements - should fail."""
+    soup = BeautifulSoup("<div class='main'>" + "<p>text</p>" * MAX_NODES + "</div>", "html.parser")
+    assert filter_html(soup, "div", "main").find("div")
+    with pytest.raises(BudgetExceededError):
+        filter_html(soup, "div", "main", MAX_NODES)
+
+
+def test_deeply_nested_json():
+    """Test JSON nested deeper than the recursion limit is reported as a budget - should fail."""
+    html = '<script type="application/json">' + "[" * DEEP_NESTING + "]" * DEEP_NESTING + "</script>"
+    with pytest.raises(BudgetExceededError, match="recursion depth"):
+        generate_feed(FeedConfig(url=URL, mode="json"), html=html)
+
+
+def test_structured_max_nodes():
+    """Test the structured data search counts visited values - should fail."""
+    data = "[" + ",".join(["{}"] * MAX_NODES) + "]"
+    html = f'<script id="__NEXT_DATA__" type="application/json">{data}</script>'
+    with pytest.raises(BudgetExceededError, match="structured data nodes"):
+        generate_feed(FeedConfig(url=URL, mode="structured", max_nodes=MAX_NODES), html=html)
+
+
+def test_budget_error_from_worker():
+    """Test the error survives the trip back from a worker process."""
+    with pytest.raises(BudgetExceededError) as error:
+        extract_entries(NESTED_ARTICLES.encode("utf-8"), FeedConfig(url=URL, mode="html", max_nodes=MAX_NODES))
+    copy = pickle.loads(pickle.dumps(error.value))
+    assert (copy.budget, copy.limit, str(copy)) == ("DOM nodes", MAX_NODES, str(error.value))
+
+
+def test_main_budget(tmp_path, capsys):
+    """Test the main function reports the budget that was exceeded."""
+    path = tmp_path / "page.html"
+    path.write_text(NESTED_ARTICLES, encoding="utf-8")
+    result = rss.main(["--html", "--stdout", "--max-nodes", str(MAX_NODES), "--input", str(path), URL])
+    assert result == 1
+    assert "ERROR: DOM nodes budget exceeded, limit is 50" in capsys.readouterr().out
+
+
+class Clock:
+    """Monotonic clock that moves one second every time it is read."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Advance and read the clock."""
+        self.now += 1
+        return self.now
+
+
+def test_deadline():
+    """Test the time left and the timeout for a blocking call."""
+    assert Deadline(None).remaining() is None
+    assert Deadline(None).timeout(TIMEOUT, "fetch") == TIMEOUT
+    assert Deadline(DEADLINE).timeout(TIMEOUT, "fetch") <= DEADLINE
+    with pytest.raises(DeadlineExceededError, match="exceeded during parsing"):
+        Deadline(-1).check("parsing")
+
+
+def test_deadline_slow_fetch(monkeypatch, requests_mock):
+    """Test a download that is still running at the deadline - should fail."""
+    monkeypatch.setattr("rssfixer.budgets.time.monotonic", Clock())
+    requests_mock.get(URL, text="<ul><li><a href='/one'>One</a></li></ul>")
+    with pytest.raises(DeadlineExceededError, match="during fetch"):
+        fetch_html(URL, {}, deadline=Deadline(3))
+
+
+def test_deadline_timeout(monkeypatch, requests_mock):
+    """Test a timeout after the deadline is reported as the deadline - should fail."""
+    monkeypatch.setattr("rssfixer.budgets.time.monotonic", Clock())
+    requests_mock.get(URL, exc=requests.exceptions.ReadTimeout)
+    with pytest.raises(DeadlineExceededError):
+        fetch_html(URL, {}, deadline=Deadline(2))
+    with pytest.raises(NetworkError, match="timed out"):
+        fetch_html(URL, {}, deadline=Deadline(DEADLINE))
+
+
+class DripHandler(BaseHTTPRequestHandler):
+    """Sends the body one byte at a time."""
+
+    send_length = True
+
+    def do_GET(self):
+        """Send a page slowly."""
+        self.send_response(200)
+        if self.send_length:
+            self.send_header("Content-Length", str(DRIP_BYTES))
+        self.end_headers()
+        try:
+            for _ in range(DRIP_BYTES):
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(DRIP_INTERVAL)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
+class UnsizedDripHandler(DripHandler):
+    """Sends the body one byte at a time without a Content-Length."""
+
+    send_length = False
+
+
+@pytest.mark.parametrize("handler", [DripHandler, UnsizedDripHandler])
+def test_max_input_bytes_fetch(handler):
+    """Test a download is stopped as soon as it passes --max-input-bytes - should fail."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        start = time.monotonic()
+        with pytest.raises(BudgetExceededError, match="input bytes"):
+            fetch_response(url, {}, deadline=Deadline(DEADLINE), max_bytes=MAX_INPUT_BYTES)
+        assert time.monotonic() - start < DRIP_BYTES * DRIP_INTERVAL / 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_deadline_dripping_server():
+    """Test a server that keeps sending a byte at a time is stopped at the deadline - should fail."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DripHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError, match="during fetch"):
+            fetch_html(url, {}, deadline=Deadline(SHORT_DEADLINE))
+        assert time.monotonic() - start < DRIP_BYTES * DRIP_INTERVAL / 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_deadline_extraction(monkeypatch):
+    """Test the deadline is checked for every extracted entry - should fail."""
+    html = "<ul>" + "".join(f"<li><a href='/{n}'>{n}</a></li>" for n in range(MAX_NODES)) + "</ul>"
+    monkeypatch.setattr("rssfixer.budgets.time.monotonic", Clock())
+    with pytest.raises(DeadlineExceededError, match="during extraction"):
+        generate_feed(FeedConfig(url=URL, deadline=DEADLINE), html=html)
+
+
+def test_main_deadline_keeps_output(monkeypatch, requests_mock, tmp_path, capsys):
+    """Test a run past its deadline leaves the previous feed in place."""
+    output = tmp_path / "feed.xml"
+    output.write_text("previous feed", encoding="utf-8")
+    monkeypatch.setattr("rssfixer.budgets.time.monotonic", Clock())
+    requests_mock.get(URL, text="<ul><li><a href='/one'>One</a></li></ul>")
+
+    assert rss.main(["--list", "--deadline", "3", "--output", str(output), URL]) == 1
+    assert "ERROR: Deadline of 3 seconds exceeded during fetch" in capsys.readouterr().out
+    assert output.read_text(encoding="utf-8") == "previous feed"
+    assert [path.name for path in tmp_path.iterdir()] == ["feed.xml"]
+
+
+def test_save_rss_feed_permissions(tmp_path):
+    """Test the atomically written feed gets the permissions of a new file."""
+    output = tmp_path / "feed.xml"
+    umask = os.umask(0o022)
+    try:
+        save_rss_feed(b"<rss/>", str(output), quiet=True)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(output.stat().st_mode) == FILE_MODE
+    assert [path.name for path in tmp_path.iterdir()] == ["feed.xml"]
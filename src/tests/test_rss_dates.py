@@ -0,0 +1,98 @@
+"""Test publication dates."""
+
+from datetime import UTC, datetime
+
+import pytest
+from bs4 import BeautifulSoup
+
+from rssfixer import FeedConfig, generate_feed
+from rssfixer.dates import FORMATS, DateParser, parse_date
+from rssfixer.extractors.html import HtmlExtractor
+
+DATE = datetime(2023, 4, 17, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("2023-04-17", DATE),
+        ("2023-04-17T12:00:00+02:00", datetime(2023, 4, 17, 10, tzinfo=UTC)),
+        ("Mon, 17 Apr 2023 10:00:00 +0000", datetime(2023, 4, 17, 10, tzinfo=UTC)),
+        ("Posted on April 17th, 2023 by someone", DATE),
+        ("17 Apr. 2023", DATE),
+        ("2023/04/17", DATE),
+        ("17.04.2023", DATE),
+        ("04/17/2023", DATE),
+        ("17/04/2023", DATE),
+        (1681689600, DATE),
+        (1681689600000, DATE),
+        ("April 17", None),
+        ("", None),
+        (True, None),
+        (None, None),
+    ],
+)
+def test_parse_date(value, expected):
+    """Test parsing of the supported formats."""
+    assert parse_date(value) == expected
+
+
+def test_date_parser_remembers_format():
+    """Test the detected format is used first for the following dates."""
+    parser = DateParser()
+    assert parser.parse("13/04/2023") == datetime(2023, 4, 13, tzinfo=UTC)
+    assert parser.format.name == "day/month/year"
+    # Would be May 4 if detected again
+    assert parser.parse("05/04/2023") == datetime(2023, 4, 5, tzinfo=UTC)
+
+
+def test_date_parser_ambiguous_format():
+    """Test an ambiguous numeric date doesn't decide the format for the following dates."""
+    parser = DateParser()
+    assert parser.parse("03/04/2024") == datetime(2024, 3, 4, tzinfo=UTC)
+    assert parser.format is None
+    assert parser.parse("25/04/2024") == datetime(2024, 4, 25, tzinfo=UTC)
+    assert parser.format.name == "day/month/year"
+    assert parser.parse("03/04/2024") == datetime(2024, 4, 3, tzinfo=UTC)
+    # The same day and month read the same in both formats
+    assert DateParser().parse("04/04/2024") == datetime(2024, 4, 4, tzinfo=UTC)
+
+
+def test_date_parser_detects_again():
+    """Test a date in another format is still parsed."""
+    parser = DateParser()
+    parser.parse("2023-04-17")
+    assert parser.parse("April 17, 2023") == DATE
+    assert parser.format is FORMATS[2]
+
+
+def test_html_date():
+    """Test --html-date prefers the datetime attribute and falls back to the text."""
+    html = """
+    <article><a href="/one"><h3 class="title">One</h3></a><time datetime="2023-04-17">Yesterday</time></article>
+    <article><a href="/two"><h3 class="title">Two</h3></a><span class="date">April 18, 2023</span></article>
+    """
+    config = FeedConfig(url="https://example.com", mode="html", html_date="time")
+    links = HtmlExtractor(config).extract_links(BeautifulSoup(html, "html.parser"))
+    assert links[0].published == DATE
+    assert links[1].published is None
+
+    config = FeedConfig(url="https://example.com", mode="html", html_date="span", html_date_class="date")
+    links = HtmlExtractor(config).extract_links(BeautifulSoup(html, "html.parser"))
+    assert links[1].published == datetime(2023, 4, 18, tzinfo=UTC)
+
+
+def test_json_date():
+    """Test --json-date on the Apple blog adds pubDate to the feed."""
+    with open("src/tests/data/input/apple.html", encoding="utf-8") as f:
+        content = f.read()
+    config = FeedConfig(
+        url="https://security.apple.com/blog",
+        mode="json",
+        json_entries="blogs",
+        json_url="slug",
+        json_date="date",
+    )
+    result = generate_feed(config, html=content)
+    assert all(entry.published for entry in result.entries)
+    assert b"<pubDate>Thu, 27 Oct 2022 00:00:00 +0000</pubDate>" in result.feed
@@ -0,0 +1,112 @@
+"""Test detection of extractor options."""
+
+from bs4 import BeautifulSoup
+
+from rssfixer import rss
+from rssfixer.detect import detect
+
+# Constants
+LIST_LENGTH = 10
+
+
+def test_detect_json():
+    """Test detect() finds the JSON entries on the Apple blog."""
+    with open("src/tests/data/input/apple.html", encoding="utf-8") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    candidates = detect(soup, "https://security.apple.com/blog")
+    options = [candidate.options for candidate in candidates]
+    assert [
+        "--json",
+        "--json-entries",
+        "blogs",
+        "--json-url",
+        "slug",
+        "--json-title",
+        "title",
+        "--json-description",
+        "description",
+    ] in options
+
+
+def test_detect_html():
+    """Test detect() finds the repeated article elements on Tripwire."""
+    with open("src/tests/data/input/tripwire.html", encoding="utf-8") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    candidates = detect(soup, "http://www.tripwire.com/state-of-security")
+    articles = [
+        candidate for candidate in candidates if candidate.options[:3] == ["--html", "--html-entries", "article"]
+    ]
+    assert articles
+    assert articles[0].links[0].title == "US charges three men with six million dollar business email compromise plot"
+
+
+def test_detect_ranking():
+    """Test detect() ranks candidates by number of entries."""
+    html = "<ul>" + "".join(f'<li><a href="/post/{i}">Post {i}</a></li>' for i in range(LIST_LENGTH)) + "</ul>"
+    candidates = detect(BeautifulSoup(html, "html.parser"), "https://example.com")
+    assert candidates[0].options == ["--list"]
+    assert candidates[0].count == LIST_LENGTH
+
+
+def test_detect_verified_counts():
+    """Test every distinct option set is verified once and counts the entries it extracts."""
+    with open("src/tests/data/input/truesec.html", encoding="utf-8") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    candidates = detect(soup, "https://www.truesec.com/hub/blog")
+    options = [tuple(candidate.options) for candidate in candidates]
+    assert len(options) == len(set(options))
+    assert all(candidate.count == len(candidate.links) for candidate in candidates)
+    html = [candidate.options for candidate in candidates if candidate.options[0] == "--html"]
+    assert html
+    # A description class is only given for a description element
+    without_description = [options for options in html if options[options.index("--html-description") + 1] == ""]
+    assert without_description
+    assert all("--html-description-class" not in options for options in without_description)
+    assert ["--json", "--json-entries", "channels", "--json-url", "url", "--json-title", "title"] in [
+        candidate.options for candidate in candidates
+    ]
+
+
+def test_detect_no_empty_entries_class():
+    """Test --html-entries-class is left out for elements without a class."""
+    html = "<div>" + "".join(f'<p><a href="/post/{i}">Post {i}</a></p>' for i in range(LIST_LENGTH)) + "</div>"
+    candidates = detect(BeautifulSoup(html, "html.parser"), "https://example.com")
+    html_options = [candidate.options for candidate in candidates if candidate.options[0] == "--html"]
+    assert html_options
+    assert all("--html-entries-class" not in options for options in html_options)
+
+
+def test_main_detect(capsys, requests_mock):
+    """Test the detect command prints ready to use command lines."""
+    url = "https://security.apple.com/blog"
+    with open("src/tests/data/input/apple.html", encoding="utf-8") as f:
+        requests_mock.get(url, text=f.read())
+
+    assert rss.main(["detect", url]) == 0
+    output = capsys.readouterr().out
+    assert (
+        f"rssfixer --json --json-entries blogs --json-url slug --json-title title --json-description description {url}"
+        in output
+    )
+
+
+def test_main_detect_nothing_found(capsys, requests_mock):
+    """Test the detect command on a page without entries - should return 1."""
+    url = "https://example.com"
+    requests_mock.get(url, text="<html><body><p>Nothing here</p></body></html>")
+
+    assert rss.main(["detect", url]) == 1
+    assert "No usable extractor options found" in capsys.readouterr().out
+
+
+def test_main_detect_unexpected_error(capsys, monkeypatch, requests_mock):
+    """Test an unexpected error in the detect command is reported like in the other commands - should return 1."""
+    url = "https://example.com"
+    requests_mock.get(url, text="<html><body><p>Nothing here</p></body></html>")
+
+    def broken_detect(*_args):
+        raise ValueError("broken")
+
+    monkeypatch.setattr(rss, "detect", broken_detect)
+    assert rss.main(["detect", url]) == 1
+    assert "UNEXPECTED ERROR: broken" in capsys.readouterr().out
@@ -0,0 +1,147 @@
+"""Test the stream of new entries."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from rssfixer import FeedConfig, rss
+from rssfixer.batch import BatchOptions, load_feeds, run_batch
+from rssfixer.emit import MAX_KNOWN_URLS, append_records, find_new_entries
+from rssfixer.models import LinkEntry
+from rssfixer.state import FeedState, FeedStateStore
+
+URL = "https://example.com/blog/"
+SITE = "https://example.com/"
+NOW = datetime(2023, 4, 17, tzinfo=UTC)
+EXIT_ARGUMENTS = 2
+
+PAGE = """<ul>
+{items}
+</ul>"""
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://example.com/blog/"
+list = true
+output = "{output}"
+"""
+
+
+def page(*slugs: str) -> str:
+    """Make a page with a list entry for each slug."""
+    return PAGE.format(items="\n".join(f'<li><a href="/{slug}">{slug.title()}</a></li>' for slug in slugs))
+
+
+def read_records(path) -> list[dict]:
+    """Read newline delimited JSON records."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_find_new_entries():
+    """Test only unknown canonical URLs are new, and the known URLs are remembered."""
+    config = FeedConfig(url=URL)
+    state = FeedState()
+    links = [LinkEntry("/one", "One", "First"), LinkEntry("https://example.com/two?utm_source=x", "Two")]
+    records = find_new_entries(links, config, state, NOW)
+    assert records[0] == {
+        "feed": URL,
+        "url": "https://example.com/one",
+        "title": "One",
+        "description": "First",
+        "published": None,
+        "first_seen": NOW.isoformat(),
+    }
+    assert [record["url"] for record in records] == ["https://example.com/one", "https://example.com/two"]
+
+    later = NOW + timedelta(hours=1)
+    links.append(LinkEntry("https://example.com/three", "Three"))
+    assert [record["url"] for record in find_new_entries(links, config, state, later)] == ["https://example.com/three"]
+    assert state.first_seen["https://example.com/one"] == NOW
+
+
+def test_find_new_entries_skip_first():
+    """Test the entries of the first run are only remembered with skip_first."""
+    config = FeedConfig(url=URL)
+    state = FeedState()
+    assert find_new_entries([LinkEntry("/one", "One")], config, state, NOW, skip_first=True) == []
+    assert list(state.first_seen) == ["https://example.com/one"]
+    links = [LinkEntry("/one", "One"), LinkEntry("/two", "Two")]
+    records = find_new_entries(links, config, state, NOW, skip_first=True)
+    assert [record["url"] for record in records] == ["https://example.com/two"]
+
+
+def test_known_urls_bounded():
+    """Test the oldest URLs that are no longer on the page are forgotten."""
+    state = FeedState(first_seen={f"https://example.com/{number}": NOW for number in range(MAX_KNOWN_URLS)})
+    state.first_seen["https://example.com/oldest"] = NOW - timedelta(days=1)
+    find_new_entries([LinkEntry("/new", "New")], FeedConfig(url=URL), state, NOW)
+    assert len(state.first_seen) == MAX_KNOWN_URLS
+    assert "https://example.com/new" in state.first_seen
+    assert "https://example.com/oldest" not in state.first_seen
+
+
+def test_append_records(tmp_path, capsys):
+    """Test records are appended to a file or printed."""
+    path = tmp_path / "new.ndjson"
+    append_records([{"url": "a"}], str(path))
+    append_records([{"url": "b"}, {"url": "c"}], str(path))
+    append_records([], str(path))
+    assert [record["url"] for record in read_records(path)] == ["a", "b", "c"]
+
+    append_records([{"title": "Två"}], "-")
+    assert json.loads(capsys.readouterr().out) == {"title": "Två"}
+
+
+def test_main_emit_new(tmp_path, requests_mock):
+    """Test each run only emits the entries that earlier runs haven't seen."""
+    output = tmp_path / "feed.xml"
+    emitted = tmp_path / "new.ndjson"
+    arguments = ["--list", "-q", "--emit-new", str(emitted), "--output", str(output), URL]
+    requests_mock.get(URL, text=page("one", "two"))
+    assert rss.main(arguments) == 0
+    requests_mock.get(URL, text=page("three", "one", "two"))
+    assert rss.main(arguments) == 0
+    assert rss.main(arguments) == 0
+
+    records = read_records(emitted)
+    urls = [SITE + "one", SITE + "two", SITE + "three"]
+    assert [record["url"] for record in records] == urls
+    assert records[0]["feed"] == URL
+    assert set(FeedStateStore.for_output(str(output)).load().first_seen) == set(urls)
+
+
+def test_main_emit_skip_first(tmp_path, requests_mock):
+    """Test --emit-skip-first only emits the entries added after the first run."""
+    output = tmp_path / "feed.xml"
+    emitted = tmp_path / "new.ndjson"
+    arguments = ["--list", "-q", "--emit-new", str(emitted), "--emit-skip-first", "--output", str(output), URL]
+    requests_mock.get(URL, text=page("one", "two"))
+    assert rss.main(arguments) == 0
+    assert not emitted.exists()
+    requests_mock.get(URL, text=page("three", "one", "two"))
+    assert rss.main(arguments) == 0
+    assert [record["url"] for record in read_records(emitted)] == [SITE + "three"]
+
+
+def test_batch_emit_new(tmp_path, requests_mock):
+    """Test batch appends the new entries of every feed."""
+    requests_mock.get(URL, text=page("one"))
+    output = tmp_path / "feed.xml"
+    emitted = tmp_path / "new.ndjson"
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output), encoding="utf-8")
+    feeds = load_feeds(str(config))
+    options = BatchOptions(workers=1, quiet=True, emit_new=str(emitted))
+    assert run_batch(feeds, options) == 0
+    requests_mock.get(URL, text=page("one", "two"))
+    assert run_batch(feeds, options) == 0
+    assert [record["title"] for record in read_records(emitted)] == ["One", "Two"]
+    assert output.exists()
+
+
+def test_emit_new_stdout_conflict():
+    """Test --emit-new - together with --stdout - should fail."""
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        rss.parse_arguments(["--list", "--emit-new", "-", "--stdout", URL])
+    assert pytest_wrapped_e.value.code == EXIT_ARGUMENTS
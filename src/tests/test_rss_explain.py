@@ -0,0 +1,94 @@
+"""Test the explain report for selectors."""
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.exceptions import NoLinksFoundError
+from rssfixer.explain import SAMPLE_LENGTH, ExplainReport, sample
+
+TRIPWIRE_URL = "http://www.tripwire.com/state-of-security"
+TRIPWIRE_ENTRIES = 20
+
+
+@pytest.fixture(name="tripwire")
+def fixture_tripwire():
+    """Return the tripwire test page."""
+    with open("src/tests/data/input/tripwire.html", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_explain_html(tripwire):
+    """Test the report counts matches for each html selector."""
+    report = ExplainReport(TRIPWIRE_URL)
+    result = generate_feed(FeedConfig(url=TRIPWIRE_URL, mode="html"), html=tripwire, report=report)
+
+    assert report.entries == len(result.entries) == TRIPWIRE_ENTRIES
+    assert report.selectors["--html-entries"].matches == TRIPWIRE_ENTRIES
+    assert report.selectors["--html-title"].value == "h3.title"
+    assert report.selectors["--html-title"].calls == TRIPWIRE_ENTRIES
+    assert report.input_bytes == len(tripwire.encode("utf-8"))
+
+
+def test_explain_no_title(tripwire):
+    """Test the report explains why nothing was found - should fail with the report filled in."""
+    report = ExplainReport(TRIPWIRE_URL)
+    config = FeedConfig(url=TRIPWIRE_URL, mode="html", html_title="h1")
+    with pytest.raises(NoLinksFoundError):
+        generate_feed(config, html=tripwire, report=report)
+
+    assert report.selectors["--html-title"].matches == 0
+    assert report.dropped == {"no title": TRIPWIRE_ENTRIES}
+    assert f"{TRIPWIRE_ENTRIES} no title" in report.format()
+
+
+def test_explain_list_drops():
+    """Test the report counts excluded and duplicate links in lists."""
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        content = f.read()
+    report = ExplainReport("https://research.nccgroup.com/")
+    result = generate_feed(FeedConfig(url="https://research.nccgroup.com/"), html=content, report=report)
+
+    stats = report.selectors["--list"]
+    assert stats.matches == len(result.entries) + sum(report.dropped.values())
+    assert report.dropped["excluded URL"]
+    assert report.dropped["duplicate"]
+
+
+def test_sample():
+    """Test samples are shortened to one line."""
+    assert sample("a\n  b") == "a b"
+    assert len(sample("x" * 2 * SAMPLE_LENGTH)) == SAMPLE_LENGTH
+
+
+def test_main_explain(capsys):
+    """Test the main function with --explain prints the report to stderr."""
+    args = ["--explain", "--stdout", "--input", "src/tests/data/input/tripwire.html", "--html", TRIPWIRE_URL]
+    assert rss.main(args) == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("<?xml")
+    assert captured.err.startswith(f"EXPLAIN: {TRIPWIRE_URL}")
+
+
+def test_explain_json():
+    """Test the report counts the entries each JSON field selector found a value in."""
+    with open("src/tests/data/input/apple.html", encoding="utf-8") as f:
+        content = f.read()
+    report = ExplainReport("https://security.apple.com/blog")
+    config = FeedConfig(url="https://security.apple.com/blog", mode="json", json_entries="blogs", json_url="slug")
+    result = generate_feed(config, html=content, report=report)
+
+    assert report.selectors["--json-entries"].matches == len(result.entries)
+    for option in ("--json-url", "--json-title"):
+        assert report.selectors[option].calls == report.selectors[option].matches == len(result.entries)
+    assert report.selectors["--json-url"].value == "slug"
+    assert "--json-description description:" in report.format()
+
+
+def test_main_debug(capsys):
+    """Test --debug prints the parsed page and no explain report."""
+    args = ["--debug", "--stdout", "--input", "src/tests/data/input/tripwire.html", "--html", TRIPWIRE_URL]
+    assert rss.main(args) == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("DEBUG: Filtered HTML\n")
+    assert "<?xml" in captured.out
+    assert not captured.err
@@ -0,0 +1,123 @@
+"""Test recording and replaying of HTTP responses."""
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import requests_mock
+
+from rssfixer import rss
+from rssfixer.exceptions import NetworkError, RSSFixerError
+from rssfixer.fixtures import FixtureStore, RecordingAdapter, create_session
+from rssfixer.utils import fetch_html
+
+URL = "https://research.nccgroup.com/"
+# One directory and one object for a single stored body
+OBJECT_PATHS = 2
+PAGE = b"<ul><li><a href='/one'>One</a></li><li><a href='/two'>Two</a></li></ul>"
+
+
+@pytest.fixture(name="recorded")
+def fixture_recorded(tmp_path):
+    """Record the nccgroup page and return the fixture directory."""
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        content = f.read()
+    mock = requests_mock.Adapter()
+    mock.register_uri("GET", URL, text=content, headers={"Content-Type": "text/html; charset=utf-8"})
+    with requests.Session() as session:
+        adapter = RecordingAdapter(FixtureStore(str(tmp_path)), mock)
+        session.mount("https://", adapter)
+        assert fetch_html(URL, {}, session=session) == content
+    return tmp_path
+
+
+def test_fixture_store_deduplicates(tmp_path):
+    """Test FixtureStore stores identical bodies once."""
+    store = FixtureStore(str(tmp_path))
+    store.save("https://example.com/a", 200, {"Content-Encoding": "gzip", "X-Test": "a"}, b"same")
+    store.save("https://example.com/b", 404, {}, b"same")
+
+    reopened = FixtureStore(str(tmp_path))
+    assert reopened.load("https://example.com/a") == (200, {"X-Test": "a"}, b"same")
+    assert reopened.load("https://example.com/b") == (404, {}, b"same")
+    assert len(list((tmp_path / "objects").rglob("*"))) == OBJECT_PATHS
+
+
+def test_replay(recorded):
+    """Test replaying a recorded response gives the same text."""
+    with open("src/tests/data/input/nccgroup.html", encoding="utf-8") as f:
+        content = f.read()
+    with create_session(replay=str(recorded)) as session:
+        assert fetch_html(URL, {}, session=session) == content
+
+
+def test_replay_missing(recorded):
+    """Test replaying a URL that was not recorded - should fail without network access."""
+    with create_session(replay=str(recorded)) as session, pytest.raises(NetworkError):
+        fetch_html("https://example.com/", {}, session=session)
+
+
+def test_replay_no_directory(tmp_path):
+    """Test replaying from a directory that doesn't exist - should fail."""
+    with pytest.raises(RSSFixerError):
+        create_session(replay=str(tmp_path / "missing"))
+
+
+def test_main_replay(capsys, recorded):
+    """Test the main function with --replay writes the same feed as a live run."""
+    with open("src/tests/data/output/nccgroup.xml", encoding="utf-8") as f:
+        result = f.read()
+    args = ["--title", "nccgroup", "--stdout", "--replay", str(recorded), "--list", URL]
+
+    assert rss.main(args) == 0
+    captured = re.sub(
+        r"<lastBuildDate>.*</lastBuildDate>",
+        "<lastBuildDate>Fri, 21 Apr 2023 12:15:48 +0000</lastBuildDate>",
+        capsys.readouterr().out,
+    )[:-1]
+    assert captured == result
+
+
+def test_main_record_and_replay_exclusive(recorded):
+    """Test --record together with --replay - should fail."""
+    with pytest.raises(SystemExit):
+        rss.parse_arguments(["--record", str(recorded), "--replay", str(recorded), "--list", URL])
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves PAGE for every path."""
+
+    def do_GET(self):
+        """Send the page."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
+@pytest.fixture(name="server_url")
+def fixture_server_url():
+    """Serve PAGE on a local port and return its URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("deadline", [[], ["--deadline", "30"]])
+def test_main_record(capsys, tmp_path, server_url, deadline):
+    """Test a run with --record gets the whole page and replays it."""
+    args = ["--list", "--stdout", *deadline, server_url]
+    assert rss.main(["--record", str(tmp_path), *args]) == 0
+    recorded = capsys.readouterr().out
+    assert f"<link>{server_url}two</link>" in recorded
+    assert rss.main(["--replay", str(tmp_path), *args]) == 0
+    assert f"<link>{server_url}two</link>" in capsys.readouterr().out
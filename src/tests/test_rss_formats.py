@@ -0,0 +1,89 @@
+"""Test writing a feed in several output formats."""
+
+import json
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.batch import BatchOptions, load_feeds, run_batch
+from rssfixer.cli import parse_arguments
+from rssfixer.feed import JSON_FEED_VERSION
+
+URL = "https://example.com/blog/"
+
+PAGE = """<ul>
+<li><a href="/one">One</a></li>
+<li><a href="https://example.com/two">Två</a></li>
+</ul>"""
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://example.com/blog/"
+list = true
+output = "{output}"
+format = "atom,jsonfeed"
+format-output = ["jsonfeed={json_output}"]
+"""
+
+
+def test_outputs():
+    """Test the output file of every format."""
+    assert FeedConfig(url=URL).outputs() == [("rss", "rss_feed.xml")]
+    assert FeedConfig(url=URL, atom=True).outputs() == [("atom", "rss_feed.xml")]
+    config = FeedConfig(url=URL, output="out/feed.xml", formats=("rss", "atom", "jsonfeed"))
+    assert config.outputs() == [("rss", "out/feed.xml"), ("atom", "out/feed.atom"), ("jsonfeed", "out/feed.json")]
+    config = FeedConfig(url=URL, formats=("atom", "rss"), format_outputs=(("rss", "feed.rss"),))
+    assert config.outputs() == [("atom", "rss_feed.xml"), ("rss", "feed.rss")]
+    with pytest.raises(ValueError, match="same output file"):
+        FeedConfig(url=URL, formats=("atom", "rss"))
+    with pytest.raises(ValueError, match="not one of the formats"):
+        FeedConfig(url=URL, format_outputs=(("atom", "feed.atom"),))
+
+
+def test_render_all_formats():
+    """Test the entries are rendered to every format from one extraction."""
+    config = FeedConfig(url=URL, title="Blog", formats=("jsonfeed", "rss", "atom"), output="feed.json")
+    result = generate_feed(config, html=PAGE)
+    assert list(result.feeds) == ["jsonfeed", "rss", "atom"]
+    assert result.feed == result.feeds["jsonfeed"]
+    assert b"<rss" in result.feeds["rss"]
+    assert b"<feed" in result.feeds["atom"]
+
+    feed = json.loads(result.feed)
+    assert feed["version"] == JSON_FEED_VERSION
+    assert feed["title"] == "Blog"
+    assert [(item["id"], item["title"]) for item in feed["items"]] == [
+        ("https://example.com/one", "One"),
+        ("https://example.com/two", "Två"),
+    ]
+
+
+def test_main_formats(tmp_path, requests_mock):
+    """Test every format is saved to its own file."""
+    requests_mock.get(URL, text=PAGE)
+    output = tmp_path / "feed.xml"
+    assert rss.main(["--list", "--format", "rss,atom,jsonfeed", "-q", "--output", str(output), URL]) == 0
+    assert "<rss" in output.read_text(encoding="utf-8")
+    assert "<feed" in (tmp_path / "feed.atom").read_text(encoding="utf-8")
+    assert json.loads((tmp_path / "feed.json").read_text(encoding="utf-8"))["items"]
+    assert requests_mock.call_count == 1
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--list", "--format", "rss,xml", URL])
+    with pytest.raises(SystemExit):
+        parse_arguments(["--list", "--format", "rss,atom", "--stdout", URL])
+    with pytest.raises(SystemExit):
+        parse_arguments(["--list", "--format", "atom,rss", URL])
+
+
+def test_batch_formats(tmp_path, requests_mock):
+    """Test batch feeds with several formats."""
+    requests_mock.get(URL, text=PAGE)
+    output = tmp_path / "feed.atom"
+    json_output = tmp_path / "json" / "feed.json"
+    json_output.parent.mkdir()
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output, json_output=json_output), encoding="utf-8")
+    assert run_batch(load_feeds(str(config)), BatchOptions(workers=1, quiet=True)) == 0
+    assert "<feed" in output.read_text(encoding="utf-8")
+    assert json.loads(json_output.read_text(encoding="utf-8"))["home_page_url"] == URL
@@ -0,0 +1,71 @@
+"""Test reading pages from local files and stdin."""
+
+import io
+import mmap
+import pickle
+import sys
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed, rss, utils
+from rssfixer.exceptions import FileReadError
+
+URL = "https://research.nccgroup.com/"
+INPUT = "src/tests/data/input/nccgroup.html"
+
+
+@pytest.fixture(name="page")
+def fixture_page():
+    """Content of the nccgroup page."""
+    with open(INPUT, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(name="correct_links")
+def fixture_correct_links():
+    """Links extracted from the nccgroup page."""
+    with open("src/tests/data/output/nccgroup", "rb") as f:
+        return pickle.load(f)
+
+
+def test_open_input_small(page):
+    """Test open_input() reads small files into bytes."""
+    with utils.open_input(INPUT) as content:
+        assert isinstance(content, bytes)
+        assert content == page
+
+
+def test_open_input_mmap(monkeypatch, page):
+    """Test open_input() memory-maps large files."""
+    monkeypatch.setattr(utils, "MMAP_THRESHOLD", 0)
+    with utils.open_input(INPUT) as content:
+        assert isinstance(content, mmap.mmap)
+        assert content[:] == page
+
+
+def test_open_input_missing():
+    """Test open_input() with a missing file - should fail."""
+    with pytest.raises(FileReadError), utils.open_input("src/tests/data/input/missing.html"):
+        pass
+
+
+def test_generate_feed_input_mmap(monkeypatch, page, correct_links):
+    """Test generate_feed() with a memory-mapped input file."""
+    monkeypatch.setattr(utils, "MMAP_THRESHOLD", 0)
+    result = generate_feed(FeedConfig(url=URL, input=INPUT))
+    assert result.entries == correct_links
+    assert result.stats.input_bytes == len(page)
+
+
+def test_main_input_stdin(monkeypatch, capsys):
+    """Test the main function reading the page from stdin."""
+    with open(INPUT, "rb") as f:
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(f.read())))
+    assert rss.main(["--list", "--stdout", "--input", "-", URL]) == 0
+    assert "<link>https://research.nccgroup.com/</link>" in capsys.readouterr().out
+
+
+def test_main_input_missing(capsys):
+    """Test the main function with a missing input file - should return 1."""
+    assert rss.main(["--list", "--stdout", "--input", "src/tests/data/input/missing.html", URL]) == 1
+    assert "Unable to read input file" in capsys.readouterr().out
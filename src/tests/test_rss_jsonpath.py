@@ -0,0 +1,89 @@
+"""Test JSON paths and the budgeted search for JSON entries."""
+
+import json
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed
+from rssfixer.exceptions import BudgetExceededError, JSONParsingError
+from rssfixer.extractors.json import JsonExtractor
+from rssfixer.jsonpath import WILDCARD, compile_path, find_all, get_value
+
+# Deeper than the default recursion limit
+DEEP_NESTING = 5000
+NEXT_DATA = {
+    "props": {
+        "pageProps": {
+            "blogs": [
+                {"fields": {"slug": "/one", "title": "One"}},
+                {"fields": {"slug": "/two", "title": "Two"}},
+            ],
+            "related": [{"fields": {"slug": "/other", "title": "Other"}}],
+        },
+    },
+}
+
+
+def page(data):
+    """Wrap JSON data in a page with a script tag."""
+    return f'<html><script type="application/json">{json.dumps(data)}</script></html>'
+
+
+def test_compile_path():
+    """Test compilation of keys, indexes and wildcards."""
+    assert compile_path("url") == ("url",)
+    assert compile_path("props.pageProps.blogs[*]") == ("props", "pageProps", "blogs", WILDCARD)
+    assert compile_path("items[0].node") == ("items", 0, "node")
+
+
+@pytest.mark.parametrize("expression", ["", "a..b", "a.[0]", "a[x]", ".a"])
+def test_compile_path_invalid(expression):
+    """Test compilation of invalid paths - should fail."""
+    with pytest.raises(JSONParsingError):
+        compile_path(expression)
+
+
+def test_find_all():
+    """Test resolving paths with wildcards and missing keys."""
+    blogs = NEXT_DATA["props"]["pageProps"]["blogs"]
+    assert find_all(NEXT_DATA, compile_path("props.pageProps.blogs[*].fields.slug")) == ["/one", "/two"]
+    assert find_all(NEXT_DATA, compile_path("props.pageProps.blogs[-1]")) == [blogs[-1]]
+    assert find_all(NEXT_DATA, compile_path("props.missing[*]")) == []
+    with pytest.raises(KeyError):
+        get_value(NEXT_DATA, compile_path("props.missing"))
+
+
+def test_json_paths():
+    """Test extraction with a path for the entries and dotted entry fields."""
+    config = FeedConfig(
+        url="https://example.com",
+        mode="json",
+        json_entries="props.pageProps.blogs[*]",
+        json_url="fields.slug",
+        json_title="fields.title",
+    )
+    result = generate_feed(config, html=page(NEXT_DATA))
+    assert [entry.url for entry in result.entries] == ["/one", "/two"]
+
+
+def test_search_deep_nesting():
+    """Test searching deeper than the recursion limit."""
+    data = {"entries": [{"url": "/deep", "title": "Deep"}]}
+    for _ in range(DEEP_NESTING):
+        data = {"child": data}
+    config = FeedConfig(url="https://example.com", mode="json", json_max_depth=2 * DEEP_NESTING)
+    assert JsonExtractor(config)._search_entries(data, "entries") == [{"url": "/deep", "title": "Deep"}]
+
+
+def test_search_max_depth():
+    """Test the search stops at --json-max-depth - should fail."""
+    config = FeedConfig(url="https://example.com", mode="json", json_entries="blogs", json_max_depth=2)
+    with pytest.raises(BudgetExceededError, match="JSON depth"):
+        JsonExtractor(config)._search_entries(NEXT_DATA, "blogs")
+
+
+def test_search_max_nodes():
+    """Test the search stops after --json-max-nodes values - should fail."""
+    config = FeedConfig(url="https://example.com", mode="json", json_max_nodes=3)
+    with pytest.raises(BudgetExceededError, match="JSON nodes"):
+        JsonExtractor(config)._search_entries(NEXT_DATA, "xyzzy")
@@ -0,0 +1,129 @@
+"""Test locking of the output file against overlapping runs."""
+
+import os
+
+import pytest
+
+from rssfixer import rss
+from rssfixer.budgets import Deadline
+from rssfixer.exceptions import DeadlineExceededError, OutputLockedError
+from rssfixer.lock import EXIT_LOCKED, _remove_stale, lock_path, output_lock
+
+URL = "https://example.com/blog"
+STEAL_AFTER = 60
+WAIT = 0.05
+
+
+@pytest.fixture(autouse=True)
+def short_wait(monkeypatch):
+    """Poll for the lock without slowing down the tests."""
+    monkeypatch.setattr("rssfixer.lock.WAIT_INTERVAL", 0.01)
+
+
+def test_lock_removed_after_run(tmp_path):
+    """Test the lock file only exists while the lock is held."""
+    output = str(tmp_path / "feed.xml")
+    with output_lock(output, "skip"):
+        assert lock_path(output).read_text() == f"{os.getpid()}\n"
+    assert not lock_path(output).exists()
+
+
+def test_lock_skip(tmp_path):
+    """Test a second run with the skip policy - should fail."""
+    output = str(tmp_path / "feed.xml")
+    with output_lock(output, "skip"), pytest.raises(OutputLockedError), output_lock(output, "skip"):
+        pass
+
+
+def test_lock_wait_deadline(tmp_path):
+    """Test waiting for a lock that isn't released before the deadline - should fail."""
+    output = str(tmp_path / "feed.xml")
+    with (
+        output_lock(output, "skip"),
+        pytest.raises(DeadlineExceededError, match="during locking"),
+        output_lock(output, "wait", deadline=Deadline(WAIT)),
+    ):
+        pass
+
+
+def test_lock_steal(tmp_path):
+    """Test a stale lock is taken over and the old holder leaves the new lock alone."""
+    output = str(tmp_path / "feed.xml")
+    path = lock_path(output)
+    with output_lock(output, "skip"):
+        # Not stale yet
+        with pytest.raises(DeadlineExceededError):
+            with output_lock(output, "steal", STEAL_AFTER, Deadline(WAIT)):
+                pass
+        old = path.stat().st_mtime - 2 * STEAL_AFTER
+        os.utime(path, (old, old))
+        stolen = output_lock(output, "steal", STEAL_AFTER)
+        stolen.__enter__()
+    # The old holder is done, the new one still holds its lock
+    assert path.exists()
+    with pytest.raises(OutputLockedError):
+        with output_lock(output, "skip"):
+            pass
+    stolen.__exit__(None, None, None)
+    assert not path.exists()
+
+
+def test_remove_stale_replaced(tmp_path, monkeypatch):
+    """Test a stale lock file that another run replaced after it was found is left alone."""
+    path = lock_path(str(tmp_path / "feed.xml"))
+    path.write_text("1\n")
+    old = path.stat().st_mtime - 2 * STEAL_AFTER
+    os.utime(path, (old, old))
+    real_rename = os.rename
+
+    def replace_then_rename(*args):
+        # Another waiter takes the lock over right after this one found it stale
+        path.unlink()
+        path.write_text("2\n")
+        real_rename(*args)
+
+    monkeypatch.setattr(os, "rename", replace_then_rename)
+    assert not _remove_stale(path, STEAL_AFTER)
+    monkeypatch.undo()
+    assert path.read_text() == "2\n"
+    assert list(tmp_path.iterdir()) == [path]
+    os.utime(path, (old, old))
+    assert _remove_stale(path, STEAL_AFTER)
+    assert not path.exists()
+
+
+def test_main_lock_skip(tmp_path, capsys):
+    """Test a skipped run exits with its own status before fetching and keeps the output."""
+    output = tmp_path / "feed.xml"
+    output.write_text("previous feed", encoding="utf-8")
+    with output_lock(str(output), "skip"):
+        # Nothing is mocked, so a fetch would fail with another error
+        assert rss.main(["--list", "--lock", "skip", "--output", str(output), URL]) == EXIT_LOCKED
+    assert "SKIPPED: " in capsys.readouterr().out
+    assert output.read_text(encoding="utf-8") == "previous feed"
+
+
+def test_main_lock(tmp_path, requests_mock):
+    """Test a run that gets the lock saves the feed and releases the lock."""
+    output = tmp_path / "feed.xml"
+    requests_mock.get(URL, text="<ul><li><a href='/one'>One</a></li></ul>")
+    assert rss.main(["--list", "--lock", "wait", "-q", "--output", str(output), URL]) == 0
+    assert "<link>https://example.com/one</link>" in output.read_text(encoding="utf-8")
+    assert [path.name for path in tmp_path.iterdir()] == ["feed.xml"]
+
+
+def test_main_lock_taken_over(tmp_path, requests_mock, capsys):
+    """Test a run whose lock was taken over while fetching doesn't save the feed."""
+    output = tmp_path / "feed.xml"
+    thief = output_lock(str(output), "skip")
+
+    def take_over(request, context):
+        lock_path(str(output)).unlink()
+        thief.__enter__()
+        return "<ul><li><a href='/one'>One</a></li></ul>"
+
+    requests_mock.get(URL, text=take_over)
+    assert rss.main(["--list", "--lock", "wait", "--output", str(output), URL]) == EXIT_LOCKED
+    assert "was taken over by another run" in capsys.readouterr().out
+    assert not output.exists()
+    thief.__exit__(None, None, None)
@@ -0,0 +1,105 @@
+"""Test adaptive poll intervals."""
+
+from datetime import UTC, datetime, timedelta
+
+from rssfixer import rss
+from rssfixer.batch import BatchOptions, load_feeds, run_batch
+from rssfixer.schedule import entry_digest, format_interval, plan, record_poll
+from rssfixer.state import FeedState, FeedStateStore
+
+URL = "https://example.com/blog"
+START = datetime(2023, 4, 17, tzinfo=UTC)
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+PAGE = '<ul><li><a href="https://example.com/one">One</a></li></ul>'
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://example.com/blog"
+list = true
+output = "{output}"
+"""
+
+
+def test_entry_digest():
+    """Test only the set of URLs matters."""
+    assert entry_digest(["a", "b", "a"]) == entry_digest(["b", "a"])
+    assert entry_digest(["a"]) != entry_digest(["a", "b"])
+
+
+def test_backoff_and_reset():
+    """Test the interval doubles while unchanged, is bounded and resets after a change."""
+    assert plan(None, HOUR, WEEK).next_poll is None
+
+    poll = record_poll(None, ["a"], START)
+    assert plan(poll, HOUR, WEEK).interval == timedelta(hours=1)
+    for number in range(1, 4):
+        poll = record_poll(poll, ["a"], START + timedelta(days=number))
+    schedule = plan(poll, HOUR, WEEK)
+    assert schedule.interval == timedelta(hours=8)
+    assert schedule.next_poll == START + timedelta(days=3, hours=8)
+    assert schedule.reason == "unchanged for 3 checks"
+
+    for number in range(4, 20):
+        poll = record_poll(poll, ["a"], START + timedelta(days=number))
+    assert plan(poll, HOUR, WEEK).interval == timedelta(weeks=1)
+    assert plan(poll, HOUR, WEEK).reason.endswith("at the maximum interval")
+
+    poll = record_poll(poll, ["a", "b"], START + timedelta(days=20))
+    schedule = plan(poll, HOUR, WEEK)
+    assert schedule.interval == timedelta(hours=1)
+    assert schedule.reason == "changed at the last check"
+    assert (poll.checks, poll.changes) == (len(range(21)), 1)
+
+
+def test_average_change_limit():
+    """Test a feed that changes regularly is polled at least twice between changes."""
+    poll = record_poll(None, ["a"], START)
+    for number in range(1, 3):
+        poll = record_poll(poll, ["a", str(number)], START + timedelta(days=number))
+    for number in range(3, 10):
+        poll = record_poll(poll, ["a", "2"], START + timedelta(days=2, hours=number))
+    schedule = plan(poll, HOUR, WEEK)
+    assert schedule.interval == timedelta(hours=12)
+    assert "half the average 1d between changes" in schedule.reason
+
+
+def test_format_interval():
+    """Test intervals are shown with their two largest units."""
+    assert format_interval(timedelta(days=2, hours=4, minutes=5)) == "2d 4h"
+    assert format_interval(timedelta(0)) == "0s"
+
+
+def test_state_round_trip(tmp_path):
+    """Test the change history is saved and loaded."""
+    store = FeedStateStore(tmp_path / "state.json")
+    poll = record_poll(record_poll(None, ["a"], START), ["b"], START + timedelta(days=1))
+    store.save(FeedState(poll=poll))
+    assert store.load().poll == poll
+
+
+def test_batch_adaptive(tmp_path, requests_mock, capsys):
+    """Test an adaptive batch records the check and skips the feed until it is due."""
+    adapter = requests_mock.get(URL, text=PAGE)
+    output = tmp_path / "feed.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output), encoding="utf-8")
+    feeds = load_feeds(str(config))
+    options = BatchOptions(workers=1, adaptive=True, state_dir=str(tmp_path / "state"))
+
+    assert run_batch(feeds, options) == 0
+    poll = FeedStateStore.for_output(str(output), options.state_dir).load().poll
+    assert poll is not None
+    assert poll.digest == entry_digest(["https://example.com/one"])
+
+    assert run_batch(feeds, options) == 0
+    assert adapter.call_count == 1
+    assert f"SKIPPED: {URL}: next poll at" in capsys.readouterr().out
+
+    assert rss.main(["schedule", str(config), "--state-dir", options.state_dir]) == 0
+    shown = capsys.readouterr().out
+    assert f"{URL} -> {output}" in shown
+    assert "every 1h" in shown
+    assert "history: 1 checks, 0 changes, last change never" in shown
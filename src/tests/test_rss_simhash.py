@@ -0,0 +1,76 @@
+"""Test near-duplicate detection with SimHash."""
+
+import hashlib
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed
+from rssfixer.cli import parse_arguments
+from rssfixer.explain import ExplainReport
+from rssfixer.simhash import BITS, MAX_DISTANCE, SimHashIndex, fingerprint, normalize
+
+URL = "https://example.com/blog"
+DISTANCE = 3
+FINGERPRINTS = 2000
+
+PAGE = """
+<ul>
+<li><a href="/2023/04/openssl-fixed?utm_source=feed">Critical vulnerability in OpenSSL fixed</a></li>
+<li><a href="/news/openssl-fixed">Critical Vulnerability in OpenSSL Fixed!</a></li>
+<li><a href="/fr/openssl-fixed">Critical vulnérability in OpenSSL fixed</a></li>
+<li><a href="/browser">New research on browser exploitation</a></li>
+<li><a href="/kernel">Kernel hardening in practice</a></li>
+</ul>
+"""
+
+
+def random_bits(seed: int) -> int:
+    """Get reproducible random looking 64-bit values."""
+    return int.from_bytes(hashlib.sha256(str(seed).encode()).digest()[: BITS // 8])
+
+
+def test_normalize():
+    """Test case, accents and punctuation are ignored."""
+    assert normalize("Vulnérabilité: l'OpenSSL, FIXED!") == ["vulnerabilite", "l", "openssl", "fixed"]
+    title = "Critical vulnerability in OpenSSL fixed"
+    assert fingerprint(title) == fingerprint("CRITICAL vulnerability, in OpenSSL: fixed")
+    assert fingerprint("...") is None
+
+
+def test_index_matches_brute_force():
+    """Test the banded index finds exactly the fingerprints a full comparison finds."""
+    index = SimHashIndex(DISTANCE)
+    values = [random_bits(number) for number in range(FINGERPRINTS)]
+    for number, value in enumerate(values):
+        index.add(value, number)
+
+    for query, value in enumerate(values[:100]):
+        # Flip 0 to 2 * DISTANCE bits
+        flipped = value
+        for bit in range(BITS):
+            if random_bits(-query - 1) >> bit & 1 and (flipped ^ value).bit_count() < query % (2 * DISTANCE + 1):
+                flipped ^= 1 << bit
+        expected = {number for number, other in enumerate(values) if (other ^ flipped).bit_count() <= DISTANCE}
+        found = index.find(flipped)
+        assert (found is None) == (not expected)
+        assert found is None or found in expected
+
+
+def test_index_distance():
+    """Test the distance is checked."""
+    with pytest.raises(ValueError):
+        SimHashIndex(MAX_DISTANCE + 1)
+    with pytest.raises(SystemExit):
+        parse_arguments(["--list", "--near-duplicates", str(MAX_DISTANCE + 1), URL])
+
+
+def test_near_duplicates_collapsed():
+    """Test near duplicates are collapsed before --max-entries is applied."""
+    result = generate_feed(FeedConfig(url=URL), html=PAGE)
+    assert len(result.entries) == len(["openssl"] * 3 + ["browser", "kernel"])
+
+    report = ExplainReport(URL)
+    config = FeedConfig(url=URL, near_duplicates=DISTANCE, max_entries=2)
+    result = generate_feed(config, html=PAGE, report=report)
+    assert [entry.url for entry in result.entries] == ["/2023/04/openssl-fixed", "/browser"]
+    assert report.dropped["near duplicate"] == len(["/news", "/fr"])
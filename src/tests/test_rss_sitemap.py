@@ -0,0 +1,144 @@
+"""Test the sitemap extractor."""
+
+import gzip
+from datetime import UTC, datetime
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.cli import parse_arguments
+from rssfixer.exceptions import BudgetExceededError, SitemapParsingError
+from rssfixer.explain import ExplainReport
+from rssfixer.extractors.sitemap import decompress, parse_since, title_from_url
+from rssfixer.fixtures import FixtureStore
+
+URL = "https://example.com/sitemap.xml"
+CHUNK = 7
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://example.com/</loc></url>
+  <url><loc>https://example.com/blog/old-post</loc><lastmod>2023-01-02</lastmod></url>
+  <url>
+    <loc>https://example.com/blog/new_release-notes.html</loc>
+    <lastmod>2023-04-17T10:00:00+02:00</lastmod>
+    <image:image><image:title>Screenshot</image:title></image:image>
+  </url>
+  <url><loc>https://example.com/about</loc><lastmod>2023-04-18</lastmod></url>
+  <url>
+    <loc>https://example.com/blog/2023/04/15/</loc>
+    <lastmod>2023-04-15</lastmod>
+    <news:news><news:title>Quarterly report</news:title></news:news>
+  </url>
+</urlset>
+"""
+
+INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>/sitemap-posts.xml.gz</loc><lastmod>2023-04-18</lastmod></sitemap>
+  <sitemap><loc>https://example.com/sitemap-2020.xml</loc><lastmod>2020-12-31</lastmod></sitemap>
+</sitemapindex>
+"""
+
+
+def test_newest_entries():
+    """Test the newest matching pages are kept, newest first, with titles from slugs."""
+    report = ExplainReport(URL)
+    config = FeedConfig(url=URL, mode="sitemap", max_entries=2, sitemap_include="/blog/")
+    result = generate_feed(config, html=SITEMAP, report=report)
+    assert [(entry.title, entry.url) for entry in result.entries] == [
+        ("New release notes", "https://example.com/blog/new_release-notes.html"),
+        ("Quarterly report", "https://example.com/blog/2023/04/15/"),
+    ]
+    assert result.entries[0].published == datetime(2023, 4, 17, 8, tzinfo=UTC)
+    assert report.dropped["--sitemap-include"] == len(["/", "/about"])
+    assert report.dropped["older than the newest entries"] == 1
+
+
+def test_sitemap_since():
+    """Test pages modified before --sitemap-since and pages without lastmod are left out."""
+    config = FeedConfig(url=URL, mode="sitemap", sitemap_since="2023-04-16")
+    result = generate_feed(config, html=SITEMAP)
+    assert [entry.url for entry in result.entries] == [
+        "https://example.com/about",
+        "https://example.com/blog/new_release-notes.html",
+    ]
+    assert parse_since("30d", datetime(2023, 4, 17, tzinfo=UTC)) == datetime(2023, 3, 18, tzinfo=UTC)
+    with pytest.raises(SystemExit):
+        parse_arguments(["--sitemap", "--sitemap-since", "last week", URL])
+    with pytest.raises(SystemExit):
+        parse_arguments(["--list", "--sitemap-include", "/blog/", URL])
+
+
+def test_gzip_index(requests_mock):
+    """Test sitemaps in a gzip compressed index are fetched, skipping old ones."""
+    requests_mock.get("https://example.com/sitemap-posts.xml.gz", content=gzip.compress(SITEMAP.encode()))
+    old = requests_mock.get("https://example.com/sitemap-2020.xml", text=SITEMAP)
+    config = FeedConfig(url=URL, mode="sitemap", sitemap_since="2023-01-01", sitemap_include="/blog/")
+    result = generate_feed(config, html=gzip.compress(INDEX.encode()))
+    assert len(result.entries) == len(["new-release-notes", "2023/04/15", "old-post"])
+    assert not old.called
+
+
+def test_main_sitemap(tmp_path, requests_mock):
+    """Test a feed from a sitemap on the command line."""
+    requests_mock.get(URL, text=SITEMAP)
+    output = tmp_path / "feed.xml"
+    assert rss.main(["--sitemap", "--max-entries", "1", "-q", "--output", str(output), URL]) == 0
+    assert "<title>About</title>" in output.read_text(encoding="utf-8")
+
+
+def test_main_gzip_sitemap(tmp_path, requests_mock):
+    """Test a gzip compressed sitemap is fetched undecoded and parsed while it is streamed."""
+    url = "https://example.com/sitemap.xml.gz"
+    requests_mock.get(url, content=gzip.compress(SITEMAP.encode()), headers={"Content-Type": "application/gzip"})
+    output = tmp_path / "feed.xml"
+    assert rss.main(["--sitemap", "--sitemap-include", "/blog/", "-q", "--output", str(output), url]) == 0
+    assert "<title>New release notes</title>" in output.read_text(encoding="utf-8")
+
+
+def test_decompress():
+    """Test gzip content made of several members is decompressed in small pieces."""
+    data = SITEMAP.encode() * 3
+    compressed = gzip.compress(data[:100]) + gzip.compress(data[100:])
+    pieces = list(decompress(compressed[start : start + CHUNK] for start in range(0, len(compressed), CHUNK)))
+    assert b"".join(pieces) == data
+    assert b"".join(decompress([data[:1], data[1:]])) == data
+
+
+def test_invalid_sitemaps():
+    """Test a DTD, broken XML and a too large sitemap - should fail."""
+    doctype = '<?xml version="1.0"?><!DOCTYPE urlset [<!ENTITY a "aaaa">]><urlset><url><loc>&a;</loc></url></urlset>'
+    with pytest.raises(SitemapParsingError, match="DTD"):
+        generate_feed(FeedConfig(url=URL, mode="sitemap"), html=doctype)
+    with pytest.raises(SitemapParsingError):
+        generate_feed(FeedConfig(url=URL, mode="sitemap"), html="<urlset><url></urlset>")
+    # Small when compressed, larger than the budget when decompressed
+    config = FeedConfig(url=URL, mode="sitemap", max_input_bytes=len(INDEX) * 2)
+    with pytest.raises(BudgetExceededError, match="input bytes"):
+        generate_feed(config, html=gzip.compress(INDEX.encode() * 4))
+
+
+def test_title_from_url():
+    """Test titles made from the last part of the path."""
+    assert title_from_url("https://example.com/news/caf%C3%A9-opening.php") == "Café opening"
+    assert title_from_url("https://example.com/") == "https://example.com/"
+
+
+def test_batch_replay_index(tmp_path):
+    """Test sitemaps of an index are replayed in a batch run, without network access."""
+    store = FixtureStore(str(tmp_path / "fixtures"))
+    store.save(URL, 200, {}, INDEX.encode())
+    store.save("https://example.com/sitemap-posts.xml.gz", 200, {}, gzip.compress(SITEMAP.encode()))
+    store.save("https://example.com/sitemap-2020.xml", 200, {}, SITEMAP.encode())
+    output = tmp_path / "feed.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(
+        f'[[feed]]\nurl = "{URL}"\nsitemap = true\nsitemap-include = "/blog/"\nquiet = true\noutput = "{output}"\n',
+        encoding="utf-8",
+    )
+    arguments = ["batch", "--workers", "1", "--replay", str(tmp_path / "fixtures"), str(config)]
+    assert rss.main(arguments) == 0
+    assert "<title>Quarterly report</title>" in output.read_text(encoding="utf-8")
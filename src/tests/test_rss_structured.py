@@ -0,0 +1,156 @@
+"""Test extraction from JSON-LD, Next.js and Nuxt data."""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from rssfixer import FeedConfig, generate_feed, rss
+from rssfixer.exceptions import NoLinksFoundError
+from rssfixer.extractors.structured import unflatten_nuxt
+
+URL = "https://example.com/blog"
+PUBLISHED = datetime(2023, 4, 17, 10, 0, tzinfo=UTC)
+
+ITEM_LIST = {
+    "@context": "https://schema.org",
+    "@type": "ItemList",
+    "url": URL,
+    "name": "Blog",
+    "itemListElement": [
+        {
+            "@type": "ListItem",
+            "position": 1,
+            "item": {
+                "@type": "BlogPosting",
+                "url": "https://example.com/blog/one",
+                "headline": "One",
+                "description": "First post",
+                "datePublished": "2023-04-17T10:00:00Z",
+            },
+        },
+        {"@type": "ListItem", "position": 2, "url": "https://example.com/blog/two", "name": "Two"},
+        {"@type": "ListItem", "position": 3, "item": "https://example.com/blog/three", "name": "Three"},
+    ],
+}
+
+GRAPH = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@type": "WebSite", "url": "https://example.com/", "name": "Example"},
+        {
+            "@type": "Blog",
+            "blogPost": [
+                {
+                    "@type": ["BlogPosting", "Thing"],
+                    "mainEntityOfPage": {"@id": "https://example.com/blog/four"},
+                    "headline": "Four",
+                },
+            ],
+        },
+    ],
+}
+
+BREADCRUMBS = {
+    "@context": "https://schema.org",
+    "@type": "BreadcrumbList",
+    "itemListElement": [
+        {"@type": "ListItem", "position": 1, "item": "https://example.com/", "name": "Home"},
+        {"@type": "ListItem", "position": 2, "url": URL, "name": "Blog"},
+    ],
+}
+
+NEXT_DATA = {
+    "props": {
+        "pageProps": {
+            "menu": [{"href": "/about", "title": "About"}, {"href": "/contact", "title": "Contact"}],
+            "posts": [
+                {"slug": "/blog/five", "title": "Five", "publishedAt": "2023-04-17T10:00:00+00:00"},
+                {"slug": "/blog/six", "title": "Six", "publishedAt": "2023-04-18"},
+            ],
+        },
+    },
+}
+
+# Nuxt 3 payload for {"data": {"posts": [{"path": "/blog/seven", "title": "Seven", "date": <Date>}]}}
+NUXT_DATA = [
+    ["ShallowReactive", 1],
+    {"data": 2},
+    ["Reactive", 3],
+    {"posts": 4},
+    [5],
+    {"path": 6, "title": 7, "date": 8},
+    "/blog/seven",
+    "Seven",
+    ["Date", "2023-04-17T10:00:00.000Z"],
+]
+
+
+def page(*scripts: str) -> str:
+    """Build a page with the given script tags."""
+    return "<html><head>" + "".join(scripts) + "</head><body><ul><li>Not parsed</li></ul></body></html>"
+
+
+def ld_json(data) -> str:
+    """Build a JSON-LD script tag."""
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def test_structured_json_ld():
+    """Test entries from an ItemList and an @graph, with dates."""
+    config = FeedConfig(url=URL, mode="structured")
+    result = generate_feed(config, html=page(ld_json(ITEM_LIST), ld_json(GRAPH)))
+
+    assert [entry.title for entry in result.entries] == ["One", "Two", "Three", "Four"]
+    assert result.entries[0].description == "First post"
+    assert result.entries[0].published == PUBLISHED
+    assert result.entries[3].url == "https://example.com/blog/four"
+    assert b"<pubDate>Mon, 17 Apr 2023 10:00:00 +0000</pubDate>" in result.feed
+
+
+def test_structured_breadcrumbs():
+    """Test the crumbs of a BreadcrumbList are not entries."""
+    config = FeedConfig(url=URL, mode="structured")
+    result = generate_feed(config, html=page(ld_json(BREADCRUMBS), ld_json(ITEM_LIST)))
+
+    assert [entry.title for entry in result.entries] == ["One", "Two", "Three"]
+
+
+def test_structured_next_data():
+    """Test the array of dated entries is preferred over other links in __NEXT_DATA__."""
+    script = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT_DATA)}</script>'
+    result = generate_feed(FeedConfig(url=URL, mode="structured"), html=page(script).encode("utf-8"))
+
+    assert [entry.url for entry in result.entries] == ["/blog/five", "/blog/six"]
+    assert result.entries[1].published == datetime(2023, 4, 18, tzinfo=UTC)
+
+
+def test_structured_nuxt_data():
+    """Test entries from a Nuxt 3 payload."""
+    script = f'<script type="application/json" id="__NUXT_DATA__">{json.dumps(NUXT_DATA)}</script>'
+    result = generate_feed(FeedConfig(url=URL, mode="structured"), html=page(script))
+
+    assert [entry.title for entry in result.entries] == ["Seven"]
+    assert result.entries[0].published == PUBLISHED
+
+
+def test_structured_no_data():
+    """Test a page without structured data - should fail."""
+    with pytest.raises(NoLinksFoundError):
+        generate_feed(FeedConfig(url=URL, mode="structured"), html=page())
+
+
+def test_unflatten_nuxt_cycle():
+    """Test cyclic references in a Nuxt payload."""
+    root = unflatten_nuxt([{"self": 0, "name": 1}, "root"])
+    assert root["self"] is root
+    assert root["name"] == "root"
+
+
+def test_main_structured(tmp_path, capsys):
+    """Test the main function with --structured and a local file."""
+    path = tmp_path / "blog.html"
+    path.write_text(page(ld_json(ITEM_LIST)), encoding="utf-8")
+
+    assert rss.main(["--structured", "--stdout", "--input", str(path), URL]) == 0
+    assert "<link>https://example.com/blog/three</link>" in capsys.readouterr().out
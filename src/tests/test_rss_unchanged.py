@@ -0,0 +1,74 @@
+"""Test skipping feeds whose entries haven't changed."""
+
+from rssfixer import FeedConfig, extract_feed, rss
+from rssfixer.batch import BatchOptions, load_feeds, run_batch
+from rssfixer.state import EXIT_UNCHANGED, FeedStateStore
+
+URL = "https://example.com/blog"
+
+PAGE = """<html><body>
+<input type="hidden" name="csrf" value="{request:08x}">
+<span class="ago">{request} minutes ago</span>
+<ul><li><a href="https://example.com/one">{title}</a></li></ul>
+</body></html>"""
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://example.com/blog"
+list = true
+output = "{output}"
+"""
+
+
+def test_digest_ignores_page_chrome():
+    """Test the digest only depends on the entries and the feed options."""
+    config = FeedConfig(url=URL)
+    first = extract_feed(config, html=PAGE.format(request=1, title="One"))
+    assert first.feed == b""
+    again = extract_feed(config, html=PAGE.format(request=5, title="One"))
+    assert again.digest == first.digest
+    changed = extract_feed(config, html=PAGE.format(request=5, title="One, updated"))
+    assert changed.digest != first.digest
+    retitled = extract_feed(FeedConfig(url=URL, title="Other"), html=PAGE.format(request=1, title="One"))
+    assert retitled.digest != first.digest
+
+
+def test_main_skip_unchanged(tmp_path, requests_mock, capsys):
+    """Test an unchanged feed is not saved again and exits with EXIT_UNCHANGED."""
+    output = tmp_path / "feed.xml"
+    arguments = ["--list", "--skip-unchanged", "--output", str(output), URL]
+    requests_mock.get(URL, text=PAGE.format(request=1, title="One"))
+    assert rss.main(arguments) == 0
+    assert FeedStateStore.for_output(str(output)).load().feed_digest
+
+    output.write_text("kept", encoding="utf-8")
+    requests_mock.get(URL, text=PAGE.format(request=5, title="One"))
+    assert rss.main(arguments) == EXIT_UNCHANGED
+    assert f"UNCHANGED: {output}" in capsys.readouterr().out
+    assert output.read_text(encoding="utf-8") == "kept"
+
+    # A missing output is always written
+    output.unlink()
+    assert rss.main(arguments) == 0
+    assert output.exists()
+
+    requests_mock.get(URL, text=PAGE.format(request=9, title="Two"))
+    assert rss.main(arguments) == 0
+    assert "Two" in output.read_text(encoding="utf-8")
+
+
+def test_batch_skip_unchanged(tmp_path, requests_mock, capsys):
+    """Test batch leaves the output of an unchanged feed alone."""
+    requests_mock.get(URL, text=PAGE.format(request=1, title="One"))
+    output = tmp_path / "feed.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output), encoding="utf-8")
+    feeds = load_feeds(str(config))
+    options = BatchOptions(workers=1, skip_unchanged=True)
+    assert run_batch(feeds, options) == 0
+
+    output.write_text("kept", encoding="utf-8")
+    requests_mock.get(URL, text=PAGE.format(request=5, title="One"))
+    assert run_batch(feeds, options) == 0
+    assert f"UNCHANGED: {URL}" in capsys.readouterr().out
+    assert output.read_text(encoding="utf-8") == "kept"
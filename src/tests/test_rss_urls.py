@@ -0,0 +1,78 @@
+"""Test canonical entry URLs."""
+
+from bs4 import BeautifulSoup
+
+from rssfixer import FeedConfig, generate_feed
+from rssfixer.explain import ExplainReport
+from rssfixer.feed import create_rss_feed, render_feed
+from rssfixer.models import LinkEntry
+from rssfixer.urls import base_href, canonicalize
+
+URL = "https://example.com/blog/"
+
+PAGE = """<html><head><title>Blog</title></head><body><ul>
+<li><a href="https://example.com/blog/one?utm_source=feed&amp;utm_medium=rss">One</a></li>
+<li><a href="/blog/one#comments">One again</a></li>
+<li><a href="../blog/./one?fbclid=abc">One once more</a></li>
+<li><a href="//EXAMPLE.com/blog/two?page=2&amp;gclid=x">Two</a></li>
+<li><a href="#latest">Latest</a></li>
+</ul></body></html>"""
+
+BASE_PAGE = """<html><head><base href="/static/"></head><body>
+<div class="posts"><ul><li><a href="one">One</a></li></ul></div>
+</body></html>"""
+
+
+def test_canonicalize():
+    """Test relative URLs are resolved and tracking parameters and fragments removed."""
+    assert canonicalize("../two/?b=1&utm_source=x&a=2#top", "https://Example.COM:443/blog/one/") == (
+        "https://example.com/blog/two/?b=1&a=2"
+    )
+    assert canonicalize("//other.example.com/x", URL) == "https://other.example.com/x"
+    assert canonicalize("http://[::1]:80/x") == "http://[::1]/x"
+    assert canonicalize("post?utm_campaign=x") == "post"
+    # An anchor into the base document is a section of the page and is kept
+    assert canonicalize("#v1.2", URL) == URL + "#v1.2"
+    assert canonicalize("#v1.2") == "#v1.2"
+    assert canonicalize("  ", URL) == ""
+
+
+def test_duplicates_found_by_canonical_url():
+    """Test variants of one URL are only added once."""
+    report = ExplainReport(URL)
+    result = generate_feed(FeedConfig(url=URL), html=PAGE, report=report)
+    assert [entry.url for entry in result.entries] == [
+        "https://example.com/blog/one",
+        "//example.com/blog/two?page=2",
+        "#latest",
+    ]
+    assert report.dropped["duplicate"] == len(["/blog/one#comments", "../blog/./one"])
+    # Relative URLs are resolved against the page URL in the feed
+    feed = create_rss_feed(result.entries, FeedConfig(url=URL))
+    assert "<link>https://example.com/blog/two?page=2</link>" in feed
+    assert f"<link>{URL}#latest</link>" in feed
+
+
+def test_base_href():
+    """Test links are resolved against the <base href> of the page, also with a page filter."""
+    assert base_href(BeautifulSoup(BASE_PAGE, "html.parser"), URL) == "https://example.com/static/"
+    config = FeedConfig(url=URL, filter_type="div", filter_name="posts")
+    result = generate_feed(config, html=BASE_PAGE)
+    assert result.entries[0].url == "https://example.com/static/one"
+    assert base_href(BeautifulSoup(PAGE, "html.parser"), URL) is None
+
+
+def test_render_base_url():
+    """Test relative URLs are joined with --base-url as RFC 3986 relative references."""
+    links = [LinkEntry("../two", "Two"), LinkEntry("//cdn.example.com/three", "Three")]
+    feed = create_rss_feed(links, FeedConfig(url=URL, base_url="https://example.com/blog/one/"))
+    assert "<link>https://example.com/blog/two</link>" in feed
+    assert "<link>https://cdn.example.com/three</link>" in feed
+
+
+def test_render_atom_content_src():
+    """Test the content src of an Atom entry is the resolved URL, like its link."""
+    config = FeedConfig(url=URL, atom=True)
+    feed = render_feed([LinkEntry("../two", "Two", "Second")], config).decode("utf-8")
+    assert 'src="https://example.com/two"' in feed
+    assert 'src="../two"' not in feed
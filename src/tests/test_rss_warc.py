@@ -0,0 +1,97 @@
+"""Test feed generation from WARC archives."""
+
+import gzip
+
+import pytest
+
+from rssfixer import rss
+from rssfixer.batch import BatchOptions, load_feeds
+from rssfixer.exceptions import WARCParsingError
+from rssfixer.warc import iter_responses, run_warc
+
+URL = "https://research.nccgroup.com/"
+
+FEEDS_TOML = """
+[[feed]]
+url = "https://research.nccgroup.com/"
+list = true
+title = "nccgroup"
+output = "{output}"
+quiet = true
+"""
+
+
+def warc_record(record_type: str, url: str, block: bytes) -> bytes:
+    """Build a single WARC record."""
+    header = f"WARC/1.0\r\nWARC-Type: {record_type}\r\nWARC-Target-URI: {url}\r\nContent-Length: {len(block)}\r\n\r\n"
+    return header.encode("utf-8") + block + b"\r\n\r\n"
+
+
+def http_response(body: bytes, status: str = "200 OK", headers: str = "") -> bytes:
+    """Build a raw HTTP response."""
+    return f"HTTP/1.1 {status}\r\nContent-Type: text/html\r\n{headers}\r\n".encode() + body
+
+
+@pytest.fixture(name="page")
+def fixture_page():
+    """Return the nccgroup test page."""
+    with open("src/tests/data/input/nccgroup.html", "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(name="archive")
+def fixture_archive(tmp_path, page):
+    """Write a gzipped WARC file with one record per gzip member."""
+    records = [
+        warc_record("request", URL, b"GET / HTTP/1.1\r\n\r\n"),
+        warc_record("response", "https://example.com/", http_response(b"<html></html>")),
+        warc_record("response", f"<{URL}>", http_response(gzip.compress(page), headers="Content-Encoding: gzip\r\n")),
+    ]
+    path = tmp_path / "crawl.warc.gz"
+    path.write_bytes(b"".join(gzip.compress(record) for record in records))
+    return path
+
+
+def test_iter_responses(archive, page):
+    """Test only matching response records are returned, with the body decoded."""
+    responses = list(iter_responses(str(archive), {URL}))
+    assert len(responses) == 1
+    assert responses[0].url == URL
+    assert responses[0].body == page
+
+
+def test_iter_responses_chunked(tmp_path):
+    """Test a response with chunked transfer encoding in an uncompressed WARC file."""
+    body = b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+    path = tmp_path / "crawl.warc"
+    path.write_bytes(warc_record("response", URL, http_response(body, headers="Transfer-Encoding: chunked\r\n")))
+    assert next(iter_responses(str(path))).body == b"hello world"
+
+
+def test_iter_responses_invalid(tmp_path):
+    """Test reading a file that isn't a WARC file - should fail."""
+    path = tmp_path / "crawl.warc"
+    path.write_text("<html></html>", encoding="utf-8")
+    with pytest.raises(WARCParsingError):
+        list(iter_responses(str(path)))
+
+
+def test_run_warc(tmp_path, archive):
+    """Test run_warc() writes the feed from the archived page."""
+    output = tmp_path / "nccgroup.xml"
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=output), encoding="utf-8")
+
+    assert run_warc(str(archive), load_feeds(str(config)), BatchOptions(workers=1, quiet=True)) == 0
+    assert "<title>nccgroup</title>" in output.read_text(encoding="utf-8")
+
+
+def test_main_warc_missing_feed(tmp_path, capsys):
+    """Test the warc command when the archive has no response for a feed - should return 1."""
+    path = tmp_path / "crawl.warc"
+    path.write_bytes(warc_record("response", URL, http_response(b"", status="404 Not Found")))
+    config = tmp_path / "feeds.toml"
+    config.write_text(FEEDS_TOML.format(output=tmp_path / "nccgroup.xml"), encoding="utf-8")
+
+    assert rss.main(["warc", "--workers", "1", "--config", str(config), str(path)]) == 1
+    assert f"ERROR: {URL}: no response found" in capsys.readouterr().out